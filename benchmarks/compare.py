@@ -0,0 +1,134 @@
+"""
+Vergleich zweier Benchmark-Ergebnisse (run.py) mit Markierung von Regressionen
+
+Regression, wenn bei gleicher Größe und gleichem Fall
+- p50 um mehr als threshold bzw. p95 um mehr als tail_threshold (relativ) UND um mehr
+  als min_delta_ms steigt (p95 beruht auf wenigen Aufrufen, kleine Absolutwerte
+  schwanken stark),
+- mehr SQL-Statements pro Aufruf ausgeführt werden (deterministisch, keine Toleranz),
+- der Spitzen-Speicher pro Aufruf um mehr als memory_threshold steigt.
+
+Enthalten beide Dateien p50_rel/p95_rel (Latenz geteilt durch eine zeitnah gemessene
+feste Python-Last, siehe run.py.calibrate), wird die relative Änderung daraus bestimmt
+und die neue Latenz auf die Maschinen-Geschwindigkeit des Basislaufs umgerechnet;
+--no-normalize vergleicht die Millisekunden direkt.
+
+Aufruf:
+    python benchmarks/compare.py base.json current.json [--threshold 0.15]
+Exit-Code 1, wenn mindestens eine Regression gefunden wurde.
+"""
+import argparse
+import json
+import sys
+from typing import NamedTuple, Optional, Tuple
+
+DEFAULT_THRESHOLD = 0.20
+DEFAULT_TAIL_THRESHOLD = 0.50
+DEFAULT_MIN_DELTA_MS = 1.0
+DEFAULT_MEMORY_THRESHOLD = 0.20
+
+
+class ComparisonRow(NamedTuple):
+    size: int
+    case: str
+    base_p50_ms: Optional[float]
+    p50_ms: Optional[float]
+    change: Optional[float]  # relative Änderung p50
+    base_queries: Optional[float]
+    queries: Optional[float]
+    reasons: Tuple[str, ...]
+
+    @property
+    def regression(self):
+        return bool(self.reasons)
+
+
+def _index(result):
+    return {(s["size"], name): values for s in result["sizes"] for name, values in s["cases"].items()}
+
+
+def _ratio(old, values, metric, normalize):
+    """neu/alt für p50_ms bzw. p95_ms (über *_rel, wenn vorhanden)"""
+    rel = metric.replace("_ms", "_rel")
+    if normalize and old.get(rel) and values.get(rel):
+        return values[rel] / old[rel]
+    return values[metric] / old[metric] if old[metric] else 1.0
+
+
+def compare(base, current, threshold=DEFAULT_THRESHOLD, min_delta_ms=DEFAULT_MIN_DELTA_MS,
+            memory_threshold=DEFAULT_MEMORY_THRESHOLD, normalize=True,
+            tail_threshold=DEFAULT_TAIL_THRESHOLD):
+    """Liste von ComparisonRow für alle (Größe, Fall) aus current (p50_ms ggf. normalisiert)"""
+    base_index = _index(base)
+    rows = []
+    for key, values in sorted(_index(current).items()):
+        old = base_index.get(key)
+        if old is None:
+            rows.append(ComparisonRow(key[0], key[1], None, values["p50_ms"], None,
+                                      None, values["queries_per_call"], ()))
+            continue
+
+        reasons = []
+        for metric, limit in (("p50_ms", threshold), ("p95_ms", tail_threshold)):
+            ratio = _ratio(old, values, metric, normalize)
+            if ratio - 1 > limit and old[metric] * (ratio - 1) > min_delta_ms:
+                reasons.append(f"{metric} +{ratio - 1:.0%}")
+        if values["queries_per_call"] > old["queries_per_call"] + 1e-9:
+            reasons.append(f"queries {old['queries_per_call']:g} -> {values['queries_per_call']:g}")
+        if old["peak_memory_bytes"] and \
+                values["peak_memory_bytes"] > old["peak_memory_bytes"] * (1 + memory_threshold):
+            reasons.append(f"memory +{values['peak_memory_bytes'] / old['peak_memory_bytes'] - 1:.0%}")
+
+        change = _ratio(old, values, "p50_ms", normalize) - 1
+        p50 = old["p50_ms"] * (1 + change)
+        rows.append(ComparisonRow(key[0], key[1], old["p50_ms"], p50, change,
+                                  old["queries_per_call"], values["queries_per_call"], tuple(reasons)))
+    return rows
+
+
+def print_rows(rows):
+    print(f"\n{'Größe':>7} {'Fall':<24} {'p50 alt':>9} {'p50 neu':>9} {'Änderung':>9} "
+          f"{'Queries':>13}  Status")
+    for row in rows:
+        if row.base_p50_ms is None:
+            print(f"{row.size:>7} {row.case:<24} {'-':>9} {row.p50_ms:>9.2f} {'':>9} {'':>13}  neu")
+            continue
+        change = f"{row.change:+.0%}" if row.change is not None else ""
+        queries = f"{row.base_queries:g} -> {row.queries:g}"
+        status = "REGRESSION: " + ", ".join(row.reasons) if row.regression else "ok"
+        print(f"{row.size:>7} {row.case:<24} {row.base_p50_ms:>9.2f} {row.p50_ms:>9.2f} "
+              f"{change:>9} {queries:>13}  {status}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vergleicht zwei Benchmark-Ergebnisse")
+    parser.add_argument("base")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative Toleranz für p50 (Standard: 0.20)")
+    parser.add_argument("--tail-threshold", type=float, default=DEFAULT_TAIL_THRESHOLD,
+                        help="relative Toleranz für p95 (Standard: 0.50)")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="absolute Mindeständerung der Latenz (Standard: 1 ms)")
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD)
+    parser.add_argument("--no-normalize", dest="normalize", action="store_false",
+                        help="Latenzen nicht mit calibration_ms umrechnen")
+    args = parser.parse_args(argv)
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    if base.get("meta", {}).get("numpy") != current.get("meta", {}).get("numpy"):
+        print("Warnung: NumPy nur in einem der Läufe verfügbar - sweep ist nicht vergleichbar")
+    rows = compare(base, current, args.threshold, args.min_delta_ms, args.memory_threshold,
+                   args.normalize, args.tail_threshold)
+    print_rows(rows)
+    regressions = [row for row in rows if row.regression]
+    if regressions:
+        print(f"\n{len(regressions)} Regression(en)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Testdaten für die Benchmarks: SQLite-Datenbank mit N bewerteten Assessments
+
+- Bis zu TEMPLATES Vorlagen mit zufälligen, gültigen Antworten laufen über den echten
+  Import (BulkImportService: Validierung, Filterlogik, Scoring, Vergleichstabelle)
+- Alle weiteren Assessments werden per INSERT ... SELECT aus den Vorlagen kopiert
+  (Antworten, Einzel-/Dimensions-/Gesamtergebnisse, Kennzahlen, Vergleichszeile) -
+  100.000 Assessments entstehen so in etwa einer Minute statt in Stunden
+- Die Datenbanken werden pro (Größe, Seed, Schema-Version) gecacht; eine Marker-Datei
+  kennzeichnet vollständig aufgebaute Dateien
+
+build() muss in einem Prozess laufen, dessen App (main) mit DATABASE_URL auf die
+Zieldatei importiert wurde (siehe run.py).
+"""
+import os
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, text
+
+TEMPLATES = 200
+REPLICATE_CHUNK = 10_000
+INDUSTRIES = ("Banken", "Versicherung", "Handel", "Industrie", "Logistik", "Öffentlicher Sektor", "")
+
+# Plausible Wertebereiche der Zahlenfragen (Wirtschaftlichkeit)
+NUMBER_RANGES = {
+    "1.6": (1, 20),
+    "7.1": (5_000, 100_000),
+    "7.2": (20, 400),
+    "7.3": (1_000, 30_000),
+    "7.4": (1, 20),
+    "7.5": (10, 2_000),
+    "7.6": (5, 120),
+}
+
+# Tabellen mit assessment_id, die 1:1 von der Vorlage kopiert werden
+RESULT_TABLES = ("answer", "question_result", "dimension_result", "total_result", "economic_metric")
+
+
+def database_path(data_dir, size, seed):
+    import migrations
+    return os.path.join(data_dir, f"bench_{size}_seed{seed}_v{migrations.LATEST_VERSION}.db")
+
+
+def is_complete(path):
+    return os.path.exists(path) and os.path.exists(path + ".ok")
+
+
+def random_record(compiled, rng, index):
+    """Ein Import-Datensatz (Fragen-Code -> Wert) mit zufälligen Antworten"""
+    record = {"name": f"Bench-Prozess {index}", "industry": rng.choice(INDUSTRIES)}
+    for question in compiled.questions:
+        if rng.random() < 0.05:
+            continue  # einzelne Fragen bleiben unbeantwortet
+        if question.question_type == "number":
+            low, high = NUMBER_RANGES.get(question.code, (0, 100))
+            if question.code == "7.7":
+                record[question.code] = round(rng.uniform(0, 0.5) * record.get("7.6", 60), 1)
+            else:
+                record[question.code] = round(rng.uniform(low, high), 1)
+            continue
+        options = [o for o in question.options if not o.is_na] or list(question.options)
+        if not options:
+            continue
+        if question.question_type == "multiple_choice":
+            chosen = rng.sample(options, rng.randint(1, len(options)))
+            record[question.code] = "|".join(o.code for o in chosen)
+        else:
+            record[question.code] = rng.choice(options).code
+    return record
+
+
+def build(app, path, size, seed=1):
+    """
+    Baut die Datenbank unter path (Datei muss neu sein) mit size Assessments.
+
+    Returns:
+        Anzahl Assessments
+    """
+    import migrations
+    from extensions import db
+    from models.database import Process, Assessment
+    from services.bulk_import import BulkImportService
+    from services.compiled_questionnaire import get_active_questionnaire
+
+    rng = random.Random(seed)
+    with app.app_context():
+        migrations.upgrade()
+        compiled = get_active_questionnaire()
+
+        templates = min(size, TEMPLATES)
+        records = [random_record(compiled, rng, i + 1) for i in range(templates)]
+        report = BulkImportService.run(records, source_hash=f"bench-{size}-{seed}", filename="datagen")
+        if report.failed:
+            raise RuntimeError(f"Vorlagen fehlerhaft: {report.errors[:3]}")
+
+        template_ids = [row[0] for row in db.session.execute(
+            text("SELECT id FROM assessment ORDER BY id")).all()]
+        now = datetime.utcnow()
+        for start in range(templates, size, REPLICATE_CHUNK):
+            count = min(REPLICATE_CHUNK, size - start)
+            created = [now - timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60)) for _ in range(count)]
+            process_ids = db.session.execute(
+                insert(Process.__table__).returning(Process.id, sort_by_parameter_order=True),
+                [{"name": f"Bench-Prozess {start + i + 1}", "industry": rng.choice(INDUSTRIES),
+                  "description": "", "created_at": created[i]} for i in range(count)]
+            ).scalars().all()
+            assessment_ids = db.session.execute(
+                insert(Assessment.__table__).returning(Assessment.id, sort_by_parameter_order=True),
+                [{"process_id": pid, "questionnaire_version_id": compiled.id, "created_at": created[i]}
+                 for i, pid in enumerate(process_ids)]
+            ).scalars().all()
+            _replicate(db, [(aid, rng.choice(template_ids)) for aid in assessment_ids])
+            db.session.commit()
+
+        db.session.execute(text("ANALYZE"))
+        db.session.commit()
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+    with open(path + ".ok", "w") as marker:
+        marker.write(f"{size}\n")
+    return size
+
+
+def _replicate(db, mapping):
+    """Kopiert Ergebnisse/Antworten der Vorlagen auf neue Assessments (ohne Commit)"""
+    from models.database import AssessmentSummary
+
+    db.session.execute(text("CREATE TEMP TABLE IF NOT EXISTS bench_map "
+                            "(assessment_id INTEGER PRIMARY KEY, template_id INTEGER)"))
+    db.session.execute(text("DELETE FROM bench_map"))
+    db.session.execute(text("INSERT INTO bench_map VALUES (:a, :t)"),
+                       [{"a": a, "t": t} for a, t in mapping])
+
+    metadata = db.metadata
+    for name in RESULT_TABLES:
+        columns = [c.name for c in metadata.tables[name].columns if c.name not in ("id", "assessment_id")]
+        db.session.execute(text(
+            f"INSERT INTO {name} (assessment_id, {', '.join(columns)}) "
+            f"SELECT m.assessment_id, {', '.join('s.' + c for c in columns)} "
+            f"FROM bench_map m JOIN {name} s ON s.assessment_id = m.template_id "
+            f"ORDER BY m.assessment_id, s.id"
+        ))
+
+    own = ("assessment_id", "process_id", "process_name", "industry", "created_at")
+    copied = [c.name for c in AssessmentSummary.__table__.columns if c.name not in own]
+    db.session.execute(text(
+        f"INSERT INTO assessment_summary ({', '.join(own + tuple(copied))}) "
+        f"SELECT m.assessment_id, a.process_id, p.name, p.industry, a.created_at, "
+        f"{', '.join('s.' + c for c in copied)} "
+        f"FROM bench_map m JOIN assessment a ON a.id = m.assessment_id "
+        f"JOIN process p ON p.id = a.process_id "
+        f"JOIN assessment_summary s ON s.assessment_id = m.template_id"
+    ))
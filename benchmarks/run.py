@@ -0,0 +1,388 @@
+"""
+Benchmark-Suite: Scoring-Engine und die häufigsten Routen bei verschiedenen Datenmengen
+
+Fälle (pro Aufruf gemessen):
+    scoring                ScoringService.calculate_assessment_results (inkl. Commit)
+    filter_logic           apply_filter_logic (gespeicherte Antworten, ohne Commit)
+    serialize_questionnaire  serialize_questionnaire mit Antworten (wie Bearbeiten-Seite)
+    index_render           Fragebogen-Gerüst rendern (render_questionnaire_skeleton, ohne Cache)
+    index                  GET /  (Cache + gemeinsame Antworten, Dauerzustand)
+    view_assessment        GET /assessment/<id>
+    comparison             GET /comparison  (erste Seite, Standard-Sortierung)
+    comparison_filtered    GET /comparison?sort=process_name&industry=...
+    export_assessment      GET /assessment/<id>/export
+    sweep                  What-if-Gitter mit SWEEP_SPECS (1.000 Punkte; ohne NumPy Python-Pfad,
+                           siehe "numpy" in den Metadaten)
+
+Pro Größe läuft ein eigener Prozess (DATABASE_URL zeigt auf die generierte, gecachte
+Datenbank, siehe datagen.py), aufgewärmt wie ein flask-serve-Worker (server.warm_up).
+Gemessen werden Latenz-Perzentile, SQL-Statements pro Aufruf und - in einem getrennten
+Durchlauf mit tracemalloc - der Spitzen-Speicher pro Aufruf. Eine feste Kalibrier-Last
+vor jedem Block von Aufrufen (calibration_ms) rechnet Schwankungen der Maschinen-
+Geschwindigkeit heraus (p50_rel, p95_rel). Ergebnisse werden als JSON gespeichert; mit
+--compare wird gegen eine frühere Datei verglichen (siehe compare.py, Exit-Code 1 bei
+Regression). Auf geteilten Maschinen für Vergleiche --repeat 3 oder mehr verwenden.
+
+Aufruf (aus dem Projektverzeichnis):
+    python benchmarks/run.py                                   # 10, 1.000, 100.000 Assessments
+    python benchmarks/run.py --sizes 10,1000 --repeat 3 --output base.json
+    python benchmarks/run.py --sizes 1000 --case scoring --compare base.json
+"""
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sqlite3
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCH_DIR, ".data")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+DEFAULT_SIZES = (10, 1_000, 100_000)
+DEFAULT_ITERATIONS = 100
+DEFAULT_WARMUP = 5
+MEMORY_ITERATIONS = 5
+PERCENTILES = (50, 90, 95, 99)
+FILTERED_SORT = "process_name"  # Nicht-Standard-Sortierung für comparison_filtered
+SWEEP_SPECS = ("7.5=10:500:50", "7.6=5:60:20")
+CALIBRATION_ROUNDS = 3
+CALIBRATION_BLOCK = 10
+
+
+def percentile(values, p):
+    """Nearest-Rank-Perzentil (values sortiert)"""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def calibrate(rounds=CALIBRATION_ROUNDS):
+    """
+    Laufzeit (ms, Minimum) einer festen reinen Python-Arbeitslast.
+
+    Auf geteilten Maschinen wechselt die CPU-Geschwindigkeit im Sekundentakt oft um mehr
+    als die gesuchten Regressionen. _measure kalibriert deshalb vor jedem Block von
+    CALIBRATION_BLOCK Aufrufen und speichert zusätzlich Latenz / Kalibrierwert
+    (p50_rel, p95_rel), die compare.py statt der Millisekunden vergleicht.
+    """
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        data = {}
+        for i in range(10_000):
+            data[f"k{i % 997}"] = data.get(f"k{i % 991}", 0) + i
+        sorted(str(v) for v in data.values())
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+# ========================================
+# Fälle
+# ========================================
+
+def _cases(main):
+    """name -> (Aufruf(assessment_id), Aufräumen nach jedem Aufruf oder None)"""
+    from extensions import db
+    from services.scoring_service import ScoringService
+    from services.compiled_questionnaire import get_active_questionnaire
+    from services.assessment_summary import AssessmentSummaryService
+    from services.economic_analysis import EconomicAnalysisService
+
+    # Unbekannte Schlüssel fallen still auf die Standard-Sortierung zurück
+    if FILTERED_SORT not in AssessmentSummaryService.SORT_COLUMNS or \
+            FILTERED_SORT == AssessmentSummaryService.DEFAULT_SORT:
+        raise RuntimeError(f"comparison_filtered: Sortierung {FILTERED_SORT} nicht unterstützt")
+
+    app = main.app
+    client = app.test_client()
+    compiled = get_active_questionnaire()
+    industry = db.session.execute(db.text(
+        "SELECT industry FROM assessment_summary WHERE industry != '' LIMIT 1")).scalar() or ""
+
+    def get(url):
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url}: HTTP {response.status_code}")
+        return response.get_data()
+
+    def render_index(_):
+        with app.test_request_context("/"):
+            main.render_questionnaire_skeleton(compiled)
+
+    def economic_assessment():
+        # Einzelne Zahlenfragen können in den Testdaten unbeantwortet sein
+        for (aid,) in db.session.execute(db.text("SELECT id FROM assessment ORDER BY id LIMIT 50")):
+            try:
+                EconomicAnalysisService.load_inputs(aid)
+                return aid
+            except ValueError:
+                continue
+        raise RuntimeError("sweep: kein Assessment mit vollständigen Eingaben der Wirtschaftlichkeit")
+
+    sweep_id = economic_assessment()
+
+    return {
+        "scoring": (ScoringService.calculate_assessment_results, None),
+        "filter_logic": (main.apply_filter_logic, db.session.rollback),
+        "serialize_questionnaire": (
+            lambda aid: main.serialize_questionnaire(
+                compiled.id, main.build_answers_map(aid), main.build_hints_map(compiled.id)),
+            None,
+        ),
+        "index_render": (render_index, None),
+        "index": (lambda _: get("/"), None),
+        "view_assessment": (lambda aid: get(f"/assessment/{aid}"), None),
+        "comparison": (lambda _: get("/comparison"), None),
+        "comparison_filtered": (
+            lambda _: get(f"/comparison?sort={FILTERED_SORT}&industry={industry}"), None),
+        "export_assessment": (lambda aid: get(f"/assessment/{aid}/export"), None),
+        "sweep": (
+            lambda _: EconomicAnalysisService.sweep(
+                sweep_id, EconomicAnalysisService.parse_grid(SWEEP_SPECS)),
+            None,
+        ),
+    }
+
+
+CASE_NAMES = (
+    "scoring", "filter_logic", "serialize_questionnaire", "index_render", "index",
+    "view_assessment", "comparison", "comparison_filtered", "export_assessment", "sweep",
+)
+
+
+def _measure(call, cleanup, ids, iterations, warmup, query_counter, db):
+    for i in range(warmup):
+        call(ids[i % len(ids)])
+        if cleanup:
+            cleanup()
+    db.session.remove()
+
+    latencies, relative, calibrations, queries = [], [], [], 0
+    for i in range(iterations):
+        if i % CALIBRATION_BLOCK == 0:
+            calibrations.append(calibrate())
+        aid = ids[i % len(ids)]
+        before = query_counter[0]
+        started = time.perf_counter()
+        call(aid)
+        latencies.append(time.perf_counter() - started)
+        relative.append(latencies[-1] * 1000 / calibrations[-1])
+        queries += query_counter[0] - before
+        if cleanup:
+            cleanup()
+        db.session.remove()
+
+    # Speicher getrennt messen (tracemalloc verlangsamt jeden Aufruf)
+    peak = 0
+    tracemalloc.start()
+    try:
+        for i in range(min(MEMORY_ITERATIONS, iterations)):
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            call(ids[i % len(ids)])
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+            if cleanup:
+                cleanup()
+            db.session.remove()
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    relative.sort()
+    calibrations.sort()
+    result = {
+        "iterations": iterations,
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "min_ms": latencies[0] * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "queries_per_call": queries / iterations,
+        "peak_memory_bytes": peak,
+        "calibration_ms": percentile(calibrations, 50),
+    }
+    for p in PERCENTILES:
+        result[f"p{p}_ms"] = percentile(latencies, p) * 1000
+    result["p50_rel"] = percentile(relative, 50)
+    result["p95_rel"] = percentile(relative, 95)
+    return result
+
+
+def _worker(size, seed, cases, iterations, warmup, results):
+    """Ein Prozess pro Größe: Datenbank sicherstellen, Fälle messen"""
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, BENCH_DIR)
+    import datagen
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = datagen.database_path(DATA_DIR, size, seed)
+    if not datagen.is_complete(path):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    import main
+    import server
+    from extensions import db
+    from sqlalchemy import event
+
+    generated = None
+    if not datagen.is_complete(path):
+        started = time.perf_counter()
+        datagen.build(main.app, path, size, seed)
+        generated = time.perf_counter() - started
+
+    # Gleicher Ausgangszustand wie ein flask-serve-Worker, unabhängig von --case (sonst
+    # hängen Zeiten von den vorher gelaufenen Fällen ab, z. B. über die mmap-Schwelle von
+    # malloc bei der ~300 KB großen Startseite)
+    server.warm_up(main.app)
+
+    query_counter = [0]
+
+    def count(*_):
+        query_counter[0] += 1
+
+    output = {"size": size, "database": os.path.basename(path), "generated_s": generated, "cases": {}}
+    with main.app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", count)
+
+        rng = random.Random(seed)
+        all_ids = [row[0] for row in db.session.execute(
+            db.text("SELECT assessment_id FROM assessment_summary ORDER BY assessment_id"))]
+        ids = rng.sample(all_ids, min(len(all_ids), max(iterations, warmup, MEMORY_ITERATIONS)))
+        available = _cases(main)
+        for name in cases:
+            call, cleanup = available[name]
+            output["cases"][name] = _measure(call, cleanup, ids, iterations, warmup, query_counter, db)
+
+    output["max_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    results.put(output)
+
+
+# ========================================
+# Ablauf
+# ========================================
+
+def _git(*args):
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(args):
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "sqlite": sqlite3.sqlite_version,
+        "sqlite_profile": os.environ.get("SQLITE_PROFILE", "production"),
+        "numpy": importlib.util.find_spec("numpy") is not None,
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+        "repeat": args.repeat,
+        "seed": args.seed,
+    }
+
+
+def run(args):
+    cases = args.cases or list(CASE_NAMES)
+    ctx = multiprocessing.get_context("spawn")
+    sizes = []
+    for size in args.sizes:
+        repeats = []
+        for _ in range(args.repeat):
+            results = ctx.Queue()
+            process = ctx.Process(target=_worker,
+                                  args=(size, args.seed, cases, args.iterations, args.warmup, results))
+            process.start()
+            process.join()
+            if process.exitcode != 0:
+                raise SystemExit(f"Benchmark für {size} Assessments fehlgeschlagen "
+                                 f"(Exit-Code {process.exitcode})")
+            repeats.append(results.get())
+        sizes.append(_merge_repeats(repeats))
+        _print_size(sizes[-1])
+    return {"meta": metadata(args), "sizes": sizes}
+
+
+def _merge_repeats(repeats):
+    """Median jedes Messwerts über die Wiederholungen (je ein eigener Prozess)"""
+    merged = dict(repeats[0])
+    merged["generated_s"] = next((r["generated_s"] for r in repeats if r["generated_s"]), None)
+    merged["max_rss_bytes"] = max(r["max_rss_bytes"] for r in repeats)
+    merged["cases"] = {}
+    for name in repeats[0]["cases"]:
+        runs = [r["cases"][name] for r in repeats]
+        merged["cases"][name] = {key: percentile(sorted(run[key] for run in runs), 50) for key in runs[0]}
+    return merged
+
+
+def _print_size(result):
+    generated = f", Datenbank erzeugt in {result['generated_s']:.1f} s" if result["generated_s"] else ""
+    print(f"\n{result['size']} Assessments ({result['database']}{generated}, "
+          f"max RSS {result['max_rss_bytes'] / 1048576:.0f} MiB)")
+    print(f"  {'Fall':<24} {'p50':>8} {'p95':>8} {'p99':>8} {'Queries':>8} {'Peak KiB':>9}")
+    for name, r in result["cases"].items():
+        print(f"  {name:<24} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+              f"{r['queries_per_call']:>8.1f} {r['peak_memory_bytes'] / 1024:>9.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark-Suite (Scoring, Routen)")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Anzahl Assessments, kommagetrennt")
+    parser.add_argument("--case", action="append", dest="cases", choices=CASE_NAMES,
+                        help="nur diese Fälle (mehrfach möglich)")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Prozesse pro Größe, Median je Messwert (für CI: 3 oder mehr)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="JSON-Datei (Standard: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="frühere Ergebnisdatei, Regressionen markieren")
+    parser.add_argument("--threshold", type=float, default=None, help="p50-Toleranz, siehe compare.py")
+    args = parser.parse_args(argv)
+    args.sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    result = run(args)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        name = result["meta"]["commit"] or "local"
+        output = os.path.join(RESULTS_DIR, f"{name}{'-dirty' if result['meta']['dirty'] else ''}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nErgebnisse: {output}")
+
+    if args.compare:
+        import compare
+        with open(args.compare, encoding="utf-8") as f:
+            base = json.load(f)
+        options = {} if args.threshold is None else {"threshold": args.threshold}
+        rows = compare.compare(base, result, **options)
+        compare.print_rows(rows)
+        if any(row.regression for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
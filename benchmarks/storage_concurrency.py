@@ -0,0 +1,149 @@
+"""
+Benchmark: Lesedurchsatz während dauerhafter Schreiblast je SQLite-Speicherprofil
+
+- Pro Profil eine Kopie der Datenbank (Quelle bleibt unverändert, Journal-Modus sauber)
+- N Leser-Prozesse: /api/v1/assessments (Seite) und /api/v1/assessments/<id>?embed=dimensions
+- 1 Schreiber-Prozess: PATCH /assessment/<id>/answers im Dauerlauf (Scoring + Commit)
+- Ausgabe: Lese-/Schreiboperationen pro Sekunde, Latenz-Perzentile, Fehler
+  ("database is locked" landet als HTTP 500 bzw. Exception in den Fehlern)
+
+Aufruf (aus dem Projektverzeichnis, Datenbank muss bewertete Assessments enthalten):
+    python benchmarks/storage_concurrency.py --db data/decision_support.db --readers 4 --duration 10
+    python benchmarks/storage_concurrency.py --profile default --profile production --output storage.json
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+
+import storage  # noqa: E402
+
+
+def _percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def _worker(role, index, assessment_ids, start, deadline_s, results):
+    """Ein Prozess (Umgebung mit DATABASE_URL/SQLITE_PROFILE wird vom Elternprozess gesetzt)"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        from main import app
+
+        client = app.test_client()
+        latencies, errors, ops = [], 0, 0
+        start.wait()
+        deadline = time.perf_counter() + deadline_s
+        i = index
+        while time.perf_counter() < deadline:
+            assessment_id = assessment_ids[i % len(assessment_ids)]
+            began = time.perf_counter()
+            try:
+                if role == "writer":
+                    response = client.patch(f"/assessment/{assessment_id}/answers",
+                                            json={"answers": {"7.5": 10 + i % 50}})
+                elif i % 2:
+                    response = client.get(f"/api/v1/assessments/{assessment_id}?embed=dimensions")
+                else:
+                    response = client.get("/api/v1/assessments?limit=50&sort=total_rpa")
+                ok = response.status_code == 200
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - began)
+            ops += 1
+            errors += not ok
+            i += 1
+    results.put({"role": role, "ops": ops, "errors": errors, "latencies": latencies})
+
+
+def run_profile(source, profile, readers, duration):
+    """Misst ein Profil auf einer frischen Kopie der Datenbank"""
+    workdir = tempfile.mkdtemp(prefix="storage_bench_")
+    try:
+        path = os.path.join(workdir, "bench.db")
+        shutil.copyfile(source, path)
+        # Journal-Modus einmalig setzen, bevor die Worker Verbindungen öffnen
+        conn = sqlite3.connect(path)
+        storage.apply_pragmas(conn, storage.resolve_profile(profile))
+        conn.close()
+        with sqlite3.connect(path) as conn:
+            assessment_ids = [row[0] for row in conn.execute(
+                "SELECT assessment_id FROM assessment_summary ORDER BY assessment_id")]
+        if not assessment_ids:
+            raise SystemExit("Keine bewerteten Assessments in der Datenbank (assessment_summary leer)")
+
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+        os.environ["SQLITE_PROFILE"] = profile
+        ctx = multiprocessing.get_context("spawn")
+        start, results = ctx.Event(), ctx.Queue()
+        roles = ["writer"] + ["reader"] * readers
+        processes = [
+            ctx.Process(target=_worker, args=(role, n, assessment_ids, start, duration, results))
+            for n, role in enumerate(roles)
+        ]
+        for process in processes:
+            process.start()
+        time.sleep(2.0)  # Import der App in allen Prozessen abwarten
+        start.set()
+        collected = [results.get(timeout=duration + 120) for _ in processes]
+        for process in processes:
+            process.join()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    summary = {"profile": profile, "readers": readers, "duration_s": duration}
+    for role in ("reader", "writer"):
+        parts = [c for c in collected if c["role"] == role]
+        latencies = [v for c in parts for v in c["latencies"]]
+        ops = sum(c["ops"] for c in parts)
+        summary[role] = {
+            "ops": ops,
+            "ops_per_s": ops / duration,
+            "errors": sum(c["errors"] for c in parts),
+            "p50_ms": (_percentile(latencies, 50) or 0) * 1000,
+            "p95_ms": (_percentile(latencies, 95) or 0) * 1000,
+            "p99_ms": (_percentile(latencies, 99) or 0) * 1000,
+            "max_ms": max(latencies, default=0) * 1000,
+        }
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default=os.path.join(ROOT, "data", "decision_support.db"),
+                        help="Quell-Datenbank (wird kopiert)")
+    parser.add_argument("--profile", action="append", dest="profiles",
+                        help="Speicherprofil (mehrfach; Standard: default und production)")
+    parser.add_argument("--readers", type=int, default=4, help="Anzahl Leser-Prozesse")
+    parser.add_argument("--duration", type=float, default=10.0, help="Messdauer pro Profil (s)")
+    parser.add_argument("--output", help="Ergebnisse zusätzlich als JSON speichern")
+    args = parser.parse_args(argv)
+
+    results = []
+    for profile in args.profiles or ["default", "production"]:
+        summary = run_profile(args.db, profile, args.readers, args.duration)
+        results.append(summary)
+        for role in ("reader", "writer"):
+            r = summary[role]
+            print(f"{profile:<11} {role:<6} {r['ops_per_s']:>8.1f} ops/s  "
+                  f"p50 {r['p50_ms']:>7.1f} ms  p95 {r['p95_ms']:>7.1f} ms  "
+                  f"p99 {r['p99_ms']:>7.1f} ms  max {r['max_ms']:>7.1f} ms  Fehler {r['errors']}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
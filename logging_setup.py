@@ -0,0 +1,162 @@
+"""
+Strukturiertes Logging (ersetzt print() auf dem Request-Pfad)
+
+- Module loggen über logging.getLogger(__name__) mit Level und Feldern in extra={...}
+- Ausgabe als Text oder JSON (eine Zeile pro Eintrag, Felder aus extra als Schlüssel)
+- Nicht blockierend: die App schreibt nur in eine Queue (QueueHandler), ein Listener-Thread
+  formatiert und schreibt nach stderr
+- DEBUG-Einträge (z. B. pro geänderter Frage in der Filterlogik) werden nur mit der
+  Rate LOG_DEBUG_SAMPLE_RATE übernommen; ist DEBUG nicht aktiv, kostet ein
+  logger.debug()-Aufruf nur die Level-Prüfung
+- Nach fork (gunicorn-Worker, Prozess-Pool) läuft im Kind ein eigener Listener
+
+Konfiguration über app.config bzw. Umgebungsvariablen gleichen Namens:
+    LOG_LEVEL               DEBUG | INFO | WARNING | ERROR (Standard: INFO)
+    LOG_FORMAT              text | json (Standard: text)
+    LOG_DEBUG_SAMPLE_RATE   Anteil übernommener DEBUG-Einträge 0..1 (Standard: 1.0)
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+from datetime import datetime, timezone
+
+FORMATS = ("text", "json")
+TEXT_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s%(fields)s"
+
+# Attribute jedes LogRecord - alles andere stammt aus extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName", "fields"}
+
+_listener = None
+_handler_factory = None
+
+
+class SamplingFilter(logging.Filter):
+    """Lässt DEBUG-Einträge nur mit der angegebenen Rate durch (höhere Level immer)"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or self.rate >= 1.0 or random.random() < self.rate
+
+
+def _fields(record):
+    return {key: value for key, value in vars(record).items()
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_")}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            **_fields(record),
+        }
+        if record.exc_text or record.exc_info:
+            entry["exc"] = record.exc_text or self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__(TEXT_FORMAT)
+
+    def format(self, record):
+        fields = _fields(record)
+        record.fields = (" " + " ".join(f"{key}={value}" for key, value in fields.items())) if fields else ""
+        return super().format(record)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # Nur Nachricht und Traceback im aufrufenden Thread auflösen (Argumente können sich
+        # bis zur Ausgabe ändern), formatiert wird im Listener
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure(app=None):
+    """
+    Richtet das Root-Logging ein (idempotent, auch für CLI-Befehle).
+
+    Raises:
+        ValueError: unbekanntes LOG_FORMAT bzw. LOG_LEVEL
+    """
+    global _handler_factory
+    config = app.config if app is not None else {}
+
+    def setting(name, default):
+        value = config.get(name) if name in config else os.environ.get(name, default)
+        if app is not None:
+            app.config.setdefault(name, value)
+        return value
+
+    level = str(setting("LOG_LEVEL", "INFO")).upper()
+    fmt = str(setting("LOG_FORMAT", "text")).lower()
+    rate = float(setting("LOG_DEBUG_SAMPLE_RATE", 1.0))
+    if fmt not in FORMATS:
+        raise ValueError(f"LOG_FORMAT nicht unterstützt: {fmt} (erlaubt: {', '.join(FORMATS)})")
+    if not isinstance(logging.getLevelName(level), int):
+        raise ValueError(f"LOG_LEVEL nicht unterstützt: {level}")
+
+    def make_output_handler():
+        handler = logging.StreamHandler()
+        handler.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+        return handler
+
+    _handler_factory = make_output_handler
+    root = logging.getLogger()
+    root.setLevel(level)
+    for handler in list(root.handlers):
+        if isinstance(handler, _QueueHandler):
+            root.removeHandler(handler)
+
+    queue_handler = _QueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(SamplingFilter(rate))
+    root.addHandler(queue_handler)
+    _start_listener(queue_handler.queue)
+
+
+def _start_listener(log_queue):
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+    _listener = logging.handlers.QueueListener(log_queue, _handler_factory(), respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_after_fork():
+    # Threads überleben fork nicht: neue Queue + Listener im Kindprozess
+    global _listener
+    if _listener is None:
+        return
+    _listener = None
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, _QueueHandler):
+            handler.queue = queue.SimpleQueue()
+            _start_listener(handler.queue)
+
+
+def shutdown():
+    """Leert die Queue und beendet den Listener (atexit)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
+atexit.register(shutdown)
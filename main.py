@@ -6,26 +6,49 @@ Umfasst:
 - Phase 4: Korrekte Berechnung + Wirtschaftlichkeit
 """
 
-from flask import Flask, render_template, request, redirect, url_for, jsonify, Response
+from flask import Flask, render_template, request, redirect, url_for, jsonify, Response, stream_with_context
+import click
 import os
 import csv
+import logging
+import time
+from datetime import datetime
 from io import StringIO
 
 # Imports für Datenbank
 from extensions import db
 from models.database import (
-    QuestionnaireVersion, Dimension, Question, ScaleOption,
-    Process, Assessment, Answer, DimensionResult, TotalResult, OptionScore, Hint, QuestionCondition,
+    Dimension, Question,
+    Process, Assessment, Answer, DimensionResult, QuestionResult, TotalResult,
     SharedDimensionAnswer, EconomicMetric
 )
 from services.scoring_service import ScoringService
-from seed_data import seed_data
+from services.answer_ingestion import AnswerIngestionService
+from services.result_view import ResultViewService
+from services.assessment_summary import AssessmentSummaryService
+from services.questionnaire_page import QuestionnairePageService, SHARED_ANSWERS_PLACEHOLDER
+from services.economic_analysis import EconomicAnalysisService
+from services.portfolio import PortfolioService, METRIC_KEYS
+from services.bulk_export import BulkExportService
+from services.bulk_import import BulkImportService
+from services.assessment_api import AssessmentApiService
+from services.compiled_questionnaire import (
+    CompiledQuestion, get_compiled_questionnaire, get_active_questionnaire
+)
+import logging_setup
+import migrations
+import storage
+import server
+import metrics
 
 
 # ============================================
 # App-Konfiguration
 # ============================================
 app = Flask(__name__)
+# Strukturiertes Logging (LOG_LEVEL, LOG_FORMAT=json, LOG_DEBUG_SAMPLE_RATE), siehe logging_setup.py
+logging_setup.configure(app)
+logger = logging.getLogger(__name__)
 
 # Jinja2-Filter für Frage-Trennung
 import re
@@ -59,22 +82,25 @@ app.jinja_env.filters['question_regex'] = question_regex
 
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 db_path = os.path.join(BASE_DIR, 'data', 'decision_support.db')
-app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', f'sqlite:///{db_path}')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# SQLite-Speicherprofil (WAL, busy_timeout, Cache/mmap), siehe storage.py
+app.config['SQLITE_PROFILE'] = os.environ.get('SQLITE_PROFILE', storage.DEFAULT_PROFILE)
 
 # Initialisiere Datenbank
 db.init_app(app)
+storage.init_app(app, db)
+# Messwerte pro Request (/metrics, Debug-Header mit METRICS_DEBUG=1), siehe metrics.py
+metrics.init_app(app, db)
 
 
 # ============================================
 # Hilfsfunktion: Datenbank initialisieren
 # ============================================
 def init_database():
-    """Erstellt Tabellen und lädt Testdaten"""
+    """Bringt das Schema per Migrationen auf den aktuellen Stand (inkl. Seed beim ersten Start)"""
     with app.app_context():
-        db.create_all()
-        print("✅ Datenbank-Tabellen erstellt")
-        seed_data()
+        migrations.upgrade()
 
 def build_answers_map(assessment_id: int):
     """
@@ -110,29 +136,11 @@ def build_answers_map(assessment_id: int):
 
 def build_hints_map(questionnaire_version_id: int):
     """
-    Rückgabe:
-      hints_map[qid][option_id] = [{"text": "...", "type": "info|warning|error"}, ...]
+    Rückgabe (aus dem kompilierten Fragebogen, keine Query):
+      hints_map[qid][option_id] = (Hint(text="...", type="info|warning|error"), ...)
     """
-    hints = (
-        Hint.query
-        .join(Question, Hint.question_id == Question.id)
-        .filter(Question.questionnaire_version_id == questionnaire_version_id)
-        .all()
-    )
-
-    hints_map = {}
-    for h in hints:
-        qid = h.question_id
-        opt_id = h.scale_option_id  # kann None sein
-        if qid not in hints_map:
-            hints_map[qid] = {}
-        if opt_id is None:
-            continue
-        hints_map[qid].setdefault(opt_id, []).append({
-            "text": h.hint_text,
-            "type": h.hint_type
-        })
-    return hints_map
+    compiled = get_compiled_questionnaire(questionnaire_version_id)
+    return compiled.hints if compiled else {}
 
 
 # ============================================
@@ -140,81 +148,15 @@ def build_hints_map(questionnaire_version_id: int):
 # ============================================
 def get_shared_dimension_ids():
     """Gibt die IDs der Dimensionen zurück, die gemeinsam gespeichert werden können (Dim 1 & 2)"""
-    qv = QuestionnaireVersion.query.filter_by(is_active=True).first()
-    if not qv:
+    compiled = get_active_questionnaire()
+    if not compiled:
         return []
     
     # Nur Dimensionen 1 (Plattformverfügbarkeit) und 2 (Organisatorisch) sind shared
-    dimensions = Dimension.query.filter_by(
-        questionnaire_version_id=qv.id
-    ).filter(
-        Dimension.code.in_(['1','2'])
-    ).all()
-    return [d.id for d in dimensions]
+    return list(compiled.shared_dimension_ids)
 
 
-def load_shared_dimension_answers(dimension_id):
-    """Lädt gemeinsame Antworten für eine Dimension"""
-    shared_answers = SharedDimensionAnswer.query.filter_by(
-        dimension_id=dimension_id
-    ).all()
-    
-    answers_map = {}
-    for sa in shared_answers:
-        qid = sa.question_id
-        if qid not in answers_map:
-            answers_map[qid] = {"numeric": None, "single": None, "multi": []}
-        
-        if sa.numeric_value is not None:
-            answers_map[qid]["numeric"] = sa.numeric_value
-        if sa.scale_option_id is not None:
-            answers_map[qid]["multi"].append(sa.scale_option_id)
-            answers_map[qid]["single"] = sa.scale_option_id
-    
-    return answers_map
-
-
-def save_shared_dimension_answers(dimension_id, answers_data):
-    """
-    Speichert Antworten einer Dimension als gemeinsame Antworten.
-    answers_data ist ein dict: {question_id: {'numeric': ..., 'single': ..., 'multi': [...]}}
-    """
-    # Lösche alte gemeinsame Antworten für diese Dimension
-    SharedDimensionAnswer.query.filter_by(dimension_id=dimension_id).delete()
-    
-    # Speichere neue gemeinsame Antworten
-    for question_id, answer_info in answers_data.items():
-        numeric_val = answer_info.get('numeric')
-        single_val = answer_info.get('single')
-        multi_vals = answer_info.get('multi', [])
-        
-        if numeric_val is not None:
-            # Numerische Antwort
-            shared_answer = SharedDimensionAnswer(
-                dimension_id=dimension_id,
-                question_id=question_id,
-                numeric_value=numeric_val
-            )
-            db.session.add(shared_answer)
-        elif single_val is not None:
-            # Single-Choice Antwort
-            shared_answer = SharedDimensionAnswer(
-                dimension_id=dimension_id,
-                question_id=question_id,
-                scale_option_id=single_val
-            )
-            db.session.add(shared_answer)
-        elif multi_vals:
-            # Multiple-Choice: Speichere als einzelne Option (vereinfacht)
-            for opt_id in multi_vals:
-                shared_answer = SharedDimensionAnswer(
-                    dimension_id=dimension_id,
-                    question_id=question_id,
-                    scale_option_id=opt_id
-                )
-                db.session.add(shared_answer)
-
-def analyze_platform_availability(assessment_id):
+def analyze_platform_availability(assessment_id, answers=None, compiled=None):
     """
     Analysiert die Antworten in Dimension 1 (Plattformverfügbarkeit)
     und gibt den Status zurück.
@@ -226,17 +168,29 @@ def analyze_platform_availability(assessment_id):
     - 1.5=Nein → Nicht umsetzbar
     - Sonst → Keine Entscheidung möglich
     
+    Args:
+        answers: bereits geladene Antworten des Assessments (optional, spart die Query)
+        compiled: kompilierter Fragebogen der Assessment-Version (zusammen mit answers)
+    
     Returns:
         dict mit 'status', 'description', 'icon', 'color', 'explanation'
         oder None wenn keine Antworten vorhanden
     """
     # Hole alle Antworten für Dimension 1 (Fragen 1.1 bis 1.6)
-    answers = db.session.query(Answer, Question).join(
-        Question, Answer.question_id == Question.id
-    ).filter(
-        Answer.assessment_id == assessment_id,
-        Question.code.like('1.%')
-    ).all()
+    if answers is not None and compiled is not None:
+        answers = [
+            (answer, compiled.question_by_id[answer.question_id])
+            for answer in answers
+            if answer.question_id in compiled.question_by_id
+            and compiled.question_by_id[answer.question_id].code.startswith('1.')
+        ]
+    else:
+        answers = db.session.query(Answer, Question).join(
+            Question, Answer.question_id == Question.id
+        ).filter(
+            Answer.assessment_id == assessment_id,
+            Question.code.like('1.%')
+        ).all()
     
     # Wenn keine Antworten vorhanden, return None
     if not answers:
@@ -246,8 +200,8 @@ def analyze_platform_availability(assessment_id):
     answer_dict = {}
     for answer, question in answers:
         if answer.scale_option_id:
-            # Hole die Option (yes/no/n_a)
-            option = ScaleOption.query.get(answer.scale_option_id)
+            # Hole die Option (yes/no/n_a) aus dem kompilierten Fragebogen
+            option = (compiled or get_compiled_questionnaire(question.questionnaire_version_id)).option_by_id.get(answer.scale_option_id)
             if option:
                 answer_dict[question.code] = option.code
     
@@ -306,22 +260,24 @@ def analyze_platform_availability(assessment_id):
         'color': '#9ca3af',
         'explanation': 'Basierend auf den bisherigen Antworten kann noch keine abschließende Bewertung zur Plattformverfügbarkeit getroffen werden.'
     }
-def serialize_question(question: Question, answers_map: dict, hints_map: dict):
-    # Options (falls scale_id vorhanden)
-    options = []
-    if question.scale_id:
-        opts = (
-            ScaleOption.query
-            .filter_by(scale_id=question.scale_id)
-            .order_by(ScaleOption.sort_order.asc())
-            .all()
-        )
-        options = [{
-            "id": o.id,
-            "code": o.code,
-            "label": o.label,
-            "is_na": bool(o.is_na),
-        } for o in opts]
+def serialize_options(question: CompiledQuestion):
+    """Options (falls scale_id vorhanden) - bereits nach sort_order kompiliert"""
+    return [{
+        "id": o.id,
+        "code": o.code,
+        "label": o.label,
+        "is_na": o.is_na,
+    } for o in question.options]
+
+
+def serialize_question(question: CompiledQuestion, answers_map: dict, hints_map: dict, options_by_scale=None):
+    # Options: bei gemeinsamem Memo (serialize_questionnaire) einmal pro Skala gebaut und geteilt
+    if options_by_scale is None:
+        options = serialize_options(question)
+    else:
+        options = options_by_scale.get(question.scale_id)
+        if options is None:
+            options = options_by_scale[question.scale_id] = serialize_options(question)
 
     # Answer aus answers_map
     ans = answers_map.get(question.id, {"numeric": None, "single": None, "multi": []})
@@ -333,20 +289,11 @@ def serialize_question(question: Question, answers_map: dict, hints_map: dict):
     else:
         answer_value = ans["single"]  # single_choice
 
-    # Conditions (neu)
-    conds = (
-        QuestionCondition.query
-        .filter_by(question_id=question.id)
-        .order_by(QuestionCondition.sort_order.asc())
-        .all()
-    )
-    conditions = [{"question_id": c.depends_on_question_id, "option_id": c.depends_on_option_id} for c in conds]
+    # Conditions (neu + Legacy-Fallback, bereits beim Kompilieren aufgelöst)
+    conditions = [{"question_id": dep_q, "option_id": dep_opt} for dep_q, dep_opt in question.conditions]
 
-    # Legacy fallback (wenn keine QuestionCondition vorhanden)
     legacy_dep_q = question.depends_on_question_id
     legacy_dep_opt = question.depends_on_option_id
-    if not conditions and legacy_dep_q and legacy_dep_opt:
-        conditions = [{"question_id": legacy_dep_q, "option_id": legacy_dep_opt}]
 
     question_dict = {
         "id": question.id,
@@ -364,7 +311,7 @@ def serialize_question(question: Question, answers_map: dict, hints_map: dict):
         "hints": hints_map.get(question.id, {}),
 
         # Multi-Condition Felder (neu)
-        "depends_logic": getattr(question, "depends_logic", "all"),
+        "depends_logic": question.depends_logic,
         "conditions": conditions,
 
         # Legacy Felder (damit altes Template/JS nicht bricht)
@@ -375,187 +322,95 @@ def serialize_question(question: Question, answers_map: dict, hints_map: dict):
     return question_dict
 
 
-# ============================================
-# Hilfsfunktion: Filterlogik anwenden (KORRIGIERT)
-# ============================================
-def apply_filter_logic(assessment_id):
+def serialize_questionnaire(version_id: int, answers_map: dict, hints_map: dict):
     """
-    KORRIGIERTE VERSION:
-    Wendet die Filterlogik an und setzt is_applicable für alle Antworten basierend auf Bedingungen.
+    Serialisiert alle Dimensionen einer Fragebogen-Version für index.html.
     
-    Die Funktion:
-    1. Lädt alle Fragen und Antworten für das Assessment
-    2. Baut eine Map der beantworteten Optionen auf
-    3. Evaluiert für jede Frage, ob sie anwendbar ist (basierend auf Bedingungen)
-    4. Setzt das is_applicable Flag entsprechend
-    5. Iteriert mehrfach, um Kaskaden-Abhängigkeiten zu behandeln
-    """
-    print(f"\n{'='*60}")
-    print(f"🔍 FILTERLOGIK für Assessment {assessment_id}")
-    print(f"{'='*60}")
+    Optionen und Bedingungen stammen aus dem kompilierten Fragebogen (beim Kompilieren
+    in je einer Query für alle Skalen bzw. Fragen geladen) -> keine Query pro Frage.
+    Optionslisten werden pro Skala nur einmal gebaut und von allen Fragen geteilt
+    (Likert- und Ja/Nein-Skalen kommen vielfach vor).
     
-    assessment = Assessment.query.get(assessment_id)
-    if not assessment:
-        print(f"❌ Assessment {assessment_id} nicht gefunden!")
-        return
-
-    # Alle Fragen für diese Questionnaire Version
-    all_questions = Question.query.filter_by(
-        questionnaire_version_id=assessment.questionnaire_version_id
-    ).order_by(Question.dimension_id, Question.sort_order).all()
-
-    print(f"📊 Anzahl Fragen: {len(all_questions)}")
-
-    def get_conditions(q):
-        """Liefert alle Bedingungen für eine Frage (neu + legacy)"""
-        if q.conditions:
-            return [(c.depends_on_question_id, c.depends_on_option_id) for c in q.conditions]
-        if q.depends_on_question_id and q.depends_on_option_id:
-            return [(q.depends_on_question_id, q.depends_on_option_id)]
-        return []
-
-    def build_answer_map():
-        """
-        Baut eine Map: question_id -> set(selected_option_ids)
-        Nur für is_applicable=True Antworten
-        """
-        answers = Answer.query.filter_by(
-            assessment_id=assessment_id,
-            is_applicable=True
-        ).all()
-        
-        answer_map = {}
-        for ans in answers:
-            qid = ans.question_id
-            if qid not in answer_map:
-                answer_map[qid] = set()
-            
-            if ans.scale_option_id is not None:
-                answer_map[qid].add(ans.scale_option_id)
-        
-        return answer_map
-
-    def evaluate_applicable(q, answer_map):
-        """
-        Prüft, ob eine Frage anwendbar ist basierend auf ihren Bedingungen
-        """
-        conds = get_conditions(q)
-        
-        # Keine Bedingungen = immer anwendbar
-        if not conds:
-            return True
-        
-        # Logik: "all" oder "any"
-        logic = getattr(q, 'depends_logic', 'all').lower()
-        
-        # Prüfe jede Bedingung
-        results = []
-        for parent_q_id, required_opt_id in conds:
-            # Wurde die erforderliche Option für die parent-Frage gewählt?
-            is_met = required_opt_id in answer_map.get(parent_q_id, set())
-            results.append(is_met)
-        
-        # Wende Logik an
-        if logic == "any":
-            return any(results)  # Mindestens eine Bedingung erfüllt
-        else:  # "all"
-            return all(results)  # Alle Bedingungen erfüllt
-
-    # Iterative Anwendung (für Kaskaden-Abhängigkeiten)
-    max_iterations = 10
-    iteration = 0
-    changes_made = True
-
-    while changes_made and iteration < max_iterations:
-        iteration += 1
-        changes_made = False
-        
-        print(f"\n🔄 Iteration {iteration}")
-        
-        # Aktuelle Antwort-Map bauen
-        answer_map = build_answer_map()
-        
-        # Für jede Frage prüfen
-        for question in all_questions:
-            # Ist die Frage anwendbar?
-            should_be_applicable = evaluate_applicable(question, answer_map)
-            
-            # Hole alle Antworten für diese Frage
-            answers = Answer.query.filter_by(
-                assessment_id=assessment_id,
-                question_id=question.id
-            ).all()
-            
-            # Update is_applicable wenn nötig
-            for answer in answers:
-                if answer.is_applicable != should_be_applicable:
-                    print(f"  📝 Frage {question.code}: is_applicable {answer.is_applicable} -> {should_be_applicable}")
-                    answer.is_applicable = should_be_applicable
-                    changes_made = True
-                    
-                    # Wenn Frage nicht mehr anwendbar, lösche die Antwort-Werte
-                    if not should_be_applicable:
-                        answer.scale_option_id = None
-                        answer.numeric_value = None
-        
-        if not changes_made:
-            print(f"  ✅ Keine Änderungen in Iteration {iteration} - Filterlogik stabil")
-
-    if iteration >= max_iterations:
-        print(f"  ⚠️  Maximale Iterationen erreicht!")
-    
-    print(f"{'='*60}\n")
+    Returns:
+        Liste von Dimension-Dicts mit 'serialized_questions' (wie vom Template erwartet)
+    """
+    compiled = get_compiled_questionnaire(version_id)
+    options_by_scale = {}
+    
+    dimensions = []
+    for dim in compiled.dimensions:
+        dimensions.append({
+            "id": dim.id,
+            "code": dim.code,
+            "name": dim.name,
+            "serialized_questions": [
+                serialize_question(q, answers_map, hints_map, options_by_scale) for q in dim.questions
+            ],
+            # Markiere Dimension als "gemeinsam nutzbar"
+            "is_shared": dim.is_shared,
+        })
+    return dimensions
 
 
 # ============================================
-# Hilfsfunktion: Dimension Status berechnen
+# Hilfsfunktion: Filterlogik anwenden (KORRIGIERT)
 # ============================================
-def get_dimension_status(dimension_id, assessment_id=None):
+def apply_filter_logic_to_answers(compiled, answers):
     """
-    Phase 2: Berechnet Status einer Dimension
+    Wendet die Filterlogik auf Answer-Objekte im Speicher an (ohne Query).
+    
+    Die Funktion:
+    1. Baut eine Map der beantworteten Optionen auf (nur is_applicable=True)
+    2. Evaluiert den vorkompilierten Bedingungs-DAG in EINEM Durchlauf
+       (topologisch sortiert -> Kaskaden-Abhängigkeiten ohne Iteration)
+    3. Setzt is_applicable und löscht die Werte nicht anwendbarer Antworten
     
     Returns:
-        - 'not_started': Keine Frage beantwortet
-        - 'partial': Einige Fragen beantwortet
-        - 'complete': Alle Fragen beantwortet
+        Liste der Fragen-Codes, deren Antworten geändert wurden
     """
-    
-    questions = Question.query.filter_by(dimension_id=dimension_id).all()
-    total_questions = len(questions)
-    
-    if total_questions == 0:
-        return 'not_started'
-    
-    if not assessment_id:
-        return 'not_started'
-    
-    # Zähle beantwortete Fragen
-    answered_count = 0
-    
-    for question in questions:
-        answer = Answer.query.filter_by(
-            assessment_id=assessment_id,
-            question_id=question.id,
-            is_applicable=True
-        ).first()
-        
-        if not answer:
+    selected_options = {}
+    for ans in answers:
+        if not ans.is_applicable:
             continue
-        
-        # Prüfe ob beantwortet
-        if question.question_type == 'number':
-            if answer.numeric_value is not None:
-                answered_count += 1
-        else:
-            if answer.scale_option_id is not None:
-                answered_count += 1
+        options = selected_options.setdefault(ans.question_id, set())
+        if ans.scale_option_id is not None:
+            options.add(ans.scale_option_id)
+    
+    applicable = compiled.evaluate_applicability(selected_options)
+    
+    changed = []
+    for answer in answers:
+        should_be_applicable = applicable.get(answer.question_id, True)
+        if answer.is_applicable != should_be_applicable:
+            answer.is_applicable = should_be_applicable
+            changed.append(compiled.question_by_id[answer.question_id].code)
+            
+            # Wenn Frage nicht mehr anwendbar, lösche die Antwort-Werte
+            if not should_be_applicable:
+                answer.scale_option_id = None
+                answer.numeric_value = None
     
-    if answered_count == 0:
-        return 'not_started'
-    elif answered_count == total_questions:
-        return 'complete'
-    else:
-        return 'partial'
+    return changed
+
+
+def apply_filter_logic(assessment_id):
+    """
+    Wendet die Filterlogik auf bereits gespeicherte Antworten an und setzt
+    is_applicable basierend auf den Bedingungen (eine Query, ein Durchlauf).
+    """
+    assessment = Assessment.query.get(assessment_id)
+    if not assessment:
+        logger.warning("Filterlogik: Assessment nicht gefunden", extra={'assessment_id': assessment_id})
+        return
+
+    compiled = get_compiled_questionnaire(assessment.questionnaire_version_id)
+    answers = Answer.query.filter_by(assessment_id=assessment_id).order_by(Answer.id).all()
+
+    changed = apply_filter_logic_to_answers(compiled, answers)
+    if logger.isEnabledFor(logging.DEBUG):
+        for code in changed:
+            logger.debug("Filterlogik: is_applicable geändert",
+                         extra={'assessment_id': assessment_id, 'question': code})
 
 
 # ============================================
@@ -563,42 +418,33 @@ def get_dimension_status(dimension_id, assessment_id=None):
 # ============================================
 @app.route('/')
 def index():
-    """Zeigt den Fragebogen an"""
+    """Zeigt den Fragebogen an (vorgerendertes Gerüst + gemeinsame Antworten, ETag/304)"""
     
-    qv = QuestionnaireVersion.query.filter_by(is_active=True).first()
+    qv = get_active_questionnaire()
     if not qv:
         return "Keine aktive Fragebogen-Version gefunden", 500
     
-    dimensions = Dimension.query.filter_by(
-        questionnaire_version_id=qv.id
-    ).order_by(Dimension.sort_order).all()
+    skeleton = QuestionnairePageService.get_skeleton(qv, request.script_root, render_questionnaire_skeleton)
+    page = QuestionnairePageService.render(skeleton, QuestionnairePageService.load_shared_answers(qv))
     
-    hints_map = build_hints_map(qv.id)
-    shared_dim_ids = get_shared_dimension_ids()
+    response = Response(page.html, mimetype='text/html')
+    response.set_etag(page.etag)
+    # Browser muss revalidieren (gemeinsame Antworten können sich ändern) -> 304 bei gleichem ETag
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+
+def render_questionnaire_skeleton(qv):
+    """Rendert den Fragebogen ohne Antworten; gemeinsame Antworten setzt das Seiten-JS ein"""
     
-    # Für jede Dimension: Fragen laden
-    for dim in dimensions:
-        questions = Question.query.filter_by(
-            dimension_id=dim.id
-        ).order_by(Question.sort_order).all()
-        
-        # Lade gemeinsame Antworten für Dimensionen 1 & 2
-        if dim.id in shared_dim_ids:
-            answers_map = load_shared_dimension_answers(dim.id)
-        else:
-            answers_map = {}
-        
-        # Serialize Fragen in separates Attribut (nicht die SQLAlchemy relationship ändern)
-        dim.serialized_questions = [serialize_question(q, answers_map, hints_map) for q in questions]
-        
-        # Markiere Dimension als "gemeinsam nutzbar"
-        dim.is_shared = dim.id in shared_dim_ids
+    dimensions = serialize_questionnaire(qv.id, {}, build_hints_map(qv.id))
     
     return render_template(
         'index.html',
         questionnaire=qv,
         dimensions=dimensions,
-        edit_mode=False
+        edit_mode=False,
+        shared_answers_json=SHARED_ANSWERS_PLACEHOLDER
     )
 
 
@@ -608,29 +454,13 @@ def edit_assessment(assessment_id):
     
     assessment = Assessment.query.get_or_404(assessment_id)
     process = db.session.get(Process, assessment.process_id)
-    qv = db.session.get(QuestionnaireVersion, assessment.questionnaire_version_id)
-    
-    dimensions = Dimension.query.filter_by(
-        questionnaire_version_id=qv.id
-    ).order_by(Dimension.sort_order).all()
+    qv = get_compiled_questionnaire(assessment.questionnaire_version_id)
     
     # IM EDIT-MODUS: Lade IMMER die Antworten aus dem Assessment (nicht aus shared dimensions)
     answers_map = build_answers_map(assessment_id)
-    hints_map = build_hints_map(qv.id)
-    shared_dim_ids = get_shared_dimension_ids()
-    
-    # Für jede Dimension: Fragen laden
-    for dim in dimensions:
-        questions = Question.query.filter_by(
-            dimension_id=dim.id
-        ).order_by(Question.sort_order).all()
-        
-        # Im Edit-Modus: Verwende immer die answers_map vom Assessment
-        # (NICHT die shared dimension answers)
-        dim.serialized_questions = [serialize_question(q, answers_map, hints_map) for q in questions]
-        
-        # Markiere Dimension als "gemeinsam nutzbar"
-        dim.is_shared = dim.id in shared_dim_ids
+    # Im Edit-Modus: Verwende immer die answers_map vom Assessment
+    # (NICHT die shared dimension answers)
+    dimensions = serialize_questionnaire(qv.id, answers_map, build_hints_map(qv.id))
     
     process_data = {
         "name": process.name,
@@ -654,150 +484,173 @@ def edit_assessment(assessment_id):
 def update_assessment(assessment_id):
     """Aktualisiert ein existierendes Assessment"""
     
+    started = time.perf_counter()
     try:
         assessment = Assessment.query.get_or_404(assessment_id)
         process = db.session.get(Process, assessment.process_id)
-        qv = db.session.get(QuestionnaireVersion, assessment.questionnaire_version_id)
-        
-        print(f"\n{'='*60}")
-        print(f"UPDATE ASSESSMENT {assessment_id}")
-        print(f"{'='*60}")
+        qv = get_compiled_questionnaire(assessment.questionnaire_version_id)
         
         # 1. Aktualisiere Process
         process.name = request.form.get('uc_name', process.name)
         process.description = request.form.get('uc_desc', process.description)
         process.industry = request.form.get('industry', process.industry)
         
-        # 2. Lösche alte Antworten
-        Answer.query.filter_by(assessment_id=assessment_id).delete()
-        
-        # 3. Speichere neue Antworten (wie /evaluate)
-        all_questions = Question.query.filter_by(
-            questionnaire_version_id=qv.id
-        ).all()
-        
-        for question in all_questions:
-            field_single = f"q_{question.id}"
-            field_multi = f"q_{question.id}[]"
-            
-            if question.question_type == "single_choice":
-                value = request.form.get(field_single)
-                answer = Answer(
-                    assessment_id=assessment.id,
-                    question_id=question.id,
-                    scale_option_id=int(value) if value else None,
-                    is_applicable=True
-                )
-                db.session.add(answer)
-            
-            elif question.question_type == "multiple_choice":
-                values = request.form.getlist(field_multi)
-                if values:
-                    for v in values:
-                        answer = Answer(
-                            assessment_id=assessment.id,
-                            question_id=question.id,
-                            scale_option_id=int(v),
-                            is_applicable=True
-                        )
-                        db.session.add(answer)
-                else:
-                    answer = Answer(
-                        assessment_id=assessment.id,
-                        question_id=question.id,
-                        scale_option_id=None,
-                        is_applicable=True
-                    )
-                    db.session.add(answer)
-            
-            elif question.question_type == "number":
-                value = request.form.get(field_single)
-                if value and value.strip():
-                    try:
-                        num = float(value)
-                        answer = Answer(
-                            assessment_id=assessment.id,
-                            question_id=question.id,
-                            numeric_value=num,
-                            is_applicable=True
-                        )
-                    except ValueError:
-                        answer = Answer(
-                            assessment_id=assessment.id,
-                            question_id=question.id,
-                            numeric_value=None,
-                            is_applicable=True
-                        )
-                else:
-                    answer = Answer(
-                        assessment_id=assessment.id,
-                        question_id=question.id,
-                        numeric_value=None,
-                        is_applicable=True
-                    )
-                db.session.add(answer)
-        
-        db.session.commit()
-        
-        # 3.5. Speichere gemeinsame Antworten für Dimensionen 1 & 2 wenn aktiviert
-        use_shared_dims = request.form.get('use_shared_dimensions') == 'on'
-        if use_shared_dims:
-            print("\n💾 Speichere gemeinsame Dimensionen-Antworten...")
-            shared_dim_ids = get_shared_dimension_ids()
-            
-            for dim_id in shared_dim_ids:
-                # Sammle alle Antworten für diese Dimension
-                dim_questions = Question.query.filter_by(dimension_id=dim_id).all()
-                dim_answers = {}
-                
-                for q in dim_questions:
-                    field_single = f"q_{q.id}"
-                    field_multi = f"q_{q.id}[]"
-                    
-                    if q.question_type == "number":
-                        value = request.form.get(field_single)
-                        if value and value.strip():
-                            try:
-                                dim_answers[q.id] = {'numeric': float(value), 'single': None, 'multi': []}
-                            except ValueError:
-                                pass
-                    elif q.question_type == "single_choice":
-                        value = request.form.get(field_single)
-                        if value:
-                            dim_answers[q.id] = {'numeric': None, 'single': int(value), 'multi': []}
-                    elif q.question_type == "multiple_choice":
-                        values = request.form.getlist(field_multi)
-                        if values:
-                            dim_answers[q.id] = {'numeric': None, 'single': None, 'multi': [int(v) for v in values]}
-                
-                if dim_answers:
-                    save_shared_dimension_answers(dim_id, dim_answers)
-                    print(f"   ✅ Dimension {dim_id}: {len(dim_answers)} Antworten gespeichert")
-            
-            db.session.commit()
-        
-        # 4. Phase 3: Filterlogik anwenden
-        apply_filter_logic(assessment_id)
-        db.session.commit()
-        
-        # 5. Lösche alte Ergebnisse
-        DimensionResult.query.filter_by(assessment_id=assessment_id).delete()
-        TotalResult.query.filter_by(assessment_id=assessment_id).delete()
+        # 2. Antworten parsen, alte ersetzen, Filterlogik + Scoring (eine Transaktion)
+        rows, _, _ = AnswerIngestionService.parse_form(qv, request.form)
+        AnswerIngestionService.ingest(
+            assessment, qv, rows,
+            use_shared_dimensions=request.form.get('use_shared_dimensions') == 'on',
+            replace=True
+        )
         db.session.commit()
-        
-        # 6. Phase 4: Berechne neue Ergebnisse
-        total_result = ScoringService.calculate_assessment_results(assessment.id)
+        logger.info("Assessment aktualisiert", extra={
+            'assessment_id': assessment_id,
+            'answers': len(rows),
+            'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+        })
         
         return redirect(url_for('view_assessment', assessment_id=assessment_id))
     
     except Exception as e:
         db.session.rollback()
-        print(f"❌ FEHLER: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Aktualisierung fehlgeschlagen", extra={'assessment_id': assessment_id})
         return f"Fehler: {str(e)}", 500
 
 
+# ============================================
+# Route: Autosave einzelner Antworten (JSON)
+# ============================================
+@app.route('/assessment/<int:assessment_id>/answers', methods=['PATCH'])
+def patch_answers(assessment_id):
+    """
+    Speichert nur geänderte Antworten eines (teilweise ausgefüllten) Assessments.
+
+    Body: {"answers": {"<question_id|code>": Wert}} - siehe AnswerIngestionService.parse_patch
+    Filterlogik nur für die Nachfahren der geänderten Fragen, Scoring nur für betroffene Dimensionen.
+    """
+
+    assessment = Assessment.query.get_or_404(assessment_id)
+    qv = get_compiled_questionnaire(assessment.questionnaire_version_id)
+
+    payload = request.get_json(silent=True)
+    answers = payload.get('answers') if isinstance(payload, dict) else None
+    if not isinstance(answers, dict):
+        return jsonify({'success': False, 'errors': ['Erwartet: {"answers": {...}}']}), 400
+
+    changes, errors = AnswerIngestionService.parse_patch(qv, answers)
+    if errors:
+        return jsonify({'success': False, 'errors': errors}), 400
+
+    try:
+        changed_ids, dimension_ids, scored = AnswerIngestionService.patch(assessment, qv, changes)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.exception("Autosave fehlgeschlagen", extra={'assessment_id': assessment_id})
+        return jsonify({'success': False, 'errors': [str(e)]}), 500
+
+    response = {
+        'success': True,
+        'changed': [qv.question_by_id[qid].code for qid in changed_ids],
+        'rescored_dimensions': [qv.dimension_by_id[dim_id].code for dim_id in sorted(dimension_ids)],
+    }
+    if scored is not None:
+        response['total'] = {
+            'total_rpa': scored.total_rpa,
+            'total_ipa': scored.total_ipa,
+            'rpa_excluded': scored.rpa_excluded,
+            'ipa_excluded': scored.ipa_excluded,
+            'recommendation': scored.recommendation,
+        }
+    return jsonify(response)
+
+
+# ============================================
+# JSON-API v1: Assessments (nur lesend)
+# ============================================
+def _api_error(message, status=400):
+    return jsonify({'error': message}), status
+
+
+@app.route('/api/v1/assessments')
+def api_assessments():
+    """
+    Bewertete Assessments, Keyset-paginiert (Parameter wie /comparison).
+
+    ?fields=total_rpa,recommendation     nur diese Felder (id ist immer enthalten)
+    ?embed=dimensions,economic_metrics   Dimensionsergebnisse / Kennzahlen einbetten
+    ?sort=&direction=&industry=&recommendation=&q=&limit=&cursor=
+    """
+
+    try:
+        fields = AssessmentApiService.parse_fields(request.args.get('fields'))
+        embeds = AssessmentApiService.parse_embed(request.args.get('embed'))
+    except ValueError as e:
+        return _api_error(str(e))
+
+    # Conditional GET vor dem Laden der Seite: eine Query über die Indizes
+    state = AssessmentSummaryService.state()
+    etag = AssessmentApiService.etag(state, sorted(request.args.items(multi=True)))
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        page = AssessmentSummaryService.page(
+            sort=request.args.get('sort'),
+            direction=request.args.get('direction', 'desc'),
+            industry=request.args.get('industry') or None,
+            recommendation=request.args.get('recommendation') or None,
+            search=request.args.get('q') or None,
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit', type=int),
+            columns=fields
+        )
+        next_url = None
+        if page.next_cursor:
+            next_url = url_for('api_assessments', **{k: v for k, v in request.args.items() if k != 'cursor'},
+                               cursor=page.next_cursor)
+        response = jsonify({
+            'data': AssessmentApiService.serialize(page.rows, fields, embeds),
+            'next_cursor': page.next_cursor,
+            'links': {'next': next_url},
+        })
+
+    response.set_etag(etag)
+    if state[1] is not None:
+        response.last_modified = state[1]
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@app.route('/api/v1/assessments/<int:assessment_id>')
+def api_assessment(assessment_id):
+    """Einzelnes Assessment (?fields= und ?embed= wie in der Liste)"""
+
+    try:
+        fields = AssessmentApiService.parse_fields(request.args.get('fields'))
+        embeds = AssessmentApiService.parse_embed(request.args.get('embed'))
+    except ValueError as e:
+        return _api_error(str(e))
+
+    item = AssessmentApiService.get(assessment_id, fields, embeds)
+    if item is None:
+        return _api_error(f'Assessment {assessment_id} nicht gefunden', 404)
+
+    response = jsonify({'data': item})
+    response.add_etag()
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+
+# ============================================
+# Route: Messwerte (Prometheus)
+# ============================================
+@app.route('/metrics')
+def metrics_endpoint():
+    """Histogramme pro Route im Prometheus-Textformat (pro Worker-Prozess)"""
+    
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
 # ============================================
 # Route: Bewertung auswerten
 # ============================================
@@ -807,7 +660,12 @@ def evaluate():
     Phase 2, 3, 4: Speichert Antworten mit Filterlogik und berechnet Ergebnisse
     """
     
+    started = time.perf_counter()
     try:
+        qv = get_active_questionnaire()
+        if not qv:
+            return "Keine aktive Fragebogen-Version gefunden", 500
+        
         # 1. Erstelle Prozess
         process = Process(
             name=request.form.get('uc_name', 'Unbekannter Prozess'),
@@ -818,10 +676,6 @@ def evaluate():
         db.session.flush()
         
         # 2. Erstelle Assessment
-        qv = QuestionnaireVersion.query.filter_by(is_active=True).first()
-        if not qv:
-            return "Keine aktive Fragebogen-Version gefunden", 500
-            
         assessment = Assessment(
             process_id=process.id,
             questionnaire_version_id=qv.id
@@ -829,157 +683,33 @@ def evaluate():
         db.session.add(assessment)
         db.session.flush()
         
-        # 3. Hole ALLE Fragen
-        all_questions = Question.query.filter_by(
-            questionnaire_version_id=qv.id
-        ).all()
-        
-        print(f"\n{'='*60}")
-        print(f"PHASE 2+3+4 - Submit für Assessment {assessment.id}")
-        print(f"{'='*60}")
-        print(f"📊 Gesamtanzahl Fragen: {len(all_questions)}")
-        
-        # 4. Speichere Antworten
-        answered_count = 0
-        unanswered_count = 0
-        
-        for question in all_questions:
-            field_single = f"q_{question.id}"
-            field_multi = f"q_{question.id}[]"
-            
-            if question.question_type == "single_choice":
-                value = request.form.get(field_single)
-                
-                answer = Answer(
-                    assessment_id=assessment.id,
-                    question_id=question.id,
-                    scale_option_id=int(value) if value else None,
-                    is_applicable=True  # Phase 3: Wird durch Filter angepasst
-                )
-                db.session.add(answer)
-                
-                if value:
-                    answered_count += 1
-                else:
-                    unanswered_count += 1
-            
-            elif question.question_type == "multiple_choice":
-                values = request.form.getlist(field_multi)
-                
-                if values:
-                    for v in values:
-                        answer = Answer(
-                            assessment_id=assessment.id,
-                            question_id=question.id,
-                            scale_option_id=int(v),
-                            is_applicable=True
-                        )
-                        db.session.add(answer)
-                    answered_count += 1
-                else:
-                    answer = Answer(
-                        assessment_id=assessment.id,
-                        question_id=question.id,
-                        scale_option_id=None,
-                        is_applicable=True
-                    )
-                    db.session.add(answer)
-                    unanswered_count += 1
-            
-            elif question.question_type == "number":
-                value = request.form.get(field_single)
-                
-                if value and value.strip():
-                    try:
-                        num = float(value)
-                        answer = Answer(
-                            assessment_id=assessment.id,
-                            question_id=question.id,
-                            numeric_value=num,
-                            is_applicable=True
-                        )
-                        answered_count += 1
-                    except ValueError:
-                        answer = Answer(
-                            assessment_id=assessment.id,
-                            question_id=question.id,
-                            numeric_value=None,
-                            is_applicable=True
-                        )
-                        unanswered_count += 1
-                else:
-                    answer = Answer(
-                        assessment_id=assessment.id,
-                        question_id=question.id,
-                        numeric_value=None,
-                        is_applicable=True
-                    )
-                    unanswered_count += 1
-                
-                db.session.add(answer)
-        
-        db.session.commit()
+        # 3. Formular einmal parsen
+        rows, answered_count, unanswered_count = AnswerIngestionService.parse_form(qv, request.form)
+        parsed = time.perf_counter()
         
-        print(f"\n📈 Antworten:")
-        print(f"   ✅ Beantwortet: {answered_count}")
-        print(f"   ⚠️  Unbeantworten: {unanswered_count}")
-        
-        # 4.5. Speichere gemeinsame Antworten für Dimensionen 1 & 2 wenn aktiviert
-        use_shared_dims = request.form.get('use_shared_dimensions') == 'on'
-        if use_shared_dims:
-            print("\n💾 Speichere gemeinsame Dimensionen-Antworten...")
-            shared_dim_ids = get_shared_dimension_ids()
-            
-            for dim_id in shared_dim_ids:
-                # Sammle alle Antworten für diese Dimension
-                dim_questions = Question.query.filter_by(dimension_id=dim_id).all()
-                dim_answers = {}
-                
-                for q in dim_questions:
-                    field_single = f"q_{q.id}"
-                    field_multi = f"q_{q.id}[]"
-                    
-                    if q.question_type == "number":
-                        value = request.form.get(field_single)
-                        if value and value.strip():
-                            try:
-                                dim_answers[q.id] = {'numeric': float(value), 'single': None, 'multi': []}
-                            except ValueError:
-                                pass
-                    elif q.question_type == "single_choice":
-                        value = request.form.get(field_single)
-                        if value:
-                            dim_answers[q.id] = {'numeric': None, 'single': int(value), 'multi': []}
-                    elif q.question_type == "multiple_choice":
-                        values = request.form.getlist(field_multi)
-                        if values:
-                            dim_answers[q.id] = {'numeric': None, 'single': None, 'multi': [int(v) for v in values]}
-                
-                if dim_answers:
-                    save_shared_dimension_answers(dim_id, dim_answers)
-                    print(f"   ✅ Dimension {dim_id}: {len(dim_answers)} Antworten gespeichert")
-            
-            db.session.commit()
-        
-        # 5. Phase 3: Filterlogik anwenden
-        apply_filter_logic(assessment.id)
+        # 4. Antworten (Bulk), gemeinsame Antworten, Filterlogik und Scoring in einer Transaktion
+        AnswerIngestionService.ingest(
+            assessment, qv, rows,
+            use_shared_dimensions=request.form.get('use_shared_dimensions') == 'on'
+        )
         db.session.commit()
+        finished = time.perf_counter()
+        logger.info("Assessment bewertet", extra={
+            'assessment_id': assessment.id,
+            'questions': len(qv.questions),
+            'answered': answered_count,
+            'unanswered': unanswered_count,
+            'parse_ms': round((parsed - started) * 1000, 1),
+            'ingest_ms': round((finished - parsed) * 1000, 1),
+            'duration_ms': round((finished - started) * 1000, 1),
+        })
         
-        # 6. Phase 4: Berechne Ergebnisse
-        print("\n🔄 Starte Scoring (Phase 4)...")
-        total_result = ScoringService.calculate_assessment_results(assessment.id)
-        print("✅ Scoring abgeschlossen")
-        
-        print(f"{'='*60}\n")
-        
-        # 7. Redirect zur Ergebnisseite
+        # 5. Redirect zur Ergebnisseite
         return redirect(url_for('view_assessment', assessment_id=assessment.id))
     
     except Exception as e:
         db.session.rollback()
-        print(f"\n❌ FEHLER: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Bewertung fehlgeschlagen")
         return f"Fehler: {str(e)}", 500
 
 
@@ -988,40 +718,57 @@ def evaluate():
 # ============================================
 @app.route('/comparison')
 def comparison():
-    """Zeigt alle gespeicherten Assessments zum Vergleich"""
+    """Zeigt gespeicherte Assessments zum Vergleich (Keyset-paginiert, sortier- und filterbar)"""
+    
+    filters = {
+        'sort': request.args.get('sort', AssessmentSummaryService.DEFAULT_SORT),
+        'direction': request.args.get('direction', 'desc'),
+        'industry': request.args.get('industry', ''),
+        'recommendation': request.args.get('recommendation', ''),
+        'search': request.args.get('q', ''),
+    }
     
-    results = db.session.query(
-        TotalResult, Assessment, Process
-    ).join(
-        Assessment, TotalResult.assessment_id == Assessment.id
-    ).join(
-        Process, Assessment.process_id == Process.id
-    ).all()
+    page = AssessmentSummaryService.page(
+        sort=filters['sort'],
+        direction=filters['direction'],
+        industry=filters['industry'] or None,
+        recommendation=filters['recommendation'] or None,
+        search=filters['search'] or None,
+        cursor=request.args.get('cursor'),
+        limit=request.args.get('per_page', type=int)
+    )
     
     assessments_data = []
-    for total_result, assessment, process in results:
-        if total_result.total_rpa and total_result.total_ipa:
-            combined_score = max(total_result.total_rpa, total_result.total_ipa)
-        elif total_result.total_rpa:
-            combined_score = total_result.total_rpa
-        elif total_result.total_ipa:
-            combined_score = total_result.total_ipa
-        else:
-            combined_score = 0
-        
+    for summary in page.rows:
         assessments_data.append({
-            'id': assessment.id,
-            'process_name': process.name,
-            'industry': process.industry,
-            'created_at': assessment.created_at,
-            'total_rpa': total_result.total_rpa,
-            'total_ipa': total_result.total_ipa,
-            'rpa_excluded': total_result.rpa_excluded,
-            'ipa_excluded': total_result.ipa_excluded,
-            'combined_score': combined_score
+            'id': summary.assessment_id,
+            'process_name': summary.process_name,
+            'industry': summary.industry,
+            'created_at': summary.created_at,
+            'total_rpa': summary.total_rpa,
+            'total_ipa': summary.total_ipa,
+            'rpa_excluded': summary.rpa_excluded,
+            'ipa_excluded': summary.ipa_excluded,
+            'rpa_excluded_by': summary.rpa_excluded_by.split(', ') if summary.rpa_excluded_by else [],
+            'ipa_excluded_by': summary.ipa_excluded_by.split(', ') if summary.ipa_excluded_by else [],
+            'combined_score': summary.combined_score
         })
     
-    return render_template('comparison.html', assessments=assessments_data)
+    # Link zur nächsten Seite behält Sortierung und Filter bei
+    next_url = None
+    if page.next_cursor:
+        next_url = url_for('comparison', **{k: v for k, v in request.args.items() if k != 'cursor'},
+                           cursor=page.next_cursor)
+    
+    return render_template(
+        'comparison.html',
+        assessments=assessments_data,
+        filters=filters,
+        filtered=any(filters[k] for k in ('industry', 'recommendation', 'search')),
+        industries=AssessmentSummaryService.industries(),
+        is_first_page=not request.args.get('cursor'),
+        next_url=next_url
+    )
 
 
 # ============================================
@@ -1034,178 +781,18 @@ def view_assessment(assessment_id):
     assessment = Assessment.query.get_or_404(assessment_id)
     process = db.session.get(Process, assessment.process_id)
     
-    # Gesamtergebnis
-    total_result = TotalResult.query.filter_by(assessment_id=assessment_id).first()
-    
-    # Dimensionsergebnisse
-    dim_results = db.session.query(
-        DimensionResult, Dimension
-    ).join(
-        Dimension, DimensionResult.dimension_id == Dimension.id
-    ).filter(
-        DimensionResult.assessment_id == assessment_id
-    ).order_by(
-        Dimension.sort_order, DimensionResult.automation_type
-    ).all()
+    # Masterdaten aus dem kompilierten Fragebogen, Antworten mit EINER Query
+    compiled = get_compiled_questionnaire(assessment.questionnaire_version_id)
+    answers, answers_by_q = ResultViewService.load_answers(assessment_id)
     
-    # Gruppiere Ergebnisse nach Dimension (pro Dimension gibt es RPA und IPA)
-    dimensions_by_id = {}
-    for dim_result, dimension in dim_results:
-        if dimension.id not in dimensions_by_id:
-            dimensions_by_id[dimension.id] = {
-                'code': dimension.code,
-                'name': dimension.name,
-                'calc_method': dimension.calc_method,
-                'is_shared': dimension.code in ['1', '7'],  # FIX: Nur Dimension 1 (Plattformverfügbarkeit und Umsetzungsreife) und 7 (Wirtschaft) sind shared
-                'rpa_score': None,
-                'ipa_score': None,
-                'rpa_excluded': False,
-                'ipa_excluded': False,
-                'answers': []  # Wird später gefüllt
-            }
-        
-        # Speichere Score basierend auf automation_type
-        if dim_result.automation_type == "RPA":
-            dimensions_by_id[dimension.id]['rpa_score'] = dim_result.mean_score
-            dimensions_by_id[dimension.id]['rpa_excluded'] = dim_result.is_excluded
-        elif dim_result.automation_type == "IPA":
-            dimensions_by_id[dimension.id]['ipa_score'] = dim_result.mean_score
-            dimensions_by_id[dimension.id]['ipa_excluded'] = dim_result.is_excluded
-    
-    # Lade Antworten für jede Dimension
-    from models.database import Question, Answer, ScaleOption, OptionScore
-    
-    for dimension_id, dim_data in dimensions_by_id.items():
-        # Hole alle Fragen für diese Dimension
-        questions = Question.query.filter_by(dimension_id=dimension_id).order_by(Question.sort_order).all()
-        
-        for question in questions:
-            # Hole ALLE Antworten für diese Frage (wichtig für Multiple Choice)
-            answers = Answer.query.filter_by(
-                assessment_id=assessment_id,
-                question_id=question.id
-            ).all()
-            
-            if not answers:
-                continue
-            
-            # Formatiere Antwort(en)
-            answer_text = "Keine Antwort"
-            all_option_ids = []
-            
-            if question.question_type == "number":
-                # Numerische Frage - nur eine Antwort
-                if answers[0].numeric_value is not None:
-                    answer_text = f"{answers[0].numeric_value}"
-                    if question.unit:
-                        answer_text += f" {question.unit}"
-                        
-            elif question.question_type == "multiple_choice":
-                # Multiple Choice - mehrere Antworten möglich
-                selected_options = []
-                for ans in answers:
-                    if ans.scale_option_id:
-                        option = ScaleOption.query.get(ans.scale_option_id)
-                        if option:
-                            selected_options.append(option.label)
-                            all_option_ids.append(ans.scale_option_id)
-                
-                if selected_options:
-                    answer_text = ", ".join(selected_options)
-                    
-            else:
-                # Single Choice - nur eine Antwort
-                if answers[0].scale_option_id:
-                    option = ScaleOption.query.get(answers[0].scale_option_id)
-                    if option:
-                        answer_text = option.label
-                        all_option_ids.append(answers[0].scale_option_id)
-            
-            # Hole Scores für diese Antwort(en)
-            rpa_score_text = "–"
-            ipa_score_text = "–"
-            
-            if all_option_ids:
-                # Für Multiple Choice: Zeige den höchsten Score an
-                if question.question_type == "multiple_choice":
-                    # Hole alle OptionScores für die gewählten Optionen
-                    rpa_scores_objs = OptionScore.query.filter(
-                        OptionScore.question_id == question.id,
-                        OptionScore.scale_option_id.in_(all_option_ids),
-                        OptionScore.automation_type == "RPA"
-                    ).all()
-                    
-                    ipa_scores_objs = OptionScore.query.filter(
-                        OptionScore.question_id == question.id,
-                        OptionScore.scale_option_id.in_(all_option_ids),
-                        OptionScore.automation_type == "IPA"
-                    ).all()
-                    
-                    # RPA: Prüfe auf Ausschluss, dann höchster Score
-                    if any(s.is_exclusion for s in rpa_scores_objs):
-                        rpa_score_text = "AUSSCHLUSS"
-                    else:
-                        applicable_rpa = [s.score for s in rpa_scores_objs if s.is_applicable and s.score is not None]
-                        if applicable_rpa:
-                            rpa_score_text = f"{max(applicable_rpa):.1f} (max)"
-                    
-                    # IPA: Prüfe auf Ausschluss, dann höchster Score
-                    if any(s.is_exclusion for s in ipa_scores_objs):
-                        ipa_score_text = "AUSSCHLUSS"
-                    else:
-                        applicable_ipa = [s.score for s in ipa_scores_objs if s.is_applicable and s.score is not None]
-                        if applicable_ipa:
-                            ipa_score_text = f"{max(applicable_ipa):.1f} (max)"
-                
-                else:
-                    # Single Choice - wie bisher
-                    option_id = all_option_ids[0]
-                    
-                    # RPA Score
-                    rpa_score_obj = OptionScore.query.filter_by(
-                        question_id=question.id,
-                        scale_option_id=option_id,
-                        automation_type="RPA"
-                    ).first()
-                    
-                    if rpa_score_obj:
-                        if rpa_score_obj.is_exclusion:
-                            rpa_score_text = "AUSSCHLUSS"
-                        elif not rpa_score_obj.is_applicable:
-                            rpa_score_text = "N/A"
-                        elif rpa_score_obj.score is not None:
-                            rpa_score_text = f"{rpa_score_obj.score:.1f}"
-                    
-                    # IPA Score
-                    ipa_score_obj = OptionScore.query.filter_by(
-                        question_id=question.id,
-                        scale_option_id=option_id,
-                        automation_type="IPA"
-                    ).first()
-                    
-                    if ipa_score_obj:
-                        if ipa_score_obj.is_exclusion:
-                            ipa_score_text = "AUSSCHLUSS"
-                        elif not ipa_score_obj.is_applicable:
-                            ipa_score_text = "N/A"
-                        elif ipa_score_obj.score is not None:
-                            ipa_score_text = f"{ipa_score_obj.score:.1f}"
-            
-            dim_data['answers'].append({
-                'question_code': question.code,
-                'question_text': question.text,
-                'answer': answer_text,
-                'is_applicable': answers[0].is_applicable,
-                'rpa_score': rpa_score_text,
-                'ipa_score': ipa_score_text
-            })
+    # Gesamtergebnis + Wirtschaftlichkeitskennzahlen
+    total_result, economic_metrics_data = ResultViewService.load_totals(assessment_id)
     
-    # Formatiere Dimensionsergebnisse (sortiert nach Sort-Order)
-    dimensions_data = []
-    for dim_result, dimension in dim_results:
-        if dimension.id in dimensions_by_id:
-            data = dimensions_by_id.pop(dimension.id)
-            dimensions_data.append(data)
+    # Dimensionsergebnisse inkl. Antworten und gespeicherter Einzelbewertungen
+    question_results = ResultViewService.load_question_results(assessment_id)
+    dimensions_data = ResultViewService.build_dimensions_data(
+        assessment_id, compiled, answers_by_q, question_results
+    )
     
     # Berechne max_score basierend auf Anzahl der Dimensionen
     # Jede Dimension hat einen Score von 0-5, also max_score = Anzahl Dimensionen * 5
@@ -1218,17 +805,8 @@ def view_assessment(assessment_id):
     rpa_excluded = total_result.rpa_excluded if total_result else False
     ipa_excluded = total_result.ipa_excluded if total_result else False
     
-    # Lade Economic Metrics
-    economic_metrics_data = {}
-    econ_metrics = EconomicMetric.query.filter_by(assessment_id=assessment_id).all()
-    for metric in econ_metrics:
-        economic_metrics_data[metric.key] = {
-            'value': metric.value,
-            'unit': metric.unit
-        }
-    
-    # Analyse Plattformverfügbarkeit
-    platform_status = analyze_platform_availability(assessment_id)
+    # Analyse Plattformverfügbarkeit (auf den bereits geladenen Antworten)
+    platform_status = analyze_platform_availability(assessment_id, answers=answers, compiled=compiled)
     
     return render_template(
         'result.html',
@@ -1267,14 +845,16 @@ def delete_assessment(assessment_id):
         # 1. Lösche Antworten
         Answer.query.filter_by(assessment_id=assessment_id).delete()
         
-        # 2. Lösche Dimensionsergebnisse
+        # 2. Lösche Dimensionsergebnisse und Einzelbewertungen
         DimensionResult.query.filter_by(assessment_id=assessment_id).delete()
+        QuestionResult.query.filter_by(assessment_id=assessment_id).delete()
         
         # 3. Lösche Gesamtergebnis
         TotalResult.query.filter_by(assessment_id=assessment_id).delete()
         
-        # 4. Lösche Economic Metrics
+        # 4. Lösche Economic Metrics und Vergleichszeile
         EconomicMetric.query.filter_by(assessment_id=assessment_id).delete()
+        AssessmentSummaryService.delete([assessment_id])
         
         # 5. Lösche Assessment selbst
         db.session.delete(assessment)
@@ -1296,9 +876,7 @@ def delete_assessment(assessment_id):
     
     except Exception as e:
         db.session.rollback()
-        print(f"❌ Fehler beim Löschen von Assessment {assessment_id}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Löschen fehlgeschlagen", extra={'assessment_id': assessment_id})
         return f"Fehler beim Löschen: {str(e)}", 500
 # ============================================
 # Route: Gemeinsame Dimensionen zurücksetzen
@@ -1315,13 +893,13 @@ def reset_shared_dimensions():
         
         db.session.commit()
         
-        print(f"✅ Gemeinsame Dimensionen {shared_dim_ids} wurden zurückgesetzt")
+        logger.info("Gemeinsame Dimensionen zurückgesetzt", extra={'dimension_ids': shared_dim_ids})
         
         return jsonify({'success': True}), 200
     
     except Exception as e:
         db.session.rollback()
-        print(f"❌ Fehler beim Zurücksetzen gemeinsamer Dimensionen: {str(e)}")
+        logger.exception("Zurücksetzen gemeinsamer Dimensionen fehlgeschlagen")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 # ============================================
@@ -1359,10 +937,15 @@ def export_assessment(assessment_id):
     # Gesamtergebnis
     writer.writerow(['Gesamtergebnis'])
     writer.writerow(['Typ', 'Score', 'Status'])
-    writer.writerow(['RPA', total_result.total_rpa or '-', 
-                     'Ausgeschlossen' if total_result.rpa_excluded else 'Bewertet'])
-    writer.writerow(['IPA', total_result.total_ipa or '-',
-                     'Ausgeschlossen' if total_result.ipa_excluded else 'Bewertet'])
+    if total_result is None:
+        # Noch nicht bewertet (z.B. nur per Autosave teilweise ausgefüllt)
+        writer.writerow(['RPA', '-', 'Nicht bewertet'])
+        writer.writerow(['IPA', '-', 'Nicht bewertet'])
+    else:
+        writer.writerow(['RPA', total_result.total_rpa or '-', 
+                         'Ausgeschlossen' if total_result.rpa_excluded else 'Bewertet'])
+        writer.writerow(['IPA', total_result.total_ipa or '-',
+                         'Ausgeschlossen' if total_result.ipa_excluded else 'Bewertet'])
     writer.writerow([])
     
     # Dimensionsergebnisse
@@ -1392,6 +975,24 @@ def export_assessment(assessment_id):
             dim_data['rpa'] if dim_data['rpa'] is not None else '-',
             dim_data['ipa'] if dim_data['ipa'] is not None else '-'
         ])
+    writer.writerow([])
+    
+    # Einzelbewertungen (beim Scoring gespeichert)
+    compiled = get_compiled_questionnaire(assessment.questionnaire_version_id)
+    question_results = ResultViewService.load_question_results(assessment_id)
+    writer.writerow(['Einzelbewertungen'])
+    writer.writerow(['Code', 'Frage', 'RPA Score', 'IPA Score'])
+    for question in (q for dim in compiled.dimensions for q in dim.questions):
+        rpa = question_results.get((question.id, 'RPA'))
+        ipa = question_results.get((question.id, 'IPA'))
+        if rpa is None and ipa is None:
+            continue
+        writer.writerow([
+            question.code,
+            question.text,
+            ResultViewService.format_score(rpa),
+            ResultViewService.format_score(ipa)
+        ])
     
     # Response
     output.seek(0)
@@ -1402,6 +1003,448 @@ def export_assessment(assessment_id):
     )
 
 
+# ============================================
+# Route: Massen-Import (CSV/JSON)
+# ============================================
+def _import_report_json(report):
+    return {
+        'success': True,
+        'job_id': report.job_id,
+        'processed': report.processed,
+        'imported': report.imported,
+        'failed': report.failed,
+        'resumed_from': report.resumed_from,
+        'already_complete': report.already_complete,
+        'elapsed': round(report.elapsed, 3),
+        'rows_per_second': round(report.per_second, 1),
+        'errors': [{'row': e.row, 'message': e.message} for e in report.errors],
+        'ignored_columns': list(report.ignored_columns),
+    }
+
+
+@app.route('/import', methods=['POST'])
+def import_assessments():
+    """
+    Importiert Prozesse mit Antworten (Spalten/Schlüssel = Fragen-Codes) und bewertet sie.
+
+    Body: Datei-Upload (Feld "file", .csv/.json) oder JSON-Liste von Prozessen
+    ?version=1                   Fragebogen-Version (Standard: aktive Version)
+    ?validate_only=1             nur prüfen, nichts schreiben
+    """
+
+    upload = request.files.get('file')
+    if upload is not None:
+        data, filename, fmt = upload.read(), upload.filename, None
+    elif request.is_json:
+        data, filename, fmt = request.get_data(), None, 'json'
+    else:
+        return jsonify({'success': False, 'error': 'Erwartet: Datei-Upload (file) oder JSON-Body'}), 400
+
+    try:
+        report = BulkImportService.import_bytes(
+            data, filename=filename, fmt=fmt,
+            questionnaire_version_id=request.args.get('version', type=int),
+            validate_only=request.args.get('validate_only') in ('1', 'true')
+        )
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        logger.exception("Import fehlgeschlagen")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+    return jsonify(_import_report_json(report))
+
+
+# ============================================
+# Route: Massen-Export aller Assessments (Streaming)
+# ============================================
+@app.route('/export')
+def export_all():
+    """
+    Streamt alle Assessments mit Ergebnissen, Antworten und Kennzahlen.
+
+    ?format=csv|ndjson           (Parquet nur per CLI: flask export --format parquet)
+    ?since=2025-01-01            nur Assessments ab diesem Datum
+    ?version=1                   nur eine Fragebogen-Version
+    """
+
+    fmt = request.args.get('format', 'csv')
+    if fmt not in BulkExportService.MIMETYPES:
+        return jsonify({'success': False, 'error': f'Format nicht unterstützt: {fmt}'}), 400
+    try:
+        since = datetime.fromisoformat(request.args['since']) if request.args.get('since') else None
+    except ValueError:
+        return jsonify({'success': False, 'error': 'since: erwartet ISO-Datum (JJJJ-MM-TT)'}), 400
+
+    chunks = BulkExportService.stream(
+        fmt, since=since, questionnaire_version_id=request.args.get('version', type=int)
+    )
+    return Response(
+        stream_with_context(chunks),
+        mimetype=BulkExportService.MIMETYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename=assessments.{fmt}'}
+    )
+
+
+# ============================================
+# Route: What-if-Analyse Wirtschaftlichkeit (JSON)
+# ============================================
+@app.route('/assessment/<int:assessment_id>/sensitivity')
+def economic_sensitivity(assessment_id):
+    """
+    Sensitivität der Wirtschaftlichkeit (Dimension 7) eines Assessments.
+
+    ?delta=0.2                       Tornado: jede Eingabe/Konstante ±20 %
+    ?sweep=7.5=0:1000:51&sweep=...   Gitter über die angegebenen Parameter (spaltenweise)
+    ?cost_per_fte_year=60000         Konstanten für das Szenario überschreiben
+    """
+
+    Assessment.query.get_or_404(assessment_id)
+    try:
+        overrides = {
+            name: float(request.args[name])
+            for name in ('annual_work_hours_per_fte', 'cost_per_fte_year') if name in request.args
+        }
+        sweeps = request.args.getlist('sweep')
+        if sweeps:
+            grid = EconomicAnalysisService.parse_grid(sweeps)
+            axes, result = EconomicAnalysisService.sweep(assessment_id, grid, constant_overrides=overrides)
+            return jsonify({
+                'success': True,
+                'parameters': {name: EconomicAnalysisService.json_list(column) for name, column in axes.items()},
+                'results': EconomicAnalysisService.to_columns(result),
+            })
+
+        delta = request.args.get('delta', type=float, default=EconomicAnalysisService.DEFAULT_DELTA)
+        base, bars = EconomicAnalysisService.tornado(assessment_id, delta=delta, constant_overrides=overrides)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    return jsonify({
+        'success': True,
+        'delta': delta,
+        'base': {key: values[0] for key, values in EconomicAnalysisService.to_columns(base).items()},
+        'tornado': EconomicAnalysisService.tornado_rows(bars),
+    })
+
+
+# ============================================
+# Route: Portfolio-Auswertung (alle Assessments)
+# ============================================
+def _portfolio_request():
+    """Gemeinsame Parameter für /portfolio und /portfolio/export"""
+    columns = PortfolioService.load(industry=request.args.get('industry') or None)
+    budget = request.args.get('budget', type=float)
+    selection = None
+    if budget is not None:
+        selection = PortfolioService.select(columns, budget, request.args.get('objective'))
+    return columns, selection
+
+
+@app.route('/portfolio')
+def portfolio():
+    """
+    Kennzahlen-Summen über alle Assessments, optional mit Auswahl unter Budget.
+
+    ?budget=250000               Obergrenze für die Summe der initialen Fixkosten
+    ?objective=netto_nutzen      Zielgröße (netto_nutzen | fte_einsparung)
+    ?industry=Banken             nur Prozesse einer Branche
+    """
+
+    try:
+        columns, selection = _portfolio_request()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    response = {'success': True, 'totals': PortfolioService.totals(columns)._asdict()}
+    if selection is not None:
+        response['selection'] = {
+            'budget': selection.budget,
+            'objective': selection.objective,
+            'method': selection.method,
+            'totals': selection.totals._asdict(),
+            'assessments': [
+                {
+                    'assessment_id': columns.assessment_ids[i],
+                    'process_name': columns.process_names[i],
+                    **{key: float(columns.metrics[key][i]) for key in METRIC_KEYS},
+                }
+                for i in selection.indices
+            ],
+        }
+    return jsonify(response)
+
+
+@app.route('/portfolio/export')
+def export_portfolio():
+    """Exportiert das Portfolio als CSV (eine Zeile pro Assessment, ggf. mit Auswahl-Spalte)"""
+
+    try:
+        columns, selection = _portfolio_request()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    output = StringIO()
+    writer = csv.writer(output)
+    header = ['Assessment', 'Prozess', 'Branche', *METRIC_KEYS]
+    if selection is not None:
+        header.append('Ausgewählt')
+        selected = set(selection.indices)
+    writer.writerow(header)
+    metric_columns = [columns.metrics[key] for key in METRIC_KEYS]
+    for i in range(len(columns)):
+        row = [columns.assessment_ids[i], columns.process_names[i], columns.industries[i],
+               *(float(column[i]) for column in metric_columns)]
+        if selection is not None:
+            row.append('Ja' if i in selected else 'Nein')
+        writer.writerow(row)
+
+    output.seek(0)
+    return Response(
+        output,
+        mimetype='text/csv',
+        headers={'Content-Disposition': 'attachment; filename=portfolio.csv'}
+    )
+
+
+# ============================================
+# CLI: Schema-Migrationen
+# ============================================
+@app.cli.command('migrate')
+@click.option('--status', is_flag=True, help='Nur Schema-Version und ausstehende Migrationen anzeigen')
+def migrate_command(status):
+    """Wendet ausstehende Schema-Migrationen an"""
+    
+    pending = migrations.pending_migrations()
+    click.echo(f"Schema-Version: {migrations.current_version()} (aktuell: {migrations.LATEST_VERSION})")
+    for version, name, _ in pending:
+        click.echo(f"   ausstehend: {version:03d}_{name}")
+    
+    if not status:
+        migrations.upgrade()
+
+
+# ============================================
+# CLI: Produktiver Server
+# ============================================
+@app.cli.command('serve')
+@click.option('--bind', default=server.DEFAULT_BIND, show_default=True, help='Adresse:Port')
+@click.option('--workers', type=int, default=None, envvar='WEB_CONCURRENCY',
+              help='Worker-Prozesse (Standard: 2 x CPU + 1)')
+@click.option('--threads', type=int, default=1, show_default=True,
+              help='Threads pro Worker (> 1: gthread-Worker)')
+@click.option('--max-requests', type=int, default=server.DEFAULT_MAX_REQUESTS, show_default=True,
+              help='Worker nach so vielen Requests neu starten (0 = nie)')
+@click.option('--max-requests-jitter', type=int, default=server.DEFAULT_MAX_REQUESTS_JITTER, show_default=True,
+              help='Zufälliger Aufschlag auf --max-requests pro Worker')
+@click.option('--timeout', type=int, default=server.DEFAULT_TIMEOUT, show_default=True,
+              help='Sekunden bis ein hängender Worker neu gestartet wird')
+def serve_command(bind, workers, threads, max_requests, max_requests_jitter, timeout):
+    """Startet die App mit gunicorn (Preload, mehrere Worker, aufgewärmte Caches)"""
+    
+    try:
+        server.run(
+            app,
+            bind=bind,
+            workers=workers,
+            threads=threads,
+            max_requests=max_requests,
+            max_requests_jitter=max_requests_jitter,
+            timeout=timeout,
+            init_database=init_database
+        )
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+
+
+# ============================================
+# CLI: Speicherprofil
+# ============================================
+@app.cli.command('storage')
+def storage_command():
+    """Zeigt das SQLite-Speicherprofil und die wirksamen PRAGMA-Werte"""
+    
+    click.echo(f"Datenbank: {db.engine.url}")
+    click.echo(f"Profil:    {app.config['SQLITE_PROFILE']}")
+    expected = storage.resolve_profile(app.config['SQLITE_PROFILE'], app.config['SQLITE_PRAGMAS'])
+    with db.engine.connect() as conn:
+        for name, value in storage.current_pragmas(conn, expected).items():
+            click.echo(f"   {name:<14} {value!s:<12} (Profil: {expected[name]})")
+
+
+# ============================================
+# CLI: Fragebogen-Masterdaten laden
+# ============================================
+@app.cli.command('seed')
+@click.option('--file', 'path', type=click.Path(exists=True, dir_okay=False), default=None,
+              help='Fragebogen-Definition (Standard: data/questionnaire.json)')
+@click.option('--force', is_flag=True, help='Auch bei unverändertem Inhalts-Hash neu schreiben')
+def seed_command(path, force):
+    """Lädt die Fragebogen-Definition (idempotent, Upsert über natürliche Schlüssel)"""
+    from seed_data import seed_data, DEFINITION_PATH
+
+    seed_data(path or DEFINITION_PATH, force=force)
+
+
+# ============================================
+# CLI: Bestand neu berechnen
+# ============================================
+@app.cli.command('rescore')
+@click.option('--since', type=click.DateTime(), default=None,
+              help='Nur Assessments ab diesem Zeitpunkt (created_at)')
+@click.option('--version', 'questionnaire_version_id', type=int, default=None,
+              help='Nur Assessments dieser Fragebogen-Version (id)')
+@click.option('--chunk-size', type=int, default=ScoringService.RESCORE_CHUNK_SIZE, show_default=True,
+              help='Assessments pro Chunk')
+@click.option('--workers', type=int, default=os.cpu_count() or 1, show_default=True,
+              help='Anzahl Prozesse für das Scoring (1 = ohne Pool)')
+@click.option('--dry-run', is_flag=True, help='Nichts schreiben, nur Abweichungen anzeigen')
+def rescore_command(since, questionnaire_version_id, chunk_size, workers, dry_run):
+    """Berechnet gespeicherte Assessments neu (nach Änderungen an Scores/Konstanten)"""
+    
+    report = ScoringService.rescore_all(
+        since=since,
+        questionnaire_version_id=questionnaire_version_id,
+        dry_run=dry_run,
+        chunk_size=chunk_size,
+        workers=workers,
+        progress=lambda n: click.echo(f"   ... {n} Assessments verarbeitet")
+    )
+    
+    if dry_run:
+        for diff in report.diffs:
+            click.echo(f"Assessment {diff.assessment_id}: {diff.old} -> {diff.new}")
+    
+    click.echo(f"\n{'='*60}")
+    click.echo(f"{'DRY-RUN: ' if dry_run else ''}{report.processed} Assessments neu berechnet, "
+               f"{report.changed} mit geändertem Gesamtergebnis")
+    click.echo(f"⏱️  {report.elapsed:.2f}s ({report.per_second:.1f} Assessments/s)")
+    click.echo(f"{'='*60}")
+
+
+# ============================================
+# CLI: Massen-Import
+# ============================================
+@app.cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(BulkImportService.FORMATS), default=None,
+              help='Standard: aus der Dateiendung')
+@click.option('--version', 'questionnaire_version_id', type=int, default=None,
+              help='Fragebogen-Version (id, Standard: aktive Version)')
+@click.option('--batch-size', type=int, default=BulkImportService.BATCH_SIZE, show_default=True,
+              help='Zeilen pro Batch (ein Commit pro Batch)')
+@click.option('--workers', type=int, default=os.cpu_count() or 1, show_default=True,
+              help='Anzahl Prozesse für das Scoring (1 = ohne Pool)')
+@click.option('--validate-only', is_flag=True, help='Nur prüfen, nichts schreiben')
+def import_command(path, fmt, questionnaire_version_id, batch_size, workers, validate_only):
+    """Importiert Prozesse mit Antworten aus CSV/JSON (fortsetzbar nach Abbruch)"""
+
+    try:
+        report = BulkImportService.import_file(
+            path, fmt,
+            questionnaire_version_id=questionnaire_version_id,
+            batch_size=batch_size,
+            workers=workers,
+            validate_only=validate_only,
+            progress=lambda n: click.echo(f"   ... {n} Zeilen verarbeitet")
+        )
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    if report.already_complete:
+        click.echo(f"Datei wurde bereits vollständig importiert (Job {report.job_id}, {report.resumed_from} Zeilen)")
+        return
+
+    for error in report.errors:
+        click.echo(f"Zeile {error.row}: {error.message}")
+    if report.ignored_columns:
+        click.echo(f"Ignorierte Spalten: {', '.join(report.ignored_columns)}")
+
+    click.echo(f"\n{'='*60}")
+    if report.resumed_from:
+        click.echo(f"Fortgesetzt nach Zeile {report.resumed_from}")
+    click.echo(f"{'VALIDIERUNG: ' if validate_only else ''}{report.processed} Zeilen verarbeitet, "
+               f"{report.imported} {'gültig' if validate_only else 'importiert'}, {report.failed} fehlerhaft")
+    click.echo(f"⏱️  {report.elapsed:.2f}s ({report.per_second:.1f} Zeilen/s)")
+    click.echo(f"{'='*60}")
+
+
+# ============================================
+# CLI: Massen-Export
+# ============================================
+@app.cli.command('export')
+@click.option('--format', 'fmt', type=click.Choice(BulkExportService.FORMATS), default='csv', show_default=True)
+@click.option('--output', type=click.Path(dir_okay=False, writable=True), default='-',
+              help='Zieldatei (Standard: stdout; Parquet benötigt eine Datei)')
+@click.option('--since', type=click.DateTime(), default=None,
+              help='Nur Assessments ab diesem Zeitpunkt (created_at)')
+@click.option('--version', 'questionnaire_version_id', type=int, default=None,
+              help='Nur Assessments dieser Fragebogen-Version (id)')
+@click.option('--chunk-size', type=int, default=BulkExportService.CHUNK_SIZE, show_default=True,
+              help='Assessments pro gelesener Partition')
+def export_command(fmt, output, since, questionnaire_version_id, chunk_size):
+    """Exportiert alle Assessments (CSV, NDJSON oder Parquet) mit konstantem Speicherbedarf"""
+
+    if fmt == 'parquet':
+        if output == '-':
+            raise click.ClickException('Parquet-Export benötigt --output')
+        try:
+            count = BulkExportService.write_parquet(output, since, questionnaire_version_id, chunk_size)
+        except RuntimeError as e:
+            raise click.ClickException(str(e))
+        click.echo(f"✅ {count} Assessments nach {output} exportiert", err=True)
+        return
+
+    with click.open_file(output, 'w', encoding='utf-8') as f:
+        for chunk in BulkExportService.stream(fmt, since, questionnaire_version_id, chunk_size):
+            f.write(chunk)
+
+
+# ============================================
+# CLI: What-if-Analyse Wirtschaftlichkeit
+# ============================================
+@app.cli.command('whatif')
+@click.argument('assessment_id', type=int)
+@click.option('--delta', type=float, default=EconomicAnalysisService.DEFAULT_DELTA, show_default=True,
+              help='Relative Variation für die Tornado-Tabelle')
+@click.option('--sweep', 'sweeps', multiple=True, metavar='PARAM=START:STOP:NUM',
+              help='Gitter über einen Parameter (mehrfach angeben = kartesisches Produkt)')
+@click.option('--max-points', type=int, default=1_000_000, show_default=True,
+              help='Obergrenze für Gitterpunkte')
+@click.option('--output', type=click.File('w'), default='-',
+              help='CSV-Datei für das Gitter (Standard: stdout)')
+def whatif_command(assessment_id, delta, sweeps, max_points, output):
+    """Sensitivitäts-Tabelle (Tornado) oder Gitter-CSV der Wirtschaftlichkeit eines Assessments"""
+
+    try:
+        if sweeps:
+            grid = EconomicAnalysisService.parse_grid(sweeps, max_points=max_points)
+            axes, result = EconomicAnalysisService.sweep(assessment_id, grid, max_points=max_points)
+        else:
+            base, bars = EconomicAnalysisService.tornado(assessment_id, delta=delta)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    if sweeps:
+        columns = {**axes, **result._asdict()}
+        writer = csv.writer(output)
+        writer.writerow(list(columns))
+        writer.writerows(zip(*columns.values()))
+        return
+
+    click.echo(f"Basis: ROI {base.roi:.1%}, Score {base.score:.0f}, "
+               f"Break-even {base.break_even_haeufigkeit_monat:.1f} Fälle/Monat, "
+               f"Amortisation {base.amortisation_monate:.1f} Monate")
+    click.echo(f"\n{'Parameter':<32} {'-' + format(delta, '.0%'):>10} {'+' + format(delta, '.0%'):>10} "
+               f"{'ROI -':>10} {'ROI +':>10} {'Score':>7}")
+    for bar in bars:
+        click.echo(f"{bar.label:<32.32} {bar.low_value:>10.4g} {bar.high_value:>10.4g} "
+                   f"{bar.roi_low:>10.1%} {bar.roi_high:>10.1%} "
+                   f"{bar.score_low:>3.0f}/{bar.score_high:<3.0f}")
+
+
 # ============================================
 # Main
 # ============================================
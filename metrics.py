@@ -0,0 +1,319 @@
+"""
+Messwerte pro Request (Middleware) und Prometheus-Export unter /metrics
+
+Pro Request werden erfasst:
+- Gesamtdauer (before_request -> after_request)
+- Anzahl und Dauer der SQL-Statements (SQLAlchemy before/after_cursor_execute)
+- Dauer des Template-Renderings (Flask-Signale before_render_template/template_rendered)
+- Spitzen-Speicher der Allokationen (tracemalloc, nur mit METRICS_TRACE_MEMORY, kostet Zeit)
+- N+1-Verdacht: Statements mit identischem SQL-Text, die im selben Request mehrfach
+  ausgeführt wurden (Anzahl der Wiederholungen)
+
+Die Werte werden pro Route (URL-Regel) in Histogrammen aggregiert und von render() im
+Prometheus-Textformat ausgegeben. Erfasst wird beim Abbau des Requests (teardown), damit
+auch Requests mit unbehandelter Ausnahme (Status 500) gezählt werden. Mit METRICS_DEBUG
+erhält jede Antwort zusätzlich Server-Timing- und X-*-Header (sichtbar in den
+Browser-Entwicklertools).
+
+Die Aggregation ist pro Prozess: Jede Messreihe trägt das Label pid, damit die Zähler
+pro Reihe monoton bleiben, auch wenn bei flask serve mit mehreren Workern jeweils ein
+anderer Worker den Scrape beantwortet (Abfragen über Worker hinweg mit
+sum without (pid) (rate(...))). Vollständige Werte liefert nur ein Scrape pro Worker
+bzw. ein einzelner Worker. Nach fork setzt server.py die Messwerte zurück (reset()).
+Gestreamte Antworten (/export) werden bis zum Beginn des Streams gemessen.
+"""
+import os
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+from flask import g, has_request_context, request, before_render_template, template_rendered
+from sqlalchemy import event
+
+PREFIX = "automationfit"
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+MEMORY_BUCKETS = (65536, 262144, 1048576, 4194304, 16777216, 67108864, 268435456)
+
+# Header im Debug-Modus: so viele Zeichen des häufigsten wiederholten Statements
+DEBUG_STATEMENT_LENGTH = 200
+
+
+class Histogram:
+    """Kumulatives Histogramm pro Label-Kombination (thread-sicher über den Registry-Lock)"""
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series = {}  # labels -> [counts pro Bucket..., +Inf], sum
+
+    def observe(self, labels, value):
+        counts, total = self.series.get(labels) or ([0] * (len(self.buckets) + 1), 0.0)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+        counts[-1] += 1
+        self.series[labels] = (counts, total + value)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self.series.items()):
+            for bound, count in zip(self.buckets, counts):
+                lines.append(f"{self.name}_bucket{_labels(labels, le=_number(bound))} {count}")
+            lines.append(f"{self.name}_bucket{_labels(labels, le='+Inf')} {counts[-1]}")
+            lines.append(f"{self.name}_sum{_labels(labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(labels)} {counts[-1]}")
+        return lines
+
+
+class CounterMetric:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.series = Counter()
+
+    def inc(self, labels, value=1):
+        self.series[labels] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.series.items()):
+            lines.append(f"{self.name}{_labels(labels)} {_number(value)}")
+        return lines
+
+
+class Registry:
+    """Alle Messreihen eines Prozesses"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Verwirft alle Messreihen (auch für Kindprozesse nach fork: neuer Lock)"""
+        self.lock = threading.Lock()
+        self.requests = CounterMetric(f"{PREFIX}_requests_total", "Requests nach Route, Methode und Status")
+        self.duration = Histogram(f"{PREFIX}_request_duration_seconds",
+                                  "Gesamtdauer pro Request", DURATION_BUCKETS)
+        self.sql_queries = Histogram(f"{PREFIX}_request_sql_queries",
+                                     "SQL-Statements pro Request", QUERY_BUCKETS)
+        self.sql_duration = Histogram(f"{PREFIX}_request_sql_duration_seconds",
+                                      "SQL-Zeit pro Request", DURATION_BUCKETS)
+        self.template_duration = Histogram(f"{PREFIX}_request_template_duration_seconds",
+                                           "Template-Rendering pro Request", DURATION_BUCKETS)
+        self.peak_memory = Histogram(f"{PREFIX}_request_peak_memory_bytes",
+                                     "Spitzen-Speicher der Allokationen pro Request (tracemalloc)",
+                                     MEMORY_BUCKETS)
+        self.repeated_queries = CounterMetric(f"{PREFIX}_request_repeated_queries_total",
+                                              "Wiederholte identische SQL-Statements (N+1-Verdacht)")
+
+    def record(self, route, method, status, sample):
+        labels = (("route", route), ("method", method), ("pid", str(os.getpid())))
+        with self.lock:
+            self.requests.inc(labels + (("status", str(status)),))
+            self.duration.observe(labels, sample.duration)
+            self.sql_queries.observe(labels, sample.sql_count)
+            self.sql_duration.observe(labels, sample.sql_time)
+            self.template_duration.observe(labels, sample.template_time)
+            if sample.peak_memory is not None:
+                self.peak_memory.observe(labels, sample.peak_memory)
+            if sample.repeated_queries:
+                self.repeated_queries.inc(labels, sample.repeated_queries)
+
+    def render(self):
+        with self.lock:
+            lines = []
+            for metric in (self.requests, self.duration, self.sql_queries, self.sql_duration,
+                           self.template_duration, self.peak_memory, self.repeated_queries):
+                if metric.series:
+                    lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+class RequestSample:
+    """Messwerte des laufenden Requests (liegt in flask.g)"""
+
+    __slots__ = ("started", "duration", "status", "sql_count", "sql_time", "template_time",
+                 "template_started", "statements", "peak_memory", "memory_base")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.status = None  # bleibt None, wenn after_request nicht erreicht wird
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.template_started = None
+        self.statements = Counter()
+        self.peak_memory = None
+        self.memory_base = None
+
+    @property
+    def repeated_queries(self):
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def most_repeated(self):
+        statement, count = self.statements.most_common(1)[0] if self.statements else (None, 0)
+        return (statement, count) if count > 1 else (None, 0)
+
+
+def _current_sample():
+    if not has_request_context():
+        return None
+    return g.get("_metrics")
+
+
+# ========================================
+# Registrierung
+# ========================================
+
+def init_app(app, db):
+    """
+    Registriert Request-Hooks, Template-Signale und SQL-Events.
+
+    Konfiguration (Standard aus Umgebungsvariablen gleichen Namens):
+        METRICS_ENABLED       Messung an/aus (Standard: an)
+        METRICS_DEBUG         Server-Timing/X-*-Header in jeder Antwort
+        METRICS_TRACE_MEMORY  Spitzen-Speicher per tracemalloc (verlangsamt jeden Request)
+    """
+    def flag(name, default):
+        return os.environ.get(name, default).lower() in ("1", "true", "yes", "on")
+
+    app.config.setdefault("METRICS_ENABLED", flag("METRICS_ENABLED", "1"))
+    app.config.setdefault("METRICS_DEBUG", flag("METRICS_DEBUG", "0"))
+    app.config.setdefault("METRICS_TRACE_MEMORY", flag("METRICS_TRACE_MEMORY", "0"))
+    if not app.config["METRICS_ENABLED"]:
+        return
+
+    trace_memory = app.config["METRICS_TRACE_MEMORY"]
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    @app.before_request
+    def _start_sample():
+        sample = g._metrics = RequestSample()
+        if trace_memory:
+            tracemalloc.reset_peak()
+            sample.memory_base = tracemalloc.get_traced_memory()[0]
+
+    def finish(sample):
+        sample.duration = time.perf_counter() - sample.started
+        if trace_memory:
+            sample.peak_memory = max(0, tracemalloc.get_traced_memory()[1] - sample.memory_base)
+
+    @app.after_request
+    def _finish_sample(response):
+        sample = g.get("_metrics")
+        if sample is None:
+            return response
+        finish(sample)
+        sample.status = response.status_code
+        if app.config["METRICS_DEBUG"]:
+            _add_debug_headers(response, sample)
+        return response
+
+    @app.teardown_request
+    def _record_sample(exc):
+        sample = g.pop("_metrics", None)
+        if sample is None:
+            return
+        if sample.status is None:
+            # Unbehandelte Ausnahme: after_request wurde nicht ausgeführt
+            finish(sample)
+            sample.status = 500
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        registry.record(route, request.method, sample.status, sample)
+
+    before_render_template.connect(_template_started, app)
+    template_rendered.connect(_template_finished, app)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def render():
+    """Alle Messreihen im Prometheus-Textformat (text/plain; version=0.0.4)"""
+    return registry.render()
+
+
+def reset():
+    """Verwirft alle Messreihen dieses Prozesses (z. B. im Worker nach fork)"""
+    registry.reset()
+
+
+# ========================================
+# Signale / Events
+# ========================================
+
+def _template_started(sender, template, context, **extra):
+    sample = _current_sample()
+    if sample is not None:
+        sample.template_started = time.perf_counter()
+
+
+def _template_finished(sender, template, context, **extra):
+    sample = _current_sample()
+    if sample is not None and sample.template_started is not None:
+        sample.template_time += time.perf_counter() - sample.template_started
+        sample.template_started = None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_sample() is not None:
+        conn.info["_metrics_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    sample = _current_sample()
+    started = conn.info.pop("_metrics_started", None)
+    if sample is None or started is None:
+        return
+    sample.sql_time += time.perf_counter() - started
+    sample.sql_count += 1
+    sample.statements[statement] += 1
+
+
+def _add_debug_headers(response, sample):
+    response.headers["Server-Timing"] = (
+        f'app;dur={sample.duration * 1000:.1f}, '
+        f'sql;dur={sample.sql_time * 1000:.1f};desc="{sample.sql_count} queries", '
+        f'tpl;dur={sample.template_time * 1000:.1f}'
+    )
+    response.headers["X-Request-Time-Ms"] = f"{sample.duration * 1000:.1f}"
+    response.headers["X-SQL-Queries"] = str(sample.sql_count)
+    response.headers["X-SQL-Time-Ms"] = f"{sample.sql_time * 1000:.1f}"
+    response.headers["X-Template-Time-Ms"] = f"{sample.template_time * 1000:.1f}"
+    response.headers["X-N-Plus-One"] = str(sample.repeated_queries)
+    statement, count = sample.most_repeated()
+    if statement:
+        response.headers["X-N-Plus-One-Statement"] = (
+            f"{count}x " + " ".join(statement.split())[:DEBUG_STATEMENT_LENGTH]
+        )
+    if sample.peak_memory is not None:
+        response.headers["X-Peak-Memory-Bytes"] = str(sample.peak_memory)
+
+
+# ========================================
+# Formatierung
+# ========================================
+
+def _labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
@@ -0,0 +1,194 @@
+"""
+Versionierte Schema-Migrationen (ersetzt db.create_all beim Start)
+
+- Tabelle schema_version merkt sich alle angewendeten Migrationen
+- upgrade() wendet nur fehlende Migrationen in Reihenfolge an; ist die
+  Datenbank aktuell, kostet der Start genau eine Versionsabfrage
+- Migrationen sind idempotent (checkfirst), damit auch bestehende
+  Datenbanken ohne schema_version sauber übernommen werden
+- Backfills laufen chunkweise mit einem Commit pro Chunk
+
+Neue Migration: Funktion schreiben und unten in MIGRATIONS anhängen
+(Versionsnummern niemals ändern oder wiederverwenden).
+"""
+import logging
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+from extensions import db
+from models.database import (
+    QuestionnaireVersion, Dimension, Scale, ScaleOption, QuestionCondition,
+    Question, OptionScore, Process, Assessment, Answer, DimensionResult,
+    QuestionResult, TotalResult, AssessmentSummary, EconomicMetric, Hint,
+    SharedDimensionAnswer, SeedState, ImportJob
+)
+
+SCHEMA_VERSION_TABLE = "schema_version"
+BACKFILL_CHUNK_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+
+# ========================================
+# Hilfsfunktionen
+# ========================================
+
+def _create_tables(*models):
+    """Legt Tabellen (inkl. ihrer Indizes) an, falls sie noch nicht existieren"""
+    for model in models:
+        model.__table__.create(db.engine, checkfirst=True)
+
+
+def _create_indexes(*models):
+    """Legt deklarierte Indizes bestehender Tabellen an (SQLite: CREATE INDEX IF NOT EXISTS)"""
+    for model in models:
+        for index in model.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+
+
+def _add_columns(model, *names):
+    """Ergänzt neue (nullable) Spalten einer bestehenden Tabelle, falls sie noch fehlen"""
+    table = model.__table__
+    existing = {column["name"] for column in inspect(db.engine).get_columns(table.name)}
+    with db.engine.begin() as conn:
+        for name in names:
+            if name not in existing:
+                column_type = table.c[name].type.compile(dialect=db.engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {name} {column_type}"))
+
+
+# ========================================
+# Migrationen
+# ========================================
+
+def m001_initial_schema():
+    """Ursprüngliches Schema (Masterdaten, Antworten, Ergebnisse)"""
+    _create_tables(
+        QuestionnaireVersion, Dimension, Scale, ScaleOption, QuestionCondition,
+        Question, OptionScore, Process, Assessment, Answer, DimensionResult,
+        TotalResult, EconomicMetric, Hint, SharedDimensionAnswer
+    )
+
+
+def m002_seed_questionnaire():
+    """Fragebogen-Masterdaten"""
+    from seed_data import seed_data
+    seed_data()
+
+
+def m003_result_tables():
+    """Einzelbewertungen pro Frage und denormalisierte Vergleichstabelle"""
+    _create_tables(QuestionResult, AssessmentSummary)
+
+
+def m004_backfill_results():
+    """Einzelbewertungen und Vergleichszeilen für bestehende Assessments nachziehen"""
+    from services.scoring_service import ScoringService
+    from services.assessment_summary import AssessmentSummaryService
+
+    # Bewertete Assessments ohne Einzelbewertungen neu berechnen (pflegt auch die Vergleichstabelle)
+    report = ScoringService.rescore_all(missing_only=True, chunk_size=BACKFILL_CHUNK_SIZE)
+    if report.processed:
+        logger.info("Einzelbewertungen nachberechnet", extra={'assessments': report.processed})
+
+    # Übrige Vergleichszeilen chunkweise ergänzen
+    while AssessmentSummaryService.backfill(limit=BACKFILL_CHUNK_SIZE):
+        db.session.commit()
+
+
+def m005_hot_path_indexes():
+    """Indizes für die häufigsten Lookups in bestehenden Tabellen"""
+    _create_indexes(
+        Dimension, QuestionCondition, Question, Assessment, EconomicMetric, Hint
+    )
+
+
+def m006_seed_state():
+    """Natürliche Schlüssel für idempotentes Seeden und Inhalts-Hash der Masterdaten"""
+    from seed_data import seed_data
+    _create_tables(SeedState)
+    _create_indexes(QuestionnaireVersion, Dimension)
+    # Bestehende Masterdaten abgleichen und Hash festhalten
+    seed_data()
+
+
+def m007_import_job():
+    """Fortschritt von Massen-Imports (fortsetzbar nach Abbruch)"""
+    _create_tables(ImportJob)
+
+
+def m008_summary_refreshed_at():
+    """Änderungszeitpunkt der Vergleichszeilen (ETag/Last-Modified der JSON-API)"""
+    _add_columns(AssessmentSummary, "refreshed_at")
+    _create_indexes(AssessmentSummary)
+    # Bestehende Zeilen: Zeitpunkt der Migration statt NULL (sonst fehlt Last-Modified)
+    with db.engine.begin() as conn:
+        conn.execute(
+            AssessmentSummary.__table__.update()
+            .where(AssessmentSummary.refreshed_at.is_(None))
+            .values(refreshed_at=datetime.utcnow())
+        )
+
+
+MIGRATIONS = [
+    (1, "initial_schema", m001_initial_schema),
+    (2, "seed_questionnaire", m002_seed_questionnaire),
+    (3, "result_tables", m003_result_tables),
+    (4, "backfill_results", m004_backfill_results),
+    (5, "hot_path_indexes", m005_hot_path_indexes),
+    (6, "seed_state", m006_seed_state),
+    (7, "import_job", m007_import_job),
+    (8, "summary_refreshed_at", m008_summary_refreshed_at),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# ========================================
+# Runner
+# ========================================
+
+def current_version():
+    """Höchste angewendete Migration (0 bei neuer bzw. nicht versionierter Datenbank)"""
+    with db.engine.begin() as conn:
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} ("
+            "version INTEGER PRIMARY KEY, "
+            "name VARCHAR(100) NOT NULL, "
+            "applied_at DATETIME NOT NULL)"
+        ))
+        return conn.execute(text(f"SELECT MAX(version) FROM {SCHEMA_VERSION_TABLE}")).scalar() or 0
+
+
+def pending_migrations():
+    version = current_version()
+    return [m for m in MIGRATIONS if m[0] > version]
+
+
+def upgrade():
+    """
+    Wendet alle fehlenden Migrationen an (innerhalb eines App-Kontexts aufrufen).
+
+    Returns:
+        Liste der angewendeten Versionen
+    """
+    applied = []
+    for version, name, migrate in pending_migrations():
+        logger.info("Migration %03d_%s", version, name)
+        try:
+            migrate()
+            db.session.execute(
+                text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version, name, applied_at) "
+                     "VALUES (:version, :name, :applied_at)"),
+                {"version": version, "name": name, "applied_at": datetime.utcnow()}
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        applied.append(version)
+
+    if applied:
+        logger.info("Datenbank auf Schema-Version %d aktualisiert", LATEST_VERSION)
+    return applied
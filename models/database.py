@@ -18,11 +18,23 @@ class QuestionnaireVersion(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index("uq_questionnaire_version", "name", "version", unique=True),
+    )
+
     # Relationships
     dimensions = db.relationship('Dimension', backref='questionnaire_version', lazy=True)
     questions = db.relationship('Question', backref='questionnaire_version', lazy=True)
 
 
+class SeedState(db.Model):
+    """Inhalts-Hash der zuletzt geladenen Masterdaten (seed_data.py) -> erneutes Seeden ist ein No-op"""
+    __tablename__ = "seed_state"
+    name = db.Column(db.String(50), primary_key=True)
+    content_hash = db.Column(db.String(64), nullable=False)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class Dimension(db.Model):
     __tablename__ = "dimension"
     id = db.Column(db.Integer, primary_key=True)
@@ -32,6 +44,11 @@ class Dimension(db.Model):
     sort_order = db.Column(db.Integer, nullable=False, default=0)
     calc_method = db.Column(db.String(30), nullable=False, default="mean")
 
+    __table_args__ = (
+        db.Index("ix_dimension_version", "questionnaire_version_id", "sort_order"),
+        db.Index("uq_dimension_code", "questionnaire_version_id", "code", unique=True),
+    )
+
     # Relationships
     questions = db.relationship('Question', backref='dimension', lazy=True)
 
@@ -73,6 +90,12 @@ class QuestionCondition(db.Model):
     depends_on_option_id = db.Column(db.Integer, db.ForeignKey("scale_option.id"), nullable=False)
 
     sort_order = db.Column(db.Integer, default=0)
+
+    __table_args__ = (
+        db.Index("ix_question_condition_question", "question_id", "sort_order"),
+        db.Index("ix_question_condition_parent", "depends_on_question_id"),
+    )
+
 class Question(db.Model):
     __tablename__ = "question"
     id = db.Column(db.Integer, primary_key=True)
@@ -93,6 +116,8 @@ class Question(db.Model):
     depends_logic = db.Column(db.String(10), default="all", nullable=False)
     __table_args__ = (
         db.UniqueConstraint("questionnaire_version_id", "code", name="uq_question_code"),
+        db.Index("ix_question_version", "questionnaire_version_id", "sort_order"),
+        db.Index("ix_question_dimension", "dimension_id", "sort_order"),
     )
 
     # Relationships
@@ -151,6 +176,12 @@ class Assessment(db.Model):
     questionnaire_version_id = db.Column(db.Integer, db.ForeignKey("questionnaire_version.id"), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index("ix_assessment_process", "process_id"),
+        db.Index("ix_assessment_version", "questionnaire_version_id", "id"),
+        db.Index("ix_assessment_created_at", "created_at", "id"),
+    )
+
     # Relationships
     answers = db.relationship('Answer', backref='assessment', lazy=True)
     dimension_results = db.relationship('DimensionResult', backref='assessment', lazy=True)
@@ -182,6 +213,8 @@ class Answer(db.Model):
         # WICHTIG: Für Multiple Choice erlauben wir mehrere Antworten pro Frage
         # Unique Constraint auf assessment_id + question_id + scale_option_id
         # Damit kann jede Option nur einmal pro Assessment/Frage gewählt werden
+        # (der Unique-Index beginnt mit assessment_id, question_id und deckt damit
+        # auch alle Lookups per assessment_id bzw. (assessment_id, question_id) ab)
         db.UniqueConstraint("assessment_id", "question_id", "scale_option_id", 
                           name="uq_answer_assessment_question_option"),
     )
@@ -191,6 +224,26 @@ class Answer(db.Model):
     scale_option = db.relationship('ScaleOption', backref='answers')
 
 
+class ImportJob(db.Model):
+    """
+    Fortschritt eines Massen-Imports (services/bulk_import.py)
+
+    source_hash identifiziert die Quelldatei; next_row wird pro Batch in derselben
+    Transaktion wie die importierten Zeilen fortgeschrieben -> ein abgebrochener
+    Import setzt exakt hinter dem letzten vollständigen Batch fort
+    """
+    __tablename__ = "import_job"
+    id = db.Column(db.Integer, primary_key=True)
+    source_hash = db.Column(db.String(64), nullable=False, unique=True)
+    filename = db.Column(db.String(255), nullable=True)
+    questionnaire_version_id = db.Column(db.Integer, db.ForeignKey("questionnaire_version.id"), nullable=False)
+    next_row = db.Column(db.Integer, nullable=False, default=0)  # Anzahl bereits verarbeiteter Datenzeilen
+    imported = db.Column(db.Integer, nullable=False, default=0)
+    failed = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+
 # ========================================
 # ERGEBNISSE
 # ========================================
@@ -213,6 +266,32 @@ class DimensionResult(db.Model):
     dimension_obj = db.relationship('Dimension', backref='results')
 
 
+class QuestionResult(db.Model):
+    """
+    Einzelbewertung pro Frage und Automatisierungstyp (beim Scoring gespeichert)
+
+    - score: verwendeter Score (bei Multiple Choice der höchste anwendbare)
+    - is_exclusion: gewählte Option führt zum Ausschluss
+    - is_applicable: Score fließt in den Dimensions-Mittelwert ein
+    - source_option_id: Option, aus der der Score bzw. Ausschluss stammt
+    - is_best_of: Multiple Choice (Best-of über alle gewählten Optionen)
+    """
+    __tablename__ = "question_result"
+    id = db.Column(db.Integer, primary_key=True)
+    assessment_id = db.Column(db.Integer, db.ForeignKey("assessment.id"), nullable=False)
+    question_id = db.Column(db.Integer, db.ForeignKey("question.id"), nullable=False)
+    automation_type = db.Column(db.String(10), nullable=False)
+    score = db.Column(db.Float, nullable=True)
+    is_exclusion = db.Column(db.Boolean, default=False, nullable=False)
+    is_applicable = db.Column(db.Boolean, default=True, nullable=False)
+    source_option_id = db.Column(db.Integer, db.ForeignKey("scale_option.id"), nullable=True)
+    is_best_of = db.Column(db.Boolean, default=False, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint("assessment_id", "question_id", "automation_type", name="uq_question_result"),
+    )
+
+
 class TotalResult(db.Model):
     __tablename__ = "total_result"
     id = db.Column(db.Integer, primary_key=True)
@@ -228,6 +307,41 @@ class TotalResult(db.Model):
     assessment_obj = db.relationship('Assessment', backref='total_result', uselist=False)
 
 
+class AssessmentSummary(db.Model):
+    """
+    Denormalisierte Zeile pro bewertetem Assessment für /comparison
+    (wird beim Scoring gepflegt, siehe services/assessment_summary.py)
+
+    Sortier-/Filterspalten sind NOT NULL und mit assessment_id als Tie-Breaker
+    indiziert -> Keyset-Pagination ohne Full Scan
+    """
+    __tablename__ = "assessment_summary"
+    assessment_id = db.Column(db.Integer, db.ForeignKey("assessment.id"), primary_key=True)
+    process_id = db.Column(db.Integer, db.ForeignKey("process.id"), nullable=False)
+    process_name = db.Column(db.String(120), nullable=False)
+    industry = db.Column(db.String(80), nullable=False, default="")
+    created_at = db.Column(db.DateTime, nullable=False)
+    total_rpa = db.Column(db.Float, nullable=True)
+    total_ipa = db.Column(db.Float, nullable=True)
+    rpa_excluded = db.Column(db.Boolean, default=False, nullable=False)
+    ipa_excluded = db.Column(db.Boolean, default=False, nullable=False)
+    rpa_excluded_by = db.Column(db.String(255), nullable=True)  # Fragen-Codes, kommagetrennt
+    ipa_excluded_by = db.Column(db.String(255), nullable=True)
+    recommendation = db.Column(db.String(20), nullable=False, default="")
+    combined_score = db.Column(db.Float, nullable=False, default=0)
+    # Zeitpunkt der letzten Aktualisierung (refresh) -> günstiger ETag für /api/v1/assessments
+    refreshed_at = db.Column(db.DateTime, nullable=True, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index("ix_summary_combined_score", "combined_score", "assessment_id"),
+        db.Index("ix_summary_refreshed_at", "refreshed_at"),
+        db.Index("ix_summary_created_at", "created_at", "assessment_id"),
+        db.Index("ix_summary_process_name", "process_name", "assessment_id"),
+        db.Index("ix_summary_industry", "industry", "assessment_id"),
+        db.Index("ix_summary_recommendation", "recommendation", "assessment_id"),
+    )
+
+
 class EconomicMetric(db.Model):
     __tablename__ = "economic_metric"
     id = db.Column(db.Integer, primary_key=True)
@@ -237,6 +351,10 @@ class EconomicMetric(db.Model):
     value = db.Column(db.Float, nullable=False)
     unit = db.Column(db.String(20), nullable=True)
 
+    __table_args__ = (
+        db.Index("ix_economic_metric_assessment", "assessment_id"),
+    )
+
     # Relationships
     assessment_obj = db.relationship('Assessment', backref='economic_metrics')
 
@@ -251,6 +369,10 @@ class Hint(db.Model):
     hint_text = db.Column(db.Text, nullable=False)
     hint_type = db.Column(db.String(20), default="info")  # info, warning, error
     
+    __table_args__ = (
+        db.Index("ix_hint_question", "question_id", "scale_option_id"),
+    )
+
     # Relationships
     question_obj = db.relationship('Question', backref='hints')
     scale_option = db.relationship('ScaleOption', backref='hints')
@@ -0,0 +1,129 @@
+"""
+Produktiver Betrieb: Multi-Worker-WSGI-Server (gunicorn) mit Preload
+
+- Die App wird EINMAL im Master geladen und aufgewärmt (Migrationen, kompilierte
+  Fragebögen aller Versionen, Jinja-Templates, Seitengerüst der Startseite); die
+  Worker entstehen per fork und teilen diese Objekte copy-on-write
+- gc.freeze() nach dem Aufwärmen: der Garbage Collector der Worker fasst die geerbten
+  Objekte nicht mehr an (sonst werden die Seiten beim ersten GC-Lauf kopiert)
+- Keine SQLite-Verbindung über fork hinweg: der Pool wird vor dem fork geleert und
+  jeder Worker öffnet nach dem Start seine eigene Verbindung
+- Worker-Recycling über max_requests (+ Jitter, damit nicht alle gleichzeitig neu starten)
+
+gunicorn ist optional (nur Linux/macOS); ohne gunicorn bleibt python main.py (Entwicklung).
+"""
+import gc
+import logging
+import os
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:  # optional: flask serve nur mit gunicorn
+    BaseApplication = None
+
+import metrics
+from extensions import db
+from models.database import QuestionnaireVersion
+from services.compiled_questionnaire import get_compiled_questionnaire, get_active_questionnaire
+
+DEFAULT_BIND = "127.0.0.1:8000"
+DEFAULT_MAX_REQUESTS = 1000
+DEFAULT_MAX_REQUESTS_JITTER = 100
+DEFAULT_TIMEOUT = 60
+
+logger = logging.getLogger(__name__)
+
+
+def default_workers():
+    return (os.cpu_count() or 1) * 2 + 1
+
+
+def warm_up(app, init_database=None):
+    """
+    Baut alle prozessweiten Caches auf, bevor die Worker geforkt werden.
+
+    Args:
+        init_database: optionale Funktion für Schema-Migrationen (main.init_database)
+
+    Returns:
+        dict mit Anzahl kompilierter Fragebögen und Templates
+    """
+    if init_database is not None:
+        init_database()
+
+    with app.app_context():
+        version_ids = [v for (v,) in db.session.query(QuestionnaireVersion.id).order_by(QuestionnaireVersion.id)]
+        for version_id in version_ids:
+            get_compiled_questionnaire(version_id)
+        get_active_questionnaire()
+
+        # Jinja kompiliert Templates beim ersten get_template und cached sie in der Umgebung
+        templates = [name for name in app.jinja_env.list_templates() if name.endswith(".html")]
+        for name in templates:
+            app.jinja_env.get_template(name)
+
+    # Startseite einmal ausliefern -> vorgerendertes Gerüst im Cache (script_root "")
+    app.test_client().get("/")
+
+    # Keine offenen SQLite-Verbindungen in den Worker vererben
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+    gc.collect()
+    gc.freeze()
+    return {"questionnaires": len(version_ids), "templates": len(templates)}
+
+
+def run(app, bind=DEFAULT_BIND, workers=None, threads=1, max_requests=DEFAULT_MAX_REQUESTS,
+        max_requests_jitter=DEFAULT_MAX_REQUESTS_JITTER, timeout=DEFAULT_TIMEOUT, init_database=None):
+    """
+    Startet gunicorn mit vorgeladener, aufgewärmter App (blockiert bis zum Beenden).
+
+    threads > 1 nutzt den gthread-Worker (Threads pro Prozess), sonst sync.
+    """
+    if BaseApplication is None:
+        raise RuntimeError("flask serve benötigt gunicorn (pip install gunicorn)")
+
+    options = {
+        "bind": bind,
+        "workers": workers or default_workers(),
+        "threads": threads,
+        "worker_class": "gthread" if threads > 1 else "sync",
+        "preload_app": True,
+        "max_requests": max_requests,
+        "max_requests_jitter": max_requests_jitter if max_requests else 0,
+        "timeout": timeout,
+        "post_fork": _post_fork,
+        "post_worker_init": _post_worker_init,
+    }
+
+    class Application(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # preload_app: läuft genau einmal im Master
+            warmed = warm_up(app, init_database)
+            logger.info("Caches aufgewärmt", extra=warmed)
+            return app
+
+    Application().run()
+
+
+def _post_fork(server, worker):
+    # Sicherheitsnetz: geerbte Pool-Einträge verwerfen, ohne die Verbindungen des Masters zu schließen
+    app = worker.app.wsgi()
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    # Messwerte des Masters (Aufwärm-Request in warm_up) nicht in jeden Worker übernehmen
+    metrics.reset()
+
+
+def _post_worker_init(worker):
+    # Eigene Verbindung (inkl. PRAGMAs des Speicherprofils) vor dem ersten Request öffnen
+    app = worker.app.wsgi()
+    with app.app_context():
+        db.session.execute(db.select(QuestionnaireVersion.id).limit(1))
+        db.session.remove()
@@ -0,0 +1,442 @@
+"""
+Service für das Speichern von Fragebogen-Antworten (/evaluate und /assessment/<id>/update)
+
+Pipeline (ohne Commit - der Aufrufer committet genau einmal):
+1. Formular EINMAL in einen kompakten Antwort-Vektor parsen
+2. Filterlogik im Speicher über den vorkompilierten DAG anwenden
+3. Antworten mit einem executemany-Insert schreiben
+4. Gemeinsame Antworten (Dimension 1 & 2) optional übernehmen
+5. Scoring in derselben Transaktion
+"""
+from typing import NamedTuple, Optional
+
+from sqlalchemy import delete, insert
+
+from extensions import db
+from models.database import Answer, SharedDimensionAnswer
+from services.scoring_service import ScoringService
+
+
+class AnswerRow(NamedTuple):
+    """Eine Antwort-Zeile (bei multiple_choice eine Zeile pro gewählter Option)"""
+    question_id: int
+    scale_option_id: Optional[int]
+    numeric_value: Optional[float]
+
+
+class AnswerIngestionService:
+    """Service zum Speichern und Auswerten von Antworten"""
+
+    @staticmethod
+    def parse_form(compiled, form):
+        """
+        Liest alle Antworten aus dem Formular (q_<id> bzw. q_<id>[]).
+
+        Returns:
+            (rows, answered_count, unanswered_count)
+            Unbeantwortete Fragen erhalten eine Zeile mit NULL-Werten.
+        """
+        rows = []
+        answered_count = 0
+        unanswered_count = 0
+
+        for question in compiled.questions:
+            field_single = f"q_{question.id}"
+            field_multi = f"q_{question.id}[]"
+
+            if question.question_type == "single_choice":
+                value = form.get(field_single)
+                rows.append(AnswerRow(question.id, int(value) if value else None, None))
+
+                if value:
+                    answered_count += 1
+                else:
+                    unanswered_count += 1
+
+            elif question.question_type == "multiple_choice":
+                values = form.getlist(field_multi)
+
+                if values:
+                    for v in values:
+                        rows.append(AnswerRow(question.id, int(v), None))
+                    answered_count += 1
+                else:
+                    rows.append(AnswerRow(question.id, None, None))
+                    unanswered_count += 1
+
+            elif question.question_type == "number":
+                value = form.get(field_single)
+                num = None
+
+                if value and value.strip():
+                    try:
+                        num = float(value)
+                    except ValueError:
+                        num = None
+
+                rows.append(AnswerRow(question.id, None, num))
+                if num is not None:
+                    answered_count += 1
+                else:
+                    unanswered_count += 1
+
+        return rows, answered_count, unanswered_count
+
+    @staticmethod
+    def option_lookup(compiled):
+        """{question_id: {Options-Code bzw. -Label (klein geschrieben): option_id}} für parse_record"""
+        lookup = {}
+        for question in compiled.questions:
+            keys = {}
+            for option in question.options:
+                keys.setdefault(option.label.strip().lower(), option.id)
+            for option in question.options:
+                keys[option.code.strip().lower()] = option.id  # Code hat Vorrang vor Label
+            lookup[question.id] = keys
+        return lookup
+
+    @staticmethod
+    def parse_record(compiled, values, option_lookup=None):
+        """
+        Liest einen Datensatz (z.B. eine Zeile eines Massen-Imports) in einen Antwort-Vektor
+        wie parse_form.
+
+        Args:
+            values: {Fragen-Code: Wert} - number -> Zahl (auch "1,5"), single_choice -> Options-Code
+                    oder -Label, multiple_choice -> Liste bzw. "A | B"; leer -> unbeantwortet
+            option_lookup: vorberechnetes option_lookup(compiled) (bei vielen Datensätzen)
+
+        Returns:
+            (rows, Liste von Fehlermeldungen)
+        """
+        lookup = option_lookup or AnswerIngestionService.option_lookup(compiled)
+        rows = []
+        errors = []
+
+        for question in compiled.questions:
+            value = values.get(question.code)
+            if isinstance(value, str):
+                value = value.strip()
+            if value is None or value == "" or value == []:
+                rows.append(AnswerRow(question.id, None, None))
+                continue
+
+            if question.question_type == "number":
+                try:
+                    if isinstance(value, bool):
+                        raise ValueError
+                    if isinstance(value, str) and "," in value and "." not in value:
+                        value = value.replace(",", ".")
+                    num = float(value)
+                    if num != num or num in (float("inf"), float("-inf")):
+                        raise ValueError
+                except (TypeError, ValueError):
+                    errors.append(f"Frage {question.code}: Zahl erwartet, erhalten {value!r}")
+                    continue
+                rows.append(AnswerRow(question.id, None, num))
+                continue
+
+            if isinstance(value, list):
+                items = value
+            elif question.question_type == "multiple_choice" and isinstance(value, str):
+                items = [v for v in (part.strip() for part in value.split("|")) if v]
+            else:
+                items = [value]
+            if question.question_type == "single_choice" and len(items) != 1:
+                errors.append(f"Frage {question.code}: genau eine Option erwartet")
+                continue
+
+            option_ids = []
+            for item in items:
+                option_id = lookup[question.id].get(str(item).strip().lower())
+                if option_id is None:
+                    errors.append(f"Frage {question.code}: unbekannte Option {item!r}")
+                    break
+                if option_id not in option_ids:
+                    option_ids.append(option_id)
+            else:
+                rows.extend(AnswerRow(question.id, option_id, None) for option_id in option_ids)
+
+        return rows, errors
+
+    @staticmethod
+    def apply_filter(compiled, rows):
+        """
+        Phase 3: Filterlogik im Speicher (ein Durchlauf über den DAG).
+
+        Returns:
+            Liste von (AnswerRow, is_applicable) - nicht anwendbare Antworten ohne Werte
+        """
+        selected_options = {}
+        for row in rows:
+            options = selected_options.setdefault(row.question_id, set())
+            if row.scale_option_id is not None:
+                options.add(row.scale_option_id)
+
+        applicable = compiled.evaluate_applicability(selected_options)
+
+        filtered = []
+        for row in rows:
+            if applicable.get(row.question_id, True):
+                filtered.append((row, True))
+            else:
+                # Wenn Frage nicht anwendbar, lösche die Antwort-Werte
+                filtered.append((AnswerRow(row.question_id, None, None), False))
+        return filtered
+
+    @staticmethod
+    def shared_answers_from_rows(compiled, rows):
+        """
+        Sammelt die (ungefilterten) Antworten der gemeinsamen Dimensionen.
+
+        Returns:
+            {dimension_id: {question_id: {'numeric': ..., 'single': ..., 'multi': [...]}}}
+        """
+        rows_by_question = {}
+        for row in rows:
+            rows_by_question.setdefault(row.question_id, []).append(row)
+
+        shared = {}
+        for dim_id in compiled.shared_dimension_ids:
+            dim_answers = {}
+
+            for q in compiled.dimension_by_id[dim_id].questions:
+                q_rows = rows_by_question.get(q.id, [])
+
+                if q.question_type == "number":
+                    if q_rows and q_rows[0].numeric_value is not None:
+                        dim_answers[q.id] = {'numeric': q_rows[0].numeric_value, 'single': None, 'multi': []}
+                elif q.question_type == "single_choice":
+                    if q_rows and q_rows[0].scale_option_id is not None:
+                        dim_answers[q.id] = {'numeric': None, 'single': q_rows[0].scale_option_id, 'multi': []}
+                elif q.question_type == "multiple_choice":
+                    values = [r.scale_option_id for r in q_rows if r.scale_option_id is not None]
+                    if values:
+                        dim_answers[q.id] = {'numeric': None, 'single': None, 'multi': values}
+
+            if dim_answers:
+                shared[dim_id] = dim_answers
+        return shared
+
+    @staticmethod
+    def save_shared_dimension_answers(dimension_id, answers_data):
+        """
+        Speichert Antworten einer Dimension als gemeinsame Antworten.
+        answers_data ist ein dict: {question_id: {'numeric': ..., 'single': ..., 'multi': [...]}}
+        """
+        # Lösche alte gemeinsame Antworten für diese Dimension
+        SharedDimensionAnswer.query.filter_by(dimension_id=dimension_id).delete()
+
+        values = []
+        for question_id, answer_info in answers_data.items():
+            numeric_val = answer_info.get('numeric')
+            single_val = answer_info.get('single')
+            multi_vals = answer_info.get('multi', [])
+
+            if numeric_val is not None:
+                # Numerische Antwort
+                values.append({'question_id': question_id, 'numeric_value': numeric_val, 'scale_option_id': None})
+            elif single_val is not None:
+                # Single-Choice Antwort
+                values.append({'question_id': question_id, 'numeric_value': None, 'scale_option_id': single_val})
+            elif multi_vals:
+                # Multiple-Choice: Speichere als einzelne Option (vereinfacht)
+                for opt_id in multi_vals:
+                    values.append({'question_id': question_id, 'numeric_value': None, 'scale_option_id': opt_id})
+
+        if values:
+            db.session.execute(
+                insert(SharedDimensionAnswer.__table__),
+                [dict(v, dimension_id=dimension_id) for v in values]
+            )
+
+    @staticmethod
+    def ingest(assessment, compiled, rows, use_shared_dimensions=False, replace=False):
+        """
+        Speichert die Antworten eines Assessments und berechnet die Ergebnisse
+        in der laufenden Transaktion (ohne Commit).
+
+        Args:
+            assessment: Assessment (muss bereits eine id haben)
+            compiled: CompiledQuestionnaire der Assessment-Version
+            rows: Antwort-Vektor aus parse_form()
+            use_shared_dimensions: Antworten für Dimension 1 & 2 gemeinsam speichern
+            replace: vorhandene Antworten vorher löschen (Update)
+
+        Returns:
+            TotalResult-Objekt
+        """
+        if replace:
+            Answer.query.filter_by(assessment_id=assessment.id).delete()
+
+        # Phase 3: Filterlogik -> finale is_applicable-Werte direkt im ersten Insert
+        filtered = AnswerIngestionService.apply_filter(compiled, rows)
+
+        if filtered:
+            # Core-Insert auf die Tabelle: genau EIN executemany (der ORM-Bulk-Insert
+            # würde die Zeilen nach ihren NULL-Spalten in mehrere Statements aufteilen)
+            db.session.execute(insert(Answer.__table__), [
+                {
+                    'assessment_id': assessment.id,
+                    'question_id': row.question_id,
+                    'scale_option_id': row.scale_option_id,
+                    'numeric_value': row.numeric_value,
+                    'is_applicable': is_applicable,
+                }
+                for row, is_applicable in filtered
+            ])
+
+        # Gemeinsame Antworten für Dimensionen 1 & 2 (ungefiltert, wie eingegeben)
+        if use_shared_dimensions:
+            shared = AnswerIngestionService.shared_answers_from_rows(compiled, rows)
+            for dim_id, dim_answers in shared.items():
+                AnswerIngestionService.save_shared_dimension_answers(dim_id, dim_answers)
+
+        # Phase 4: Scoring auf dem bereits gefilterten Antwort-Vektor (keine erneute Query)
+        return ScoringService.store_results(
+            assessment.id, compiled, [row for row, _ in filtered]
+        )
+
+    # ========================================
+    # Autosave (PATCH einzelner Antworten)
+    # ========================================
+
+    @staticmethod
+    def parse_patch(compiled, answers):
+        """
+        Validiert geänderte Antworten aus einem JSON-Body.
+
+        Args:
+            answers: {question_id oder Fragen-Code: Wert}
+                     number -> Zahl, single_choice -> option_id, multiple_choice -> [option_id, ...],
+                     None / "" / [] -> unbeantwortet
+
+        Returns:
+            ({question_id: [AnswerRow, ...]}, Liste von Fehlermeldungen)
+        """
+        changes = {}
+        errors = []
+
+        for key, value in answers.items():
+            question = compiled.question_by_code.get(str(key))
+            if question is None and str(key).isdigit():
+                question = compiled.question_by_id.get(int(key))
+            if question is None:
+                errors.append(f"Unbekannte Frage: {key}")
+                continue
+
+            if value is None or value == "" or value == []:
+                changes[question.id] = [AnswerRow(question.id, None, None)]
+                continue
+
+            if question.question_type == "number":
+                try:
+                    if isinstance(value, bool):
+                        raise ValueError
+                    changes[question.id] = [AnswerRow(question.id, None, float(value))]
+                except (TypeError, ValueError):
+                    errors.append(f"Frage {question.code}: Zahl erwartet")
+                continue
+
+            values = value if question.question_type == "multiple_choice" and isinstance(value, list) else [value]
+            if question.question_type == "single_choice" and len(values) != 1:
+                errors.append(f"Frage {question.code}: genau eine Option erwartet")
+                continue
+
+            valid_option_ids = {o.id for o in question.options}
+            option_ids = []
+            for v in values:
+                try:
+                    option_id = int(v)
+                except (TypeError, ValueError):
+                    option_id = None
+                if option_id not in valid_option_ids or isinstance(v, bool):
+                    errors.append(f"Frage {question.code}: ungültige Option {v!r}")
+                    break
+                if option_id not in option_ids:
+                    option_ids.append(option_id)
+            else:
+                changes[question.id] = [AnswerRow(question.id, option_id, None) for option_id in option_ids]
+
+        return changes, errors
+
+    @staticmethod
+    def patch(assessment, compiled, changes):
+        """
+        Übernimmt geänderte Antworten eines Assessments (ohne Commit).
+
+        - Filterlogik wird nur für die geänderten Fragen und ihre Nachfahren im
+          Bedingungs-DAG neu bewertet
+        - Nur Fragen, deren Zeilen sich tatsächlich ändern, werden ersetzt
+        - Nur die betroffenen Dimensionen werden neu geschrieben
+
+        Args:
+            changes: Ergebnis von parse_patch()
+
+        Returns:
+            (Liste geänderter question_ids, Menge neu bewerteter dimension_ids, AssessmentScore oder None)
+        """
+        # Aktueller Stand: eine Query
+        current = {}
+        applicable_before = {}
+        for question_id, scale_option_id, numeric_value, is_applicable in db.session.query(
+            Answer.question_id, Answer.scale_option_id, Answer.numeric_value, Answer.is_applicable
+        ).filter(Answer.assessment_id == assessment.id).order_by(Answer.id):
+            current.setdefault(question_id, []).append(AnswerRow(question_id, scale_option_id, numeric_value))
+            applicable_before.setdefault(question_id, bool(is_applicable))
+
+        affected = set(changes) | compiled.descendants(changes)
+
+        proposed = dict(current)
+        proposed.update(changes)
+        selected_options = {
+            question_id: {row.scale_option_id for row in rows if row.scale_option_id is not None}
+            for question_id, rows in proposed.items()
+        }
+        applicable = compiled.evaluate_applicability(
+            selected_options, only=affected, applicable_before=applicable_before
+        )
+
+        # Neue Zeilen nur für Fragen, deren Inhalt oder Anwendbarkeit sich ändert
+        new_rows = []
+        changed_ids = []
+        for question in compiled.filter_order:
+            if question.id not in affected:
+                continue
+            rows = proposed.get(question.id) or [AnswerRow(question.id, None, None)]
+            is_applicable = applicable[question.id]
+            if not is_applicable:
+                # Wenn Frage nicht anwendbar, lösche die Antwort-Werte
+                rows = [AnswerRow(question.id, None, None)]
+            proposed[question.id] = rows
+            if rows == current.get(question.id) and is_applicable == applicable_before.get(question.id, True):
+                continue
+            changed_ids.append(question.id)
+            new_rows.extend((row, is_applicable) for row in rows)
+
+        if not changed_ids:
+            return [], set(), None
+
+        db.session.execute(delete(Answer.__table__).where(
+            Answer.assessment_id == assessment.id,
+            Answer.question_id.in_(changed_ids)
+        ))
+        db.session.execute(insert(Answer.__table__), [
+            {
+                'assessment_id': assessment.id,
+                'question_id': row.question_id,
+                'scale_option_id': row.scale_option_id,
+                'numeric_value': row.numeric_value,
+                'is_applicable': is_applicable,
+            }
+            for row, is_applicable in new_rows
+        ])
+
+        # Phase 4: nur die betroffenen Dimensionen neu schreiben
+        dimension_ids = {compiled.question_by_id[qid].dimension_id for qid in changed_ids}
+        answer_rows = [row for question_id in sorted(proposed) for row in proposed[question_id]]
+        scored = ScoringService.rescore_dimensions(
+            assessment.id, dimension_ids, changed_question_ids=changed_ids,
+            compiled=compiled, answer_rows=answer_rows
+        )
+        return changed_ids, {ds.dimension_id for ds in scored.dimension_scores}, scored
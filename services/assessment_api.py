@@ -0,0 +1,159 @@
+"""
+Service für die JSON-API /api/v1/assessments (nur lesend)
+
+- Liste aus der denormalisierten Vergleichstabelle (Keyset-Pagination über die
+  vorhandenen Indizes, siehe AssessmentSummaryService.page)
+- ?fields= lädt nur die angeforderten Spalten
+- ?embed=dimensions,economic_metrics ergänzt je EINE Query für alle Zeilen der Seite
+- Liste: ETag aus Anzahl + letzter Aktualisierung der Vergleichstabelle und den Parametern
+  -> unveränderte Daten werden mit 304 beantwortet, ohne die Seite zu laden
+- Einzelressource: ETag aus dem Inhalt (ein Lookup per Primärschlüssel)
+"""
+import hashlib
+
+from extensions import db
+from models.database import (
+    Assessment, Process, Dimension, DimensionResult, EconomicMetric, AssessmentSummary
+)
+
+API_VERSION = "v1"
+
+# Felder einer Assessment-Ressource (id ist immer enthalten)
+FIELDS = (
+    "process_id", "process_name", "industry", "created_at",
+    "total_rpa", "total_ipa", "rpa_excluded", "ipa_excluded",
+    "rpa_excluded_by", "ipa_excluded_by", "recommendation", "combined_score",
+)
+EMBEDS = ("dimensions", "economic_metrics")
+
+
+class AssessmentApiService:
+    """Feldauswahl, Einbettungen und ETag für /api/v1/assessments"""
+
+    @staticmethod
+    def parse_fields(value):
+        """"total_rpa,recommendation" -> Tupel (leer/None = alle Felder)"""
+        if not value:
+            return FIELDS
+        fields = tuple(dict.fromkeys(f.strip() for f in value.split(",") if f.strip() and f.strip() != "id"))
+        unknown = [f for f in fields if f not in FIELDS]
+        if unknown:
+            raise ValueError(f"Unbekannte Felder: {', '.join(unknown)} (erlaubt: id, {', '.join(FIELDS)})")
+        return fields
+
+    @staticmethod
+    def parse_embed(value):
+        if not value:
+            return ()
+        embeds = tuple(dict.fromkeys(e.strip() for e in value.split(",") if e.strip()))
+        unknown = [e for e in embeds if e not in EMBEDS]
+        if unknown:
+            raise ValueError(f"Unbekannte Einbettung: {', '.join(unknown)} (erlaubt: {', '.join(EMBEDS)})")
+        return embeds
+
+    @staticmethod
+    def etag(state, *parts):
+        """ETag aus AssessmentSummaryService.state() und den Request-Parametern"""
+        count, refreshed_at = state
+        raw = f"{API_VERSION}:{count}:{refreshed_at}:{parts!r}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    # ========================================
+    # Serialisierung
+    # ========================================
+
+    @staticmethod
+    def serialize(rows, fields, embeds):
+        """Zeilen aus der Vergleichstabelle (ORM oder Tupel) -> Liste von dicts"""
+        items = []
+        for row in rows:
+            item = {"id": row.assessment_id}
+            for field in fields:
+                value = getattr(row, field)
+                if field in ("rpa_excluded_by", "ipa_excluded_by"):
+                    value = value.split(", ") if value else []
+                elif field == "created_at" and value is not None:
+                    value = value.isoformat()
+                item[field] = value
+            items.append(item)
+
+        AssessmentApiService._embed(items, embeds)
+        return items
+
+    @staticmethod
+    def get(assessment_id, fields, embeds):
+        """
+        Einzelnes Assessment; nicht bewertete Assessments (ohne Vergleichszeile) werden
+        aus Assessment/Process ohne Ergebnisse geliefert.
+
+        Returns:
+            dict oder None
+        """
+        row = db.session.query(
+            AssessmentSummary.assessment_id, *(getattr(AssessmentSummary, f) for f in fields)
+        ).filter(AssessmentSummary.assessment_id == assessment_id).first()
+        if row is not None:
+            return AssessmentApiService.serialize([row], fields, embeds)[0]
+
+        found = db.session.query(
+            Assessment.id, Assessment.created_at, Process.id, Process.name, Process.industry
+        ).join(Process, Process.id == Assessment.process_id).filter(Assessment.id == assessment_id).first()
+        if found is None:
+            return None
+        _, created_at, process_id, process_name, industry = found
+        base = {
+            "process_id": process_id,
+            "process_name": process_name,
+            "industry": industry or "",
+            "created_at": created_at.isoformat() if created_at else None,
+            "rpa_excluded": False,
+            "ipa_excluded": False,
+            "rpa_excluded_by": [],
+            "ipa_excluded_by": [],
+            "recommendation": "",
+        }
+        item = {"id": assessment_id, **{field: base.get(field) for field in fields}}
+        AssessmentApiService._embed([item], embeds)
+        return item
+
+    @staticmethod
+    def _embed(items, embeds):
+        ids = [item["id"] for item in items]
+        if not ids:
+            return
+        if "dimensions" in embeds:
+            dimensions = AssessmentApiService.load_dimensions(ids)
+            for item in items:
+                item["dimensions"] = dimensions.get(item["id"], {})
+        if "economic_metrics" in embeds:
+            metrics = AssessmentApiService.load_economic_metrics(ids)
+            for item in items:
+                item["economic_metrics"] = metrics.get(item["id"], {})
+
+    @staticmethod
+    def load_dimensions(assessment_ids):
+        """{assessment_id: {dimension_code: {'rpa': score, 'ipa': score, 'rpa_excluded': bool, ...}}}"""
+        result = {}
+        for assessment_id, code, automation_type, mean_score, is_excluded in db.session.query(
+            DimensionResult.assessment_id, Dimension.code, DimensionResult.automation_type,
+            DimensionResult.mean_score, DimensionResult.is_excluded
+        ).join(
+            Dimension, Dimension.id == DimensionResult.dimension_id
+        ).filter(
+            DimensionResult.assessment_id.in_(assessment_ids)
+        ).order_by(DimensionResult.assessment_id, Dimension.sort_order):
+            entry = result.setdefault(assessment_id, {}).setdefault(code, {})
+            key = automation_type.lower()
+            entry[key] = mean_score
+            entry[f"{key}_excluded"] = bool(is_excluded)
+        return result
+
+    @staticmethod
+    def load_economic_metrics(assessment_ids):
+        """{assessment_id: {key: {'value': ..., 'unit': ...}}}"""
+        result = {}
+        for assessment_id, key, value, unit in db.session.query(
+            EconomicMetric.assessment_id, EconomicMetric.key, EconomicMetric.value, EconomicMetric.unit
+        ).filter(EconomicMetric.assessment_id.in_(assessment_ids)).order_by(EconomicMetric.id):
+            result.setdefault(assessment_id, {})[key] = {"value": value, "unit": unit}
+        return result
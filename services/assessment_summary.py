@@ -0,0 +1,254 @@
+"""
+Service für die Vergleichsübersicht (/comparison)
+
+- assessment_summary enthält pro bewertetem Assessment eine fertige Zeile
+  (Prozess, Branche, Datum, Scores, Ausschlüsse, Empfehlung, kombinierter Score)
+- Die Tabelle wird im Scoring-Pfad gepflegt (refresh), nie beim Anzeigen
+- /comparison liest Keyset-paginierte, serverseitig sortierte und gefilterte Ausschnitte
+  -> Kosten pro Seite unabhängig von der Gesamtzahl der Assessments
+"""
+import base64
+import json
+from datetime import datetime
+from typing import NamedTuple, Optional, Tuple
+
+from sqlalchemy import insert, and_, or_, func
+
+from extensions import db
+from models.database import (
+    Process, Assessment, QuestionResult, TotalResult, AssessmentSummary
+)
+from services.compiled_questionnaire import get_compiled_questionnaire
+
+
+class SummaryPage(NamedTuple):
+    rows: Tuple[AssessmentSummary, ...]
+    next_cursor: Optional[str]
+
+
+class AssessmentSummaryService:
+    """Pflege und Abfrage der denormalisierten Vergleichstabelle"""
+
+    # Erlaubte Sortierspalten (alle NOT NULL und indiziert)
+    SORT_COLUMNS = {
+        'combined_score': AssessmentSummary.combined_score,
+        'created_at': AssessmentSummary.created_at,
+        'process_name': AssessmentSummary.process_name,
+        'industry': AssessmentSummary.industry,
+        'recommendation': AssessmentSummary.recommendation,
+    }
+    DEFAULT_SORT = 'combined_score'
+    DEFAULT_PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 200
+
+    # ========================================
+    # Pflege (Scoring-Pfad)
+    # ========================================
+
+    @staticmethod
+    def combined_score(total_rpa, total_ipa):
+        """Höherer der beiden Gesamtscores (0, wenn keiner vorhanden)"""
+        if total_rpa and total_ipa:
+            return max(total_rpa, total_ipa)
+        elif total_rpa:
+            return total_rpa
+        elif total_ipa:
+            return total_ipa
+        return 0
+
+    @staticmethod
+    def refresh(assessment_ids):
+        """
+        Baut die Zeilen der angegebenen Assessments aus den gespeicherten Ergebnissen neu
+        (ohne Commit, konstante Anzahl Queries für beliebig viele Assessments).
+        """
+        assessment_ids = list(assessment_ids)
+        if not assessment_ids:
+            return
+
+        results = db.session.query(
+            TotalResult, Assessment.questionnaire_version_id, Assessment.created_at,
+            Process.id, Process.name, Process.industry
+        ).join(
+            Assessment, TotalResult.assessment_id == Assessment.id
+        ).join(
+            Process, Assessment.process_id == Process.id
+        ).filter(
+            TotalResult.assessment_id.in_(assessment_ids)
+        ).all()
+
+        # Ausschlussgründe aus den gespeicherten Einzelbewertungen
+        exclusions = {}
+        for assessment_id, automation_type, question_id in db.session.query(
+            QuestionResult.assessment_id, QuestionResult.automation_type, QuestionResult.question_id
+        ).filter(
+            QuestionResult.assessment_id.in_(assessment_ids),
+            QuestionResult.is_exclusion.is_(True)
+        ).order_by(QuestionResult.question_id):
+            exclusions.setdefault((assessment_id, automation_type), []).append(question_id)
+
+        rows = []
+        for total_result, version_id, created_at, process_id, process_name, industry in results:
+            compiled = get_compiled_questionnaire(version_id)
+
+            def excluded_by(automation_type):
+                question_ids = exclusions.get((total_result.assessment_id, automation_type))
+                if not question_ids:
+                    return None
+                return ", ".join(compiled.question_by_id[qid].code for qid in question_ids)
+
+            rows.append({
+                'assessment_id': total_result.assessment_id,
+                'process_id': process_id,
+                'process_name': process_name,
+                'industry': industry or '',
+                'created_at': created_at,
+                'total_rpa': total_result.total_rpa,
+                'total_ipa': total_result.total_ipa,
+                'rpa_excluded': bool(total_result.rpa_excluded),
+                'ipa_excluded': bool(total_result.ipa_excluded),
+                'rpa_excluded_by': excluded_by('RPA'),
+                'ipa_excluded_by': excluded_by('IPA'),
+                'recommendation': total_result.recommendation or '',
+                'combined_score': AssessmentSummaryService.combined_score(
+                    total_result.total_rpa, total_result.total_ipa
+                ),
+            })
+
+        AssessmentSummaryService.delete(assessment_ids)
+        if rows:
+            db.session.execute(insert(AssessmentSummary.__table__), rows)
+
+    @staticmethod
+    def delete(assessment_ids):
+        """Entfernt die Zeilen der angegebenen Assessments (ohne Commit)"""
+        AssessmentSummary.query.filter(
+            AssessmentSummary.assessment_id.in_(list(assessment_ids))
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def backfill(limit=None):
+        """
+        Ergänzt fehlende Zeilen für bereits bewertete Assessments (ohne Commit).
+
+        Returns:
+            Anzahl ergänzter Zeilen (bei limit: höchstens limit, für chunkweises Nachziehen)
+        """
+        missing = db.session.query(TotalResult.assessment_id).join(
+            Assessment, TotalResult.assessment_id == Assessment.id
+        ).join(
+            Process, Assessment.process_id == Process.id
+        ).filter(
+            ~TotalResult.assessment_id.in_(db.session.query(AssessmentSummary.assessment_id))
+        ).order_by(TotalResult.assessment_id)
+        if limit:
+            missing = missing.limit(limit)
+
+        assessment_ids = [assessment_id for (assessment_id,) in missing]
+        AssessmentSummaryService.refresh(assessment_ids)
+        return len(assessment_ids)
+
+    # ========================================
+    # Abfrage (/comparison)
+    # ========================================
+
+    @staticmethod
+    def industries():
+        """Alle vorkommenden Branchen (für den Filter, nutzt den Index auf industry)"""
+        return [industry for (industry,) in db.session.query(AssessmentSummary.industry).filter(
+            AssessmentSummary.industry != ''
+        ).distinct().order_by(AssessmentSummary.industry)]
+
+    @staticmethod
+    def state():
+        """
+        (Anzahl Zeilen, letzte Aktualisierung) - ändert sich bei jedem Scoring und Löschen
+        (eine Query über die Indizes, ohne die Zeilen zu lesen)
+        """
+        return db.session.query(
+            func.count(AssessmentSummary.assessment_id), func.max(AssessmentSummary.refreshed_at)
+        ).one()
+
+    @staticmethod
+    def page(sort=None, direction='desc', industry=None, recommendation=None, search=None,
+             cursor=None, limit=None, columns=None):
+        """
+        Liefert einen Keyset-paginierten Ausschnitt.
+
+        Args:
+            sort: Spalte aus SORT_COLUMNS
+            direction: 'asc' oder 'desc'
+            industry / recommendation: exakte Filter
+            search: Teilstring im Prozessnamen
+            cursor: next_cursor der vorherigen Seite
+            limit: Zeilen pro Seite (max. MAX_PAGE_SIZE)
+            columns: nur diese Spaltennamen laden (Zeilen-Tupel statt ORM-Objekten)
+
+        Returns:
+            SummaryPage
+        """
+        if sort not in AssessmentSummaryService.SORT_COLUMNS:
+            sort = AssessmentSummaryService.DEFAULT_SORT
+        descending = direction != 'asc'
+        limit = min(max(int(limit or AssessmentSummaryService.DEFAULT_PAGE_SIZE), 1),
+                    AssessmentSummaryService.MAX_PAGE_SIZE)
+
+        column = AssessmentSummaryService.SORT_COLUMNS[sort]
+        tie_breaker = AssessmentSummary.assessment_id
+
+        if columns is not None:
+            # Sortierspalte und assessment_id werden für den Cursor immer mitgeladen
+            names = dict.fromkeys(['assessment_id', sort, *columns])
+            query = db.session.query(*(getattr(AssessmentSummary, name) for name in names))
+        else:
+            query = AssessmentSummary.query
+        if industry:
+            query = query.filter(AssessmentSummary.industry == industry)
+        if recommendation:
+            query = query.filter(AssessmentSummary.recommendation == recommendation)
+        if search:
+            query = query.filter(AssessmentSummary.process_name.contains(search, autoescape=True))
+
+        position = AssessmentSummaryService._decode_cursor(cursor, sort)
+        if position is not None:
+            value, last_id = position
+            if descending:
+                query = query.filter(or_(column < value, and_(column == value, tie_breaker < last_id)))
+            else:
+                query = query.filter(or_(column > value, and_(column == value, tie_breaker > last_id)))
+
+        if descending:
+            query = query.order_by(column.desc(), tie_breaker.desc())
+        else:
+            query = query.order_by(column.asc(), tie_breaker.asc())
+
+        rows = query.limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = AssessmentSummaryService._encode_cursor(getattr(last, sort), last.assessment_id)
+
+        return SummaryPage(tuple(rows), next_cursor)
+
+    @staticmethod
+    def _encode_cursor(value, assessment_id):
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        raw = json.dumps([value, assessment_id]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @staticmethod
+    def _decode_cursor(cursor, sort):
+        """Ungültige Cursor werden ignoriert (Start auf der ersten Seite)"""
+        if not cursor:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            value, assessment_id = json.loads(raw)
+            if sort == 'created_at':
+                value = datetime.fromisoformat(value)
+            return value, int(assessment_id)
+        except (ValueError, TypeError):
+            return None
@@ -0,0 +1,295 @@
+"""
+Service für den Massen-Export aller Assessments (CSV, NDJSON, optional Parquet)
+
+- Assessments werden mit yield_per in Partitionen gelesen (Server-Cursor, keine
+  vollständige Ergebnisliste im Speicher)
+- Pro Partition je EINE Query für Dimensionsergebnisse, Antworten und Kennzahlen
+- Ausgabe als Generator (Zeile für Zeile) -> Speicherbedarf konstant, unabhängig von
+  der Anzahl der Assessments
+- Fragen/Optionen kommen aus dem kompilierten Fragebogen (keine Query)
+
+CSV ist "breit" (eine Zeile pro Assessment, Spalten je Dimension/Frage/Kennzahl),
+NDJSON enthält pro Zeile ein verschachteltes JSON-Objekt.
+"""
+import csv
+import json
+from io import StringIO
+from typing import NamedTuple
+
+from sqlalchemy import select
+
+from extensions import db
+from models.database import (
+    Assessment, Process, Answer, DimensionResult, TotalResult, EconomicMetric
+)
+from services.compiled_questionnaire import get_compiled_questionnaire
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: Parquet nur mit pyarrow
+    pa = None
+    pq = None
+
+
+class ExportColumn(NamedTuple):
+    name: str
+    kind: str  # int | float | bool | str
+
+
+class BulkExportService:
+    """Streamt alle (gefilterten) Assessments mit Ergebnissen, Antworten und Kennzahlen"""
+
+    FORMATS = ("csv", "ndjson", "parquet")
+    MIMETYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+    CHUNK_SIZE = 500
+
+    BASE_COLUMNS = (
+        ExportColumn("assessment_id", "int"),
+        ExportColumn("questionnaire_version_id", "int"),
+        ExportColumn("created_at", "str"),
+        ExportColumn("process_name", "str"),
+        ExportColumn("industry", "str"),
+        ExportColumn("description", "str"),
+        ExportColumn("total_rpa", "float"),
+        ExportColumn("total_ipa", "float"),
+        ExportColumn("rpa_excluded", "bool"),
+        ExportColumn("ipa_excluded", "bool"),
+        ExportColumn("recommendation", "str"),
+    )
+    ECONOMIC_KEYS = (
+        "roi", "personeller_nutzen", "fte_einsparung", "initiale_fixkosten",
+        "variable_kosten_jahr", "haeufigkeit_jahr", "zeitersparnis_h_jahr",
+    )
+
+    # ========================================
+    # Lesen
+    # ========================================
+
+    @staticmethod
+    def _base_query(since=None, questionnaire_version_id=None):
+        query = db.session.query(
+            Assessment.id, Assessment.questionnaire_version_id, Assessment.created_at,
+            Process.name, Process.industry, Process.description,
+            TotalResult.total_rpa, TotalResult.total_ipa, TotalResult.rpa_excluded,
+            TotalResult.ipa_excluded, TotalResult.recommendation
+        ).join(
+            Process, Process.id == Assessment.process_id
+        ).outerjoin(
+            TotalResult, TotalResult.assessment_id == Assessment.id
+        )
+        if since is not None:
+            query = query.filter(Assessment.created_at >= since)
+        if questionnaire_version_id is not None:
+            query = query.filter(Assessment.questionnaire_version_id == questionnaire_version_id)
+        return query
+
+    @staticmethod
+    def iter_records(since=None, questionnaire_version_id=None, chunk_size=None):
+        """
+        Ein Dict pro Assessment (Reihenfolge: assessment_id).
+
+        Antworten: {question_code: {'value': Zahl | Label | [Labels], 'is_applicable': bool}}
+        """
+        chunk_size = chunk_size or BulkExportService.CHUNK_SIZE
+        result = db.session.execute(
+            BulkExportService._base_query(since, questionnaire_version_id)
+            .order_by(Assessment.id).statement.execution_options(yield_per=chunk_size)
+        )
+        for partition in result.partitions():
+            ids = [row[0] for row in partition]
+            dims, answers, metrics = BulkExportService._load_children(ids)
+            for row in partition:
+                compiled = get_compiled_questionnaire(row[1])
+                yield BulkExportService._record(
+                    row, compiled, dims.get(row[0], ()), answers.get(row[0], ()), metrics.get(row[0], ())
+                )
+
+    @staticmethod
+    def _load_children(ids):
+        """Dimensionsergebnisse, Antworten und Kennzahlen einer Partition (je eine Query)"""
+        dims, answers, metrics = {}, {}, {}
+        # Core-Selects (Tupel statt ORM-Zeilen): ~70 Antwortzeilen pro Assessment
+        for row in db.session.execute(select(
+            DimensionResult.assessment_id, DimensionResult.dimension_id, DimensionResult.automation_type,
+            DimensionResult.mean_score, DimensionResult.is_excluded
+        ).where(DimensionResult.assessment_id.in_(ids))):
+            dims.setdefault(row[0], []).append(row)
+        for row in db.session.execute(select(
+            Answer.assessment_id, Answer.question_id, Answer.scale_option_id,
+            Answer.numeric_value, Answer.is_applicable
+        ).where(Answer.assessment_id.in_(ids)).order_by(
+            Answer.assessment_id, Answer.question_id, Answer.scale_option_id, Answer.id
+        )):
+            answers.setdefault(row[0], []).append(row)
+        for row in db.session.execute(select(
+            EconomicMetric.assessment_id, EconomicMetric.key, EconomicMetric.value
+        ).where(EconomicMetric.assessment_id.in_(ids))):
+            metrics.setdefault(row[0], []).append(row)
+        return dims, answers, metrics
+
+    @staticmethod
+    def _record(row, compiled, dim_rows, answer_rows, metric_rows):
+        (assessment_id, version_id, created_at, name, industry, description,
+         total_rpa, total_ipa, rpa_excluded, ipa_excluded, recommendation) = row
+
+        dimensions = {}
+        for _, dimension_id, automation_type, mean_score, is_excluded in dim_rows:
+            dimension = compiled.dimension_by_id.get(dimension_id)
+            if dimension is None:
+                continue
+            dimensions.setdefault(dimension.code, {})[automation_type] = {
+                'mean_score': mean_score,
+                'is_excluded': bool(is_excluded),
+            }
+
+        answers = {}
+        for _, question_id, scale_option_id, numeric_value, is_applicable in answer_rows:
+            question = compiled.question_by_id.get(question_id)
+            if question is None:
+                continue
+            entry = answers.setdefault(question.code, {'value': None, 'is_applicable': bool(is_applicable)})
+            if numeric_value is not None:
+                entry['value'] = numeric_value
+            elif scale_option_id is not None:
+                option = compiled.option_by_id.get(scale_option_id)
+                label = option.label if option else None
+                if question.question_type == "multiple_choice":
+                    entry['value'] = (entry['value'] or []) + [label]
+                else:
+                    entry['value'] = label
+
+        return {
+            'assessment_id': assessment_id,
+            'questionnaire_version_id': version_id,
+            'created_at': created_at.isoformat() if created_at else None,
+            'process': {'name': name, 'industry': industry, 'description': description},
+            'total': None if total_rpa is None and total_ipa is None and recommendation is None else {
+                'total_rpa': total_rpa,
+                'total_ipa': total_ipa,
+                'rpa_excluded': bool(rpa_excluded),
+                'ipa_excluded': bool(ipa_excluded),
+                'recommendation': recommendation,
+            },
+            'dimensions': dimensions,
+            'answers': answers,
+            'economic_metrics': {key: value for _, key, value in metric_rows},
+        }
+
+    # ========================================
+    # Flache Spalten (CSV / Parquet)
+    # ========================================
+
+    @staticmethod
+    def columns(since=None, questionnaire_version_id=None):
+        """Spalten aus allen betroffenen Fragebogen-Versionen (Reihenfolge wie im Fragebogen)"""
+        version_ids = [
+            v for (v,) in BulkExportService._base_query(since, questionnaire_version_id)
+            .with_entities(Assessment.questionnaire_version_id).distinct()
+            .order_by(Assessment.questionnaire_version_id)
+        ]
+        dimension_codes, question_codes = {}, {}
+        for version_id in version_ids:
+            compiled = get_compiled_questionnaire(version_id)
+            for dimension in compiled.dimensions:
+                dimension_codes.setdefault(dimension.code, None)
+                for question in dimension.questions:
+                    question_codes.setdefault(question.code, question.question_type)
+
+        columns = list(BulkExportService.BASE_COLUMNS)
+        for code in dimension_codes:
+            columns += [ExportColumn(f"dim_{code}_rpa", "float"), ExportColumn(f"dim_{code}_ipa", "float")]
+        for code, question_type in question_codes.items():
+            columns.append(ExportColumn(f"q_{code}", "float" if question_type == "number" else "str"))
+        columns += [ExportColumn(f"eco_{key}", "float") for key in BulkExportService.ECONOMIC_KEYS]
+        return columns
+
+    @staticmethod
+    def flatten(record):
+        """Record -> dict Spaltenname -> Wert (nicht anwendbare Antworten bleiben leer)"""
+        total = record['total'] or {}
+        flat = {
+            'assessment_id': record['assessment_id'],
+            'questionnaire_version_id': record['questionnaire_version_id'],
+            'created_at': record['created_at'],
+            'process_name': record['process']['name'],
+            'industry': record['process']['industry'],
+            'description': record['process']['description'],
+            'total_rpa': total.get('total_rpa'),
+            'total_ipa': total.get('total_ipa'),
+            'rpa_excluded': total.get('rpa_excluded'),
+            'ipa_excluded': total.get('ipa_excluded'),
+            'recommendation': total.get('recommendation'),
+        }
+        for code, by_type in record['dimensions'].items():
+            for automation_type, result in by_type.items():
+                flat[f"dim_{code}_{automation_type.lower()}"] = result['mean_score']
+        for code, answer in record['answers'].items():
+            if answer['is_applicable']:
+                value = answer['value']
+                flat[f"q_{code}"] = " | ".join(value) if isinstance(value, list) else value
+        for key, value in record['economic_metrics'].items():
+            flat[f"eco_{key}"] = value
+        return flat
+
+    # ========================================
+    # Ausgabe
+    # ========================================
+
+    @staticmethod
+    def stream(fmt, since=None, questionnaire_version_id=None, chunk_size=None):
+        """Generator mit Text-Stücken im gewünschten Format (csv | ndjson)"""
+        if fmt not in BulkExportService.MIMETYPES:
+            raise ValueError(f"Format nicht streambar: {fmt}")
+        records = BulkExportService.iter_records(since, questionnaire_version_id, chunk_size)
+        if fmt == "ndjson":
+            return (json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        columns = BulkExportService.columns(since, questionnaire_version_id)
+        return BulkExportService._csv_lines(columns, records)
+
+    @staticmethod
+    def _csv_lines(columns, records):
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        names = [c.name for c in columns]
+
+        def take():
+            data = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return data
+
+        writer.writerow(names)
+        yield take()
+        for record in records:
+            flat = BulkExportService.flatten(record)
+            writer.writerow(["" if flat.get(name) is None else flat[name] for name in names])
+            yield take()
+
+    @staticmethod
+    def write_parquet(path, since=None, questionnaire_version_id=None, chunk_size=None):
+        """
+        Schreibt eine Parquet-Datei (eine Row-Group pro Partition).
+
+        Returns:
+            Anzahl exportierter Assessments
+        """
+        if pa is None:
+            raise RuntimeError("Parquet-Export benötigt pyarrow (pip install pyarrow)")
+        chunk_size = chunk_size or BulkExportService.CHUNK_SIZE
+        columns = BulkExportService.columns(since, questionnaire_version_id)
+        types = {"int": pa.int64(), "float": pa.float64(), "bool": pa.bool_(), "str": pa.string()}
+        schema = pa.schema([(c.name, types[c.kind]) for c in columns])
+
+        count, batch = 0, []
+        with pq.ParquetWriter(path, schema) as writer:
+            for record in BulkExportService.iter_records(since, questionnaire_version_id, chunk_size):
+                batch.append(BulkExportService.flatten(record))
+                if len(batch) >= chunk_size:
+                    writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                    count += len(batch)
+                    batch = []
+            if batch:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+        return count
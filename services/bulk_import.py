@@ -0,0 +1,329 @@
+"""
+Service für den Massen-Import von Prozessen/Assessments aus CSV oder JSON
+
+- Eine Zeile (CSV) bzw. ein Objekt (JSON) = ein Prozess mit Antworten, Spalten/Schlüssel
+  sind Fragen-Codes ("2.1", "7.5"; auch "q_2.1" wie im Massen-Export)
+- Validierung gegen den kompilierten Fragebogen (AnswerIngestionService.parse_record),
+  fehlerhafte Zeilen werden übersprungen und mit Zeilennummer gemeldet
+- Pro Batch: Process/Assessment/Answer per executemany, Filterlogik im Speicher,
+  Scoring über ScoringService.score_batch (optional Prozess-Pool), ein Commit
+- Fortsetzbar: ImportJob (Hash der Quelldatei) merkt sich die verarbeiteten Zeilen in
+  derselben Transaktion -> erneuter Aufruf mit derselben Datei setzt nach dem letzten
+  vollständigen Batch fort bzw. ist nach Abschluss ein No-op
+
+Gemeinsame Antworten (SharedDimensionAnswer) werden beim Import nicht verändert.
+"""
+import csv
+import hashlib
+import io
+import json
+import time
+from datetime import datetime
+from typing import NamedTuple, Optional, Tuple
+
+from sqlalchemy import insert
+
+from extensions import db
+from models.database import Process, Assessment, Answer, ImportJob
+from services.answer_ingestion import AnswerIngestionService
+from services.compiled_questionnaire import get_compiled_questionnaire, get_active_questionnaire
+from services.scoring_service import ScoringService
+
+
+class ImportRowError(NamedTuple):
+    row: int  # Datenzeile (1-basiert, ohne Kopfzeile)
+    message: str
+
+
+class ImportReport(NamedTuple):
+    job_id: Optional[int]
+    processed: int  # in diesem Lauf verarbeitete Zeilen
+    imported: int
+    failed: int
+    resumed_from: int  # bereits in früheren Läufen verarbeitete Zeilen
+    already_complete: bool
+    elapsed: float
+    errors: Tuple[ImportRowError, ...]
+    ignored_columns: Tuple[str, ...]
+
+    @property
+    def per_second(self):
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class BulkImportService:
+    """Validierter, batchweiser und fortsetzbarer Import"""
+
+    FORMATS = ("csv", "json")
+    BATCH_SIZE = 500
+    # Fehlerliste im Bericht begrenzen (gezählt wird weiter)
+    MAX_REPORTED_ERRORS = 1000
+
+    # Prozess-Spalten (Kleinschreibung) -> Process-Feld
+    META_COLUMNS = {
+        'name': 'name', 'process_name': 'name', 'prozess': 'name',
+        'industry': 'industry', 'branche': 'industry',
+        'description': 'description', 'beschreibung': 'description',
+    }
+
+    # ========================================
+    # Quellen
+    # ========================================
+
+    @staticmethod
+    def detect_format(filename, fmt=None):
+        fmt = fmt or (filename or "").rsplit(".", 1)[-1].lower()
+        if fmt not in BulkImportService.FORMATS:
+            raise ValueError(f"Format nicht unterstützt: {fmt} (erwartet: csv oder json)")
+        return fmt
+
+    @staticmethod
+    def file_hash(path):
+        """SHA-256 der Quelldatei (blockweise gelesen)"""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def iter_records(stream, fmt):
+        """Datensätze als dicts (CSV: Trennzeichen , ; oder Tab wird aus der Kopfzeile erkannt)"""
+        if fmt == "json":
+            data = json.load(stream)
+            if isinstance(data, dict):
+                data = data.get("processes", [])
+            if not isinstance(data, list):
+                raise ValueError("JSON: erwartet Liste von Prozessen oder {\"processes\": [...]}")
+            for item in data:
+                if isinstance(item, dict) and isinstance(item.get("answers"), dict):
+                    item = {**{k: v for k, v in item.items() if k != "answers"}, **item["answers"]}
+                yield item if isinstance(item, dict) else {}
+            return
+
+        # Trennzeichen aus der Kopfzeile (Excel exportiert je nach Sprache , oder ;)
+        header = stream.readline()
+        stream.seek(0)
+        delimiter = max(",;\t", key=header.count)
+        yield from csv.DictReader(stream, delimiter=delimiter)
+
+    # ========================================
+    # Import
+    # ========================================
+
+    @staticmethod
+    def import_file(path, fmt=None, **options):
+        """Importiert eine Datei (siehe run)"""
+        fmt = BulkImportService.detect_format(path, fmt)
+        with open(path, encoding="utf-8-sig", newline="") as stream:
+            return BulkImportService.run(
+                BulkImportService.iter_records(stream, fmt),
+                source_hash=BulkImportService.file_hash(path),
+                filename=path,
+                **options
+            )
+
+    @staticmethod
+    def import_bytes(data, filename=None, fmt=None, **options):
+        """Importiert einen hochgeladenen Inhalt (siehe run)"""
+        fmt = BulkImportService.detect_format(filename, fmt)
+        stream = io.StringIO(data.decode("utf-8-sig"), newline="")
+        return BulkImportService.run(
+            BulkImportService.iter_records(stream, fmt),
+            source_hash=hashlib.sha256(data).hexdigest(),
+            filename=filename,
+            **options
+        )
+
+    @staticmethod
+    def run(records, source_hash, filename=None, questionnaire_version_id=None,
+            batch_size=None, workers=None, validate_only=False, progress=None):
+        """
+        Importiert Datensätze batchweise (ein Commit pro Batch).
+
+        Args:
+            records: Iterable von dicts (Fragen-Code bzw. Prozess-Spalte -> Wert)
+            source_hash: Identität der Quelle für die Fortsetzung
+            questionnaire_version_id: Fragebogen-Version (Standard: aktive Version)
+            workers: Prozesse für das Scoring (None/1 = im aktuellen Prozess)
+            validate_only: nur prüfen, nichts schreiben
+            progress: optionaler Callback(processed) nach jedem Batch
+
+        Returns:
+            ImportReport
+        """
+        started = time.perf_counter()
+        batch_size = batch_size or BulkImportService.BATCH_SIZE
+
+        if questionnaire_version_id is not None:
+            compiled = get_compiled_questionnaire(questionnaire_version_id)
+        else:
+            compiled = get_active_questionnaire()
+        if compiled is None:
+            raise ValueError("Keine Fragebogen-Version gefunden")
+
+        job = None
+        resumed_from = 0
+        if not validate_only:
+            job = ImportJob.query.filter_by(source_hash=source_hash).first()
+            if job is not None and job.finished_at is not None:
+                return ImportReport(job.id, 0, 0, 0, job.next_row, True,
+                                    time.perf_counter() - started, (), ())
+            if job is None:
+                job = ImportJob(source_hash=source_hash, filename=filename,
+                                questionnaire_version_id=compiled.id)
+                db.session.add(job)
+                db.session.commit()
+            elif job.questionnaire_version_id != compiled.id:
+                # Fortsetzung immer mit der Version des ursprünglichen Laufs
+                compiled = get_compiled_questionnaire(job.questionnaire_version_id)
+            resumed_from = job.next_row
+
+        context = _ImportContext(compiled)
+        pool = None if validate_only else ScoringService.open_pool(workers)
+        processed = imported = failed = 0
+        errors = []
+        try:
+            batch = []
+            for row_number, record in enumerate(records, start=1):
+                if row_number <= resumed_from:
+                    continue
+                batch.append((row_number, record))
+                if len(batch) >= batch_size:
+                    counts = BulkImportService._process_batch(context, batch, job, pool, workers, errors)
+                    processed, imported, failed = processed + len(batch), imported + counts[0], failed + counts[1]
+                    batch = []
+                    if progress:
+                        progress(resumed_from + processed)
+            if batch:
+                counts = BulkImportService._process_batch(context, batch, job, pool, workers, errors)
+                processed, imported, failed = processed + len(batch), imported + counts[0], failed + counts[1]
+                if progress:
+                    progress(resumed_from + processed)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        if job is not None:
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+
+        return ImportReport(
+            job_id=job.id if job is not None else None,
+            processed=processed,
+            imported=imported,
+            failed=failed,
+            resumed_from=resumed_from,
+            already_complete=False,
+            elapsed=time.perf_counter() - started,
+            errors=tuple(errors),
+            ignored_columns=tuple(sorted(context.ignored_columns)),
+        )
+
+    @staticmethod
+    def _process_batch(context, batch, job, pool, workers, errors):
+        """
+        Validiert und schreibt einen Batch (ohne job: nur Validierung).
+
+        Returns:
+            (importiert, fehlerhaft)
+        """
+        valid = []
+        failed = 0
+        for row_number, record in batch:
+            meta, rows, row_errors = context.parse(record)
+            if row_errors:
+                failed += 1
+                for message in row_errors:
+                    if len(errors) < BulkImportService.MAX_REPORTED_ERRORS:
+                        errors.append(ImportRowError(row_number, message))
+                continue
+            valid.append((meta, rows))
+
+        if job is None:
+            return len(valid), failed
+
+        if valid:
+            compiled = context.compiled
+            process_ids = db.session.execute(
+                insert(Process.__table__).returning(Process.id, sort_by_parameter_order=True),
+                [meta for meta, _ in valid]
+            ).scalars().all()
+            assessment_ids = db.session.execute(
+                insert(Assessment.__table__).returning(Assessment.id, sort_by_parameter_order=True),
+                [{'process_id': pid, 'questionnaire_version_id': compiled.id} for pid in process_ids]
+            ).scalars().all()
+
+            answer_rows = []
+            scoring_batch = []
+            for assessment_id, (_, rows) in zip(assessment_ids, valid):
+                # Filterlogik im Speicher -> finale is_applicable-Werte direkt im Insert
+                filtered = AnswerIngestionService.apply_filter(compiled, rows)
+                answer_rows.extend(
+                    {
+                        'assessment_id': assessment_id,
+                        'question_id': row.question_id,
+                        'scale_option_id': row.scale_option_id,
+                        'numeric_value': row.numeric_value,
+                        'is_applicable': is_applicable,
+                    }
+                    for row, is_applicable in filtered
+                )
+                scoring_batch.append((compiled.id, assessment_id, [tuple(row) for row, _ in filtered]))
+            db.session.execute(insert(Answer.__table__), answer_rows)
+
+            scored = ScoringService.score_batch(scoring_batch, pool, workers)
+            ScoringService.write_results_bulk(scored)
+
+        job.next_row = batch[-1][0]
+        job.imported += len(valid)
+        job.failed += failed
+        db.session.commit()
+        return len(valid), failed
+
+
+class _ImportContext:
+    """Spaltenzuordnung und Options-Lookup, einmal pro Import berechnet"""
+
+    def __init__(self, compiled):
+        self.compiled = compiled
+        self.option_lookup = AnswerIngestionService.option_lookup(compiled)
+        self.ignored_columns = set()
+        self._columns = {}  # Spaltenname -> ('meta', Feld) | ('question', Code) | None
+
+    def _resolve(self, column):
+        key = str(column).strip()
+        meta = BulkImportService.META_COLUMNS.get(key.lower())
+        if meta:
+            return ('meta', meta)
+        code = key[2:] if key.lower().startswith("q_") else key
+        if code in self.compiled.question_by_code:
+            return ('question', code)
+        self.ignored_columns.add(key)
+        return None
+
+    def parse(self, record):
+        """Datensatz -> (Process-Felder, Antwort-Vektor, Fehler)"""
+        meta = {'name': None, 'industry': '', 'description': ''}
+        values = {}
+        for column, value in record.items():
+            if column is None:  # überzählige CSV-Felder
+                continue
+            target = self._columns.get(column, False)
+            if target is False:
+                target = self._columns[column] = self._resolve(column)
+            if target is None:
+                continue
+            kind, name = target
+            if kind == 'meta':
+                meta[name] = str(value).strip() if value is not None else ''
+            else:
+                values[name] = value
+
+        errors = []
+        if not meta['name']:
+            errors.append("Prozessname fehlt (Spalte name)")
+        elif len(meta['name']) > 120:
+            errors.append("Prozessname länger als 120 Zeichen")
+        rows, answer_errors = AnswerIngestionService.parse_record(self.compiled, values, self.option_lookup)
+        return meta, rows, errors + answer_errors
@@ -0,0 +1,432 @@
+"""
+Kompilierter Fragebogen (In-Memory-Abbild der Masterdaten)
+
+Die Masterdaten (QuestionnaireVersion, Dimension, Question, ScaleOption,
+OptionScore, Hint, QuestionCondition) ändern sich nur, wenn seed_data.py läuft.
+Statt sie bei jedem Request erneut aus SQLite zu laden, wird pro
+questionnaire_version_id einmalig ein unveränderliches Objekt gebaut und im
+Prozess gecacht.
+
+WICHTIG:
+- Nach jeder Änderung der Masterdaten muss invalidate_compiled_questionnaires()
+  aufgerufen werden (seed_data() macht das nach dem Commit selbst).
+- Unter gunicorn (server.py, preload_app) kompiliert server.warm_up() alle Versionen
+  einmal im Master vor dem Fork; die Worker übernehmen das Abbild copy-on-write und
+  bauen es nicht erneut. Ohne Vorladen (Dev-Server) füllt der erste Request den Cache.
+- Die Invalidierung wirkt nur im aufrufenden Prozess: nach einem Seed außerhalb der
+  Worker (CLI) müssen die Worker neu gestartet werden, damit sie neu kompilieren.
+"""
+import threading
+from collections import deque
+from types import MappingProxyType
+from typing import NamedTuple, Optional, Tuple
+
+from extensions import db
+from models.database import (
+    QuestionnaireVersion, Dimension, Question, ScaleOption,
+    OptionScore, Hint, QuestionCondition
+)
+
+# Dimensionen, deren Antworten gemeinsam gespeichert werden können (Plattform & Organisation)
+SHARED_DIMENSION_CODES = ("1", "2")
+
+AUTOMATION_TYPES = ("RPA", "IPA")
+
+_EMPTY_MAPPING = MappingProxyType({})
+
+
+# ========================================
+# Datensätze (tuple-basiert, unveränderlich)
+# ========================================
+
+class CompiledOption(NamedTuple):
+    id: int
+    scale_id: int
+    code: str
+    label: str
+    sort_order: int
+    is_na: bool
+
+
+class CompiledOptionScore(NamedTuple):
+    score: Optional[float]
+    is_exclusion: Optional[bool]
+    is_applicable: Optional[bool]
+
+
+class CompiledHint(NamedTuple):
+    text: str
+    type: str
+
+
+class CompiledQuestion(NamedTuple):
+    id: int
+    dimension_id: int
+    code: str
+    text: str
+    question_type: str
+    unit: Optional[str]
+    scale_id: Optional[int]
+    sort_order: int
+    depends_logic: str
+    # Legacy-Felder (Question.depends_on_*)
+    depends_on_question_id: Optional[int]
+    depends_on_option_id: Optional[int]
+    # Effektive Bedingungen: QuestionCondition (nach sort_order), sonst Legacy-Fallback
+    conditions: Tuple[Tuple[int, int], ...]
+    # Optionen der Skala, sortiert nach sort_order (pro Skala geteilt)
+    options: Tuple[CompiledOption, ...]
+
+
+class CompiledDimension(NamedTuple):
+    id: int
+    code: str
+    name: str
+    sort_order: int
+    calc_method: str
+    is_shared: bool
+    # Anzeige-Reihenfolge (sort_order)
+    questions: Tuple[CompiledQuestion, ...]
+    # Speicher-Reihenfolge (id) - bestimmt excluded_by_question_id beim Scoring
+    questions_in_id_order: Tuple[CompiledQuestion, ...]
+
+
+# ========================================
+# Kompilierter Fragebogen
+# ========================================
+
+class CompiledQuestionnaire:
+    """Unveränderliches Abbild einer Fragebogen-Version inkl. Score-Tabellen und Bedingungsgraph"""
+
+    __slots__ = (
+        "id", "name", "version", "is_active",
+        "dimensions", "questions",
+        "dimension_by_id", "dimension_by_code",
+        "question_by_id", "question_by_code",
+        "option_by_id", "options_by_scale",
+        "scores", "hints",
+        "shared_dimension_ids",
+        "filter_order", "dependents",
+    )
+
+    def __init__(self, qv, dimensions, questions, options_by_scale, scores, hints):
+        self.id = qv.id
+        self.name = qv.name
+        self.version = qv.version
+        self.is_active = bool(qv.is_active)
+
+        self.dimensions = dimensions
+        self.questions = questions
+        self.dimension_by_id = MappingProxyType({d.id: d for d in dimensions})
+        self.dimension_by_code = MappingProxyType({d.code: d for d in dimensions})
+        self.question_by_id = MappingProxyType({q.id: q for q in questions})
+        self.question_by_code = MappingProxyType({q.code: q for q in questions})
+
+        self.options_by_scale = options_by_scale
+        self.option_by_id = MappingProxyType({
+            o.id: o for opts in options_by_scale.values() for o in opts
+        })
+        self.scores = scores
+        self.hints = hints
+
+        self.shared_dimension_ids = tuple(d.id for d in dimensions if d.is_shared)
+
+        # Bedingungsgraph als DAG (Eltern vor Kindern), Zyklen werden hier erkannt
+        order, dependents = _build_filter_dag(questions, self.id)
+        self.filter_order = tuple(self.question_by_id[qid] for qid in order)
+        self.dependents = MappingProxyType({qid: tuple(children) for qid, children in dependents.items()})
+
+    def __setattr__(self, key, value):
+        if hasattr(self, key):
+            raise AttributeError(f"CompiledQuestionnaire ist unveränderlich ({key})")
+        object.__setattr__(self, key, value)
+
+    def get_score(self, question_id, option_id, automation_type) -> Optional[CompiledOptionScore]:
+        """Ersetzt OptionScore.query.filter_by(question_id, scale_option_id, automation_type).first()"""
+        return self.scores.get((question_id, option_id, automation_type))
+
+    def get_hints(self, question_id):
+        """hints[option_id] -> (CompiledHint, ...) für eine Frage"""
+        return self.hints.get(question_id, _EMPTY_MAPPING)
+
+    def descendants(self, question_ids):
+        """
+        Alle Fragen, deren Anwendbarkeit (transitiv) von den angegebenen Fragen abhängt.
+
+        Returns:
+            set von question_ids (ohne die Ausgangsfragen, sofern sie nicht selbst erreichbar sind)
+        """
+        found = set()
+        stack = list(question_ids)
+        while stack:
+            for child_id in self.dependents.get(stack.pop(), ()):
+                if child_id not in found:
+                    found.add(child_id)
+                    stack.append(child_id)
+        return found
+
+    def evaluate_applicability(self, selected_options, only=None, applicable_before=None):
+        """
+        Filterlogik in einem Durchlauf über den topologisch sortierten DAG.
+
+        Args:
+            selected_options: dict question_id -> Menge gewählter option_ids
+            only: optional Menge von question_ids, die neu bewertet werden (z.B. geänderte
+                  Fragen + descendants()); alle anderen behalten ihren Wert aus applicable_before
+            applicable_before: dict question_id -> bisheriges is_applicable (nur mit only)
+
+        Returns:
+            dict question_id -> is_applicable
+
+        Eine Bedingung gilt nur als erfüllt, wenn die Eltern-Frage selbst
+        anwendbar ist (Kaskade: ausgeblendete Fragen blenden ihre Kinder aus).
+        """
+        applicable = {}
+        effective = {}
+
+        for q in self.filter_order:
+            if only is not None and q.id not in only:
+                # Nicht betroffen -> unverändert übernehmen
+                is_applicable = (applicable_before or {}).get(q.id, True)
+            elif q.conditions:
+                results = [
+                    required_opt_id in effective.get(parent_q_id, ())
+                    for parent_q_id, required_opt_id in q.conditions
+                ]
+                is_applicable = any(results) if q.depends_logic.lower() == "any" else all(results)
+            else:
+                # Keine Bedingungen = immer anwendbar
+                is_applicable = True
+
+            applicable[q.id] = is_applicable
+            if is_applicable:
+                effective[q.id] = selected_options.get(q.id, ())
+
+        return applicable
+
+
+def _build_filter_dag(questions, questionnaire_version_id):
+    """
+    Topologische Sortierung des Bedingungsgraphen (Kahn).
+    Reihenfolge innerhalb einer Ebene = Reihenfolge der Fragen.
+
+    Raises:
+        ValueError bei zyklischen Bedingungen
+    """
+    known = {q.id for q in questions}
+    indegree = {q.id: 0 for q in questions}
+    dependents = {q.id: [] for q in questions}
+
+    for q in questions:
+        for parent_q_id in dict.fromkeys(p for p, _ in q.conditions):
+            # Bedingungen auf unbekannte Fragen sind nie erfüllt -> keine Kante
+            if parent_q_id in known:
+                dependents[parent_q_id].append(q.id)
+                indegree[q.id] += 1
+
+    ready = deque(q.id for q in questions if indegree[q.id] == 0)
+    order = []
+    while ready:
+        qid = ready.popleft()
+        order.append(qid)
+        for child_id in dependents[qid]:
+            indegree[child_id] -= 1
+            if indegree[child_id] == 0:
+                ready.append(child_id)
+
+    if len(order) != len(questions):
+        cyclic = [q.code for q in questions if indegree[q.id] > 0]
+        raise ValueError(
+            f"Zyklische Filterbedingungen in Fragebogen-Version {questionnaire_version_id}: {', '.join(cyclic)}"
+        )
+
+    return order, dependents
+
+
+def compile_questionnaire(questionnaire_version_id: int) -> Optional[CompiledQuestionnaire]:
+    """
+    Baut das Abbild einer Fragebogen-Version mit einer festen Anzahl Queries
+    (unabhängig von der Anzahl Fragen).
+    """
+    qv = db.session.get(QuestionnaireVersion, questionnaire_version_id)
+    if not qv:
+        return None
+
+    dimension_rows = (
+        Dimension.query
+        .filter_by(questionnaire_version_id=qv.id)
+        .order_by(Dimension.sort_order, Dimension.id)
+        .all()
+    )
+    question_rows = (
+        Question.query
+        .filter_by(questionnaire_version_id=qv.id)
+        .order_by(Question.sort_order, Question.id)
+        .all()
+    )
+
+    # Skalenoptionen (nur benötigte Skalen), pro Skala einmal -> von allen Fragen geteilt
+    scale_ids = {q.scale_id for q in question_rows if q.scale_id}
+    options_by_scale = {sid: [] for sid in scale_ids}
+    if scale_ids:
+        option_rows = (
+            ScaleOption.query
+            .filter(ScaleOption.scale_id.in_(scale_ids))
+            .order_by(ScaleOption.sort_order.asc(), ScaleOption.id.asc())
+            .all()
+        )
+        for o in option_rows:
+            options_by_scale[o.scale_id].append(CompiledOption(
+                id=o.id,
+                scale_id=o.scale_id,
+                code=o.code,
+                label=o.label,
+                sort_order=o.sort_order,
+                is_na=bool(o.is_na),
+            ))
+    options_by_scale = MappingProxyType({sid: tuple(opts) for sid, opts in options_by_scale.items()})
+
+    # Option-Scores als Lookup-Tabelle (question_id, option_id, automation_type) -> Score
+    score_rows = (
+        db.session.query(
+            OptionScore.question_id, OptionScore.scale_option_id, OptionScore.automation_type,
+            OptionScore.score, OptionScore.is_exclusion, OptionScore.is_applicable
+        )
+        .join(Question, OptionScore.question_id == Question.id)
+        .filter(Question.questionnaire_version_id == qv.id)
+        .order_by(OptionScore.id)
+        .all()
+    )
+    scores = {}
+    for qid, oid, auto, score, is_exclusion, is_applicable in score_rows:
+        # Wie .first(): bei Duplikaten gewinnt der erste Datensatz
+        scores.setdefault((qid, oid, auto), CompiledOptionScore(score, is_exclusion, is_applicable))
+    scores = MappingProxyType(scores)
+
+    # Hinweise: hints[qid][option_id] -> (CompiledHint, ...)
+    hint_rows = (
+        Hint.query
+        .join(Question, Hint.question_id == Question.id)
+        .filter(Question.questionnaire_version_id == qv.id)
+        .order_by(Hint.id)
+        .all()
+    )
+    hints = {}
+    for h in hint_rows:
+        per_question = hints.setdefault(h.question_id, {})
+        if h.scale_option_id is None:
+            continue
+        per_question.setdefault(h.scale_option_id, []).append(CompiledHint(h.hint_text, h.hint_type))
+    hints = MappingProxyType({
+        qid: MappingProxyType({oid: tuple(lst) for oid, lst in per_option.items()})
+        for qid, per_option in hints.items()
+    })
+
+    # Bedingungsgraph
+    condition_rows = (
+        QuestionCondition.query
+        .join(Question, QuestionCondition.question_id == Question.id)
+        .filter(Question.questionnaire_version_id == qv.id)
+        .order_by(QuestionCondition.sort_order.asc(), QuestionCondition.id.asc())
+        .all()
+    )
+    conditions_by_question = {}
+    for c in condition_rows:
+        conditions_by_question.setdefault(c.question_id, []).append(
+            (c.depends_on_question_id, c.depends_on_option_id)
+        )
+
+    questions = []
+    for q in question_rows:
+        conditions = tuple(conditions_by_question.get(q.id, ()))
+        # Legacy fallback (wenn keine QuestionCondition vorhanden)
+        if not conditions and q.depends_on_question_id and q.depends_on_option_id:
+            conditions = ((q.depends_on_question_id, q.depends_on_option_id),)
+
+        questions.append(CompiledQuestion(
+            id=q.id,
+            dimension_id=q.dimension_id,
+            code=q.code,
+            text=q.text,
+            question_type=q.question_type,
+            unit=q.unit,
+            scale_id=q.scale_id,
+            sort_order=q.sort_order,
+            depends_logic=q.depends_logic or "all",
+            depends_on_question_id=q.depends_on_question_id,
+            depends_on_option_id=q.depends_on_option_id,
+            conditions=conditions,
+            options=options_by_scale.get(q.scale_id, ()) if q.scale_id else (),
+        ))
+
+    questions_by_dimension = {}
+    for q in questions:
+        questions_by_dimension.setdefault(q.dimension_id, []).append(q)
+
+    dimensions = tuple(
+        CompiledDimension(
+            id=d.id,
+            code=d.code,
+            name=d.name,
+            sort_order=d.sort_order,
+            calc_method=d.calc_method,
+            is_shared=d.code in SHARED_DIMENSION_CODES,
+            questions=tuple(questions_by_dimension.get(d.id, ())),
+            questions_in_id_order=tuple(sorted(questions_by_dimension.get(d.id, ()), key=lambda q: q.id)),
+        )
+        for d in dimension_rows
+    )
+
+    return CompiledQuestionnaire(qv, dimensions, tuple(questions), options_by_scale, scores, hints)
+
+
+# ========================================
+# Prozess-Cache
+# ========================================
+
+_cache = {}
+_active_version_id = None
+_lock = threading.Lock()
+
+
+def get_compiled_questionnaire(questionnaire_version_id: int) -> Optional[CompiledQuestionnaire]:
+    """Liefert den kompilierten Fragebogen (wird beim ersten Zugriff gebaut)"""
+    compiled = _cache.get(questionnaire_version_id)
+    if compiled is not None:
+        return compiled
+
+    with _lock:
+        compiled = _cache.get(questionnaire_version_id)
+        if compiled is None:
+            compiled = compile_questionnaire(questionnaire_version_id)
+            if compiled is not None:
+                _cache[questionnaire_version_id] = compiled
+    return compiled
+
+
+def get_active_questionnaire() -> Optional[CompiledQuestionnaire]:
+    """Ersetzt QuestionnaireVersion.query.filter_by(is_active=True).first()"""
+    global _active_version_id
+
+    if _active_version_id is None:
+        qv = QuestionnaireVersion.query.filter_by(is_active=True).first()
+        if not qv:
+            return None
+        _active_version_id = qv.id
+
+    return get_compiled_questionnaire(_active_version_id)
+
+
+def invalidate_compiled_questionnaires(questionnaire_version_id: Optional[int] = None):
+    """
+    Verwirft gecachte Abbilder - muss nach jeder Änderung der Masterdaten aufgerufen werden.
+    Ohne Argument wird der gesamte Cache (inkl. aktiver Version) geleert.
+    """
+    global _active_version_id
+
+    with _lock:
+        if questionnaire_version_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(questionnaire_version_id, None)
+        _active_version_id = None
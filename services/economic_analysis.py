@@ -0,0 +1,209 @@
+"""
+Service für What-if-/Sensitivitätsanalysen der Wirtschaftlichkeit
+
+- Lädt die Eingaben (1.6, 7.1-7.7) eines Assessments mit EINER Query
+- Rechnet alle Varianten in einem Aufruf des vektorisierten Kerns (services/economic_model.py)
+- Liefert Tornado-Daten (jede Eingabe/Konstante ±delta) oder ein Gitter über frei
+  wählbare Parameter (z.B. Häufigkeit x Bearbeitungszeit x Lizenzkosten)
+"""
+import math
+
+from extensions import db
+from models.database import Assessment, Answer
+from services.compiled_questionnaire import get_compiled_questionnaire
+from services.economic_model import (
+    INPUTS, CONSTANTS, REQUIRED_CODES, complete_inputs, tornado, sweep
+)
+from services.scoring_service import ScoringService
+
+
+class EconomicAnalysisService:
+    """What-if-Analysen auf Basis der gespeicherten Antworten eines Assessments"""
+
+    DEFAULT_DELTA = 0.2
+    MAX_GRID_POINTS = 100_000
+
+    @staticmethod
+    def constants(overrides=None):
+        """
+        Konstanten des Scorings, optional überschrieben (für Szenarien)
+
+        Raises:
+            ValueError, wenn ein Wert nicht endlich und > 0 ist (Division im Kern)
+        """
+        values = {
+            "annual_work_hours_per_fte": ScoringService.ANNUAL_WORK_HOURS_PER_FTE,
+            "cost_per_fte_year": ScoringService.COST_PER_FTE_YEAR,
+        }
+        values.update(overrides or {})
+        for name, value in values.items():
+            if not math.isfinite(value) or value <= 0:
+                raise ValueError(f"{name} muss eine endliche Zahl > 0 sein")
+        return values
+
+    @staticmethod
+    def load_inputs(assessment_id):
+        """
+        Eingaben der Wirtschaftlichkeit eines Assessments.
+
+        Raises:
+            ValueError, wenn das Assessment fehlt oder Eingaben unvollständig sind
+        """
+        assessment = db.session.get(Assessment, assessment_id)
+        if not assessment:
+            raise ValueError(f"Assessment {assessment_id} nicht gefunden")
+        compiled = get_compiled_questionnaire(assessment.questionnaire_version_id)
+
+        codes_by_id = {
+            compiled.question_by_code[code].id: code
+            for code in REQUIRED_CODES if code in compiled.question_by_code
+        }
+        values = {}
+        for question_id, numeric_value in db.session.query(
+            Answer.question_id, Answer.numeric_value
+        ).filter(
+            Answer.assessment_id == assessment_id,
+            Answer.question_id.in_(codes_by_id),
+            Answer.numeric_value.isnot(None)
+        ).order_by(Answer.id):
+            values[codes_by_id[question_id]] = numeric_value
+
+        values, missing = complete_inputs(values)
+        if missing:
+            raise ValueError(f"Wirtschaftlichkeit: Werte fehlen: {missing}")
+        return values
+
+    @staticmethod
+    def tornado(assessment_id, delta=None, constant_overrides=None):
+        """
+        Returns:
+            (Basis-EconomicResult, Liste von TornadoBar)
+        """
+        delta = EconomicAnalysisService.DEFAULT_DELTA if delta is None else delta
+        if not math.isfinite(delta) or delta <= 0:
+            raise ValueError("delta muss eine endliche Zahl > 0 sein")
+        constants = EconomicAnalysisService.constants(constant_overrides)
+        values = EconomicAnalysisService.load_inputs(assessment_id)
+        return tornado(
+            values, constants["annual_work_hours_per_fte"], constants["cost_per_fte_year"], delta=delta
+        )
+
+    @staticmethod
+    def sweep(assessment_id, grid, constant_overrides=None, max_points=None):
+        """
+        Args:
+            grid: dict Parameter -> Werte (siehe parse_range)
+
+        Returns:
+            (dict Parameter -> Werte-Spalte, EconomicResult)
+        """
+        max_points = max_points or EconomicAnalysisService.MAX_GRID_POINTS
+        points = math.prod(len(v) for v in grid.values())
+        if points > max_points:
+            raise ValueError(f"Gitter zu groß: {points} Punkte (max. {max_points})")
+
+        constants = EconomicAnalysisService.constants(constant_overrides)
+        values = EconomicAnalysisService.load_inputs(assessment_id)
+        return sweep(values, constants["annual_work_hours_per_fte"], constants["cost_per_fte_year"], grid)
+
+    # ========================================
+    # Ein-/Ausgabe
+    # ========================================
+
+    @staticmethod
+    def parse_range(spec, max_points=None):
+        """
+        "7.5=0:1000:51" -> ("7.5", [0.0, 20.0, ..., 1000.0]) (Start, Ende, Anzahl Punkte)
+        "cost_per_fte_year=50000,60000" -> explizite Werte
+        Alle Werte müssen endlich sein, die Konstanten zusätzlich > 0.
+
+        Raises:
+            ValueError bei unbekanntem Parameter, ungültiger Angabe oder mehr als
+            max_points Werten (geprüft, bevor die Liste erzeugt wird)
+        """
+        name, _, build = EconomicAnalysisService._parse_spec(spec, max_points)
+        return name, build()
+
+    @staticmethod
+    def parse_grid(specs, max_points=None):
+        """
+        Mehrere parse_range-Angaben als Gitter (dict Parameter -> Werte).
+
+        Die Gesamtzahl der Punkte wird aus den angegebenen Anzahlen geprüft, bevor
+        irgendeine Werteliste erzeugt wird.
+        """
+        max_points = max_points or EconomicAnalysisService.MAX_GRID_POINTS
+        parsed = [EconomicAnalysisService._parse_spec(spec, max_points) for spec in specs]
+        points = math.prod(count for _, count, _ in parsed)
+        if points > max_points:
+            raise ValueError(f"Gitter zu groß: {points} Punkte (max. {max_points})")
+        return {name: build() for name, _, build in parsed}
+
+    @staticmethod
+    def _parse_spec(spec, max_points=None):
+        """-> (Parameter, Anzahl Werte, Callable für die Werteliste)"""
+        max_points = max_points or EconomicAnalysisService.MAX_GRID_POINTS
+        known = {name for name, _ in INPUTS + CONSTANTS}
+        positive = {name for name, _ in CONSTANTS}
+        try:
+            name, _, values = spec.partition("=")
+            name = name.strip()
+            if name not in known:
+                raise ValueError(f"Unbekannter Parameter: {name}")
+            if ":" in values:
+                start, stop, num = values.split(":")
+                start, stop, num = float(start), float(stop), int(num)
+                if num < 1:
+                    raise ValueError("Anzahl Punkte muss >= 1 sein")
+                if num > max_points:
+                    raise ValueError(f"zu viele Punkte: {num} (max. {max_points})")
+                EconomicAnalysisService._check_values(name, (start, stop), name in positive)
+                step = (stop - start) / (num - 1) if num > 1 else 0.0
+                return name, num, lambda: [start + step * i for i in range(num)]
+
+            count = values.count(",") + 1
+            if count > max_points:
+                raise ValueError(f"zu viele Werte: {count} (max. {max_points})")
+            explicit = [float(v) for v in values.split(",")]
+            EconomicAnalysisService._check_values(name, explicit, name in positive)
+            return name, count, lambda: explicit
+        except ValueError as e:
+            raise ValueError(f"Ungültiger Bereich '{spec}': {e}")
+
+    @staticmethod
+    def _check_values(name, values, positive):
+        for value in values:
+            if not math.isfinite(value):
+                raise ValueError(f"{name}: Werte müssen endlich sein")
+            if positive and value <= 0:
+                raise ValueError(f"{name}: Werte müssen > 0 sein")
+
+    @staticmethod
+    def to_columns(result):
+        """EconomicResult -> dict Kennzahl -> Liste (JSON-tauglich, inf -> None)"""
+        return {
+            key: EconomicAnalysisService.json_list(column)
+            for key, column in result._asdict().items()
+        }
+
+    @staticmethod
+    def json_list(column):
+        if not hasattr(column, "__len__"):
+            column = [column]
+        return [EconomicAnalysisService.json_number(x) for x in column]
+
+    @staticmethod
+    def json_number(value):
+        """float für JSON (inf/NaN -> None, sonst ungültiges JSON)"""
+        return float(value) if math.isfinite(value) else None
+
+    @staticmethod
+    def tornado_rows(bars):
+        """TornadoBar-Liste -> JSON-taugliche dicts (inkl. swing)"""
+        return [
+            {
+                key: EconomicAnalysisService.json_number(value) if isinstance(value, float) else value
+                for key, value in dict(bar._asdict(), swing=bar.swing).items()
+            }
+            for bar in bars
+        ]
@@ -0,0 +1,301 @@
+"""
+Wirtschaftlichkeitsmodell (Dimension 7) als reiner Rechenkern
+
+- Dieselben Formeln wie die Bewertung (ScoringService._economic_metrics), ohne ORM
+- economic_kernel() rechnet auf Arrays: jede Eingabe und beide Konstanten dürfen
+  Skalare oder gleich lange Arrays sein -> tausende Gitterpunkte in einem Aufruf
+- Mit NumPy vektorisiert; ohne NumPy (optionale Abhängigkeit) elementweise in Python
+  mit identischen Ergebnissen
+- tornado() / sweep() liefern Sensitivitäts- bzw. Gitterdaten um einen Basisfall
+"""
+import bisect
+import itertools
+import math
+from typing import NamedTuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: ohne NumPy rechnet der Kern elementweise
+    np = None
+
+# Eingaben (Fragen-Code -> Bezeichnung), Reihenfolge wie in der Bewertung
+INPUTS = (
+    ("1.6", "Anzahl Prozesse"),
+    ("7.1", "Einmalige Kosten"),
+    ("7.2", "Implementierungsaufwand (h)"),
+    ("7.3", "Laufende Kosten pro Jahr"),
+    ("7.4", "Wartung (h/Monat)"),
+    ("7.5", "Häufigkeit pro Monat"),
+    ("7.6", "Bearbeitungszeit (min)"),
+    ("7.7", "Verbleibende Zeit (min)"),
+)
+REQUIRED_CODES = tuple(code for code, _ in INPUTS)
+
+# Konstanten, die sich ebenfalls variieren lassen
+CONSTANTS = (
+    ("annual_work_hours_per_fte", "Jahresarbeitsstunden pro FTE"),
+    ("cost_per_fte_year", "Kosten pro FTE/Jahr"),
+)
+
+# ROI-Grenzen der Score-Stufen 1-5 (ROI < 5% -> 1, < 20% -> 2, < 50% -> 3, < 100% -> 4, sonst 5)
+ROI_SCORE_BOUNDS = (0.05, 0.20, 0.50, 1.0)
+
+
+class EconomicResult(NamedTuple):
+    """Kennzahlen (Skalare, Listen oder NumPy-Arrays - je nach Eingabe)"""
+    roi: object
+    score: object
+    personeller_nutzen: object
+    fte_einsparung: object
+    initiale_fixkosten: object
+    variable_kosten_jahr: object
+    haeufigkeit_jahr: object
+    zeitersparnis_h_jahr: object
+    # Häufigkeit pro Monat, ab der ROI >= 0 (inf, wenn die Automatisierung keine Zeit spart)
+    break_even_haeufigkeit_monat: object
+    # Monate bis die Fixkosten durch den laufenden Nettonutzen gedeckt sind (inf = nie)
+    amortisation_monate: object
+
+
+# ========================================
+# Vollständigkeit der Eingaben
+# ========================================
+
+def complete_inputs(values):
+    """
+    Ergänzt fehlende Eingaben wie die Bewertung.
+
+    Returns:
+        (values, missing) - fehlt nur 1.6, wird mit 1 weitergerechnet
+    """
+    values = dict(values)
+    missing = [c for c in REQUIRED_CODES if c not in values]
+    # Sonderfall: nur 1.6 fehlt -> Default setzen und weiterrechnen
+    if missing == ["1.6"]:
+        values["1.6"] = 1
+        missing = []
+    return values, missing
+
+
+def roi_to_score(roi):
+    """ROI -> Score 1.0-5.0 (kein Ausschluss bei negativem ROI, sondern schlechter Score)"""
+    return float(bisect.bisect_right(ROI_SCORE_BOUNDS, roi) + 1)
+
+
+# ========================================
+# Kern
+# ========================================
+
+def _formulas(v, annual_work_hours_per_fte, cost_per_fte_year, maximum, where):
+    """
+    Die Formeln einmal für beide Backends (Python-Skalare bzw. NumPy-Arrays).
+    Reihenfolge der Operationen wie im ursprünglichen Excel-Modell -> bitgleiche Ergebnisse.
+    """
+    # Inputs
+    anzahl_prozesse = maximum(v["1.6"], 1.0)  # Schutz vor Division durch 0
+    einmalige_kosten = v["7.1"]
+    impl_stunden = v["7.2"]
+    laufende_kosten_jahr = v["7.3"]
+    wartung_stunden_monat = v["7.4"]
+    haeufigkeit_monat = v["7.5"]
+    bearbeitungszeit_min = v["7.6"]
+    verbleibende_zeit_min = v["7.7"]
+
+    jahresarbeitsstunden = annual_work_hours_per_fte
+    kosten_pro_fte = cost_per_fte_year
+
+    # Baselines
+    haeufigkeit_jahr = haeufigkeit_monat * 12.0
+    stundensatz = kosten_pro_fte / jahresarbeitsstunden  # €/h
+
+    # Zeit / FTE
+    bearb_h = bearbeitungszeit_min / 60.0
+    verbleib_h = verbleibende_zeit_min / 60.0
+
+    gesamt_aktuell_h = bearb_h * haeufigkeit_jahr
+    gesamt_neu_h = verbleib_h * haeufigkeit_jahr
+    zeitersparnis_h = maximum(gesamt_aktuell_h - gesamt_neu_h, 0.0)
+
+    fte_einsparung = zeitersparnis_h / jahresarbeitsstunden
+    personeller_nutzen = fte_einsparung * kosten_pro_fte
+
+    # Kosten
+    initiale_fixkosten = (einmalige_kosten / anzahl_prozesse) + (impl_stunden * stundensatz)
+    wartung_stunden_jahr = wartung_stunden_monat * 12.0
+    variable_kosten_jahr = laufende_kosten_jahr + (wartung_stunden_jahr * stundensatz)
+
+    gesamtkosten = initiale_fixkosten + variable_kosten_jahr
+    has_costs = gesamtkosten > 0
+    roi = where(has_costs, (personeller_nutzen - gesamtkosten) / where(has_costs, gesamtkosten, 1.0), 0.0)
+
+    # Break-even: personeller_nutzen == gesamtkosten (Nutzen wächst linear mit der Häufigkeit)
+    ersparnis_pro_fall_jahr = (bearb_h - verbleib_h) * 12.0
+    saves_time = ersparnis_pro_fall_jahr > 0
+    break_even = where(
+        saves_time,
+        gesamtkosten / where(saves_time, ersparnis_pro_fall_jahr * stundensatz, 1.0),
+        math.inf
+    )
+
+    # Amortisation: Fixkosten / monatlicher Nettonutzen
+    netto_monat = (personeller_nutzen - variable_kosten_jahr) / 12.0
+    pays_back = netto_monat > 0
+    amortisation = where(pays_back, initiale_fixkosten / where(pays_back, netto_monat, 1.0), math.inf)
+
+    return (roi, personeller_nutzen, fte_einsparung, initiale_fixkosten, variable_kosten_jahr,
+            haeufigkeit_jahr, zeitersparnis_h, break_even, amortisation)
+
+
+def _scalar_where(condition, a, b):
+    return a if condition else b
+
+
+def economic_kernel(values, annual_work_hours_per_fte, cost_per_fte_year, use_numpy=True):
+    """
+    Berechnet die Kennzahlen für Skalare oder Arrays.
+
+    Args:
+        values: dict Fragen-Code (REQUIRED_CODES) -> Zahl oder Sequenz
+        annual_work_hours_per_fte / cost_per_fte_year: Zahl oder Sequenz
+        use_numpy: False erzwingt den Python-Pfad (z.B. zum Vergleich)
+
+    Returns:
+        EconomicResult - Python-Floats bei rein skalaren Eingaben, sonst NumPy-Arrays
+        (bzw. Listen ohne NumPy)
+    """
+    inputs = {code: values[code] for code in REQUIRED_CODES}
+    inputs["_hours"] = annual_work_hours_per_fte
+    inputs["_cost"] = cost_per_fte_year
+
+    lengths = {len(v) for v in inputs.values() if _is_sequence(v)}
+    if len(lengths) > 1:
+        raise ValueError(f"Eingabe-Arrays unterschiedlicher Länge: {sorted(lengths)}")
+
+    if not lengths:
+        # Ein Punkt: Python-Skalare (Pfad der Bewertung)
+        return _evaluate_scalar(inputs)
+
+    if np is not None and use_numpy:
+        arrays = {k: np.asarray(v, dtype=np.float64) for k, v in inputs.items()}
+        hours, cost = arrays.pop("_hours"), arrays.pop("_cost")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = _formulas(arrays, hours, cost, np.maximum, np.where)
+        shape = np.broadcast(*arrays.values(), hours, cost).shape
+        out = tuple(np.broadcast_to(np.asarray(x, dtype=np.float64), shape) for x in out)
+        score = np.digitize(out[0], ROI_SCORE_BOUNDS).astype(np.float64) + 1.0
+        return EconomicResult(out[0], score, *out[1:])
+
+    # Ohne NumPy: elementweise über denselben Kern
+    n = lengths.pop()
+    points = [
+        _evaluate_scalar({k: (v[i] if _is_sequence(v) else v) for k, v in inputs.items()})
+        for i in range(n)
+    ]
+    return EconomicResult(*(list(column) for column in zip(*points)))
+
+
+def _evaluate_scalar(inputs):
+    v = {k: float(x) for k, x in inputs.items()}
+    out = _formulas(v, v.pop("_hours"), v.pop("_cost"), max, _scalar_where)
+    return EconomicResult(out[0], roi_to_score(out[0]), *out[1:])
+
+
+def _is_sequence(value):
+    return not isinstance(value, (str, bytes)) and hasattr(value, "__len__")
+
+
+# ========================================
+# Sensitivität
+# ========================================
+
+class TornadoBar(NamedTuple):
+    parameter: str
+    label: str
+    base_value: float
+    low_value: float
+    high_value: float
+    roi_low: float
+    roi_high: float
+    score_low: float
+    score_high: float
+
+    @property
+    def swing(self):
+        return abs(self.roi_high - self.roi_low)
+
+
+def tornado(values, annual_work_hours_per_fte, cost_per_fte_year, delta=0.2):
+    """
+    Tornado-Daten: jede Eingabe/Konstante einzeln um ±delta variiert (ein Kernel-Aufruf).
+
+    Returns:
+        (Basis-EconomicResult, Liste von TornadoBar - nach Ausschlag absteigend)
+    """
+    base = dict(values)
+    base["annual_work_hours_per_fte"] = annual_work_hours_per_fte
+    base["cost_per_fte_year"] = cost_per_fte_year
+    parameters = INPUTS + CONSTANTS
+
+    # 2 Punkte pro Parameter: (1 - delta) und (1 + delta)
+    columns = {name: [] for name in base}
+    for name, _ in parameters:
+        for factor in (1.0 - delta, 1.0 + delta):
+            for key in columns:
+                columns[key].append(base[key] * factor if key == name else base[key])
+
+    result = _kernel_from_columns(columns)
+    bars = []
+    for i, (name, label) in enumerate(parameters):
+        lo, hi = 2 * i, 2 * i + 1
+        bars.append(TornadoBar(
+            parameter=name,
+            label=label,
+            base_value=float(base[name]),
+            low_value=float(columns[name][lo]),
+            high_value=float(columns[name][hi]),
+            roi_low=float(result.roi[lo]),
+            roi_high=float(result.roi[hi]),
+            score_low=float(result.score[lo]),
+            score_high=float(result.score[hi]),
+        ))
+    bars.sort(key=lambda bar: bar.swing, reverse=True)
+
+    base_result = economic_kernel(values, annual_work_hours_per_fte, cost_per_fte_year)
+    return base_result, bars
+
+
+def sweep(values, annual_work_hours_per_fte, cost_per_fte_year, grid):
+    """
+    Gitter über beliebige Eingaben/Konstanten (kartesisches Produkt, ein Kernel-Aufruf).
+
+    Args:
+        grid: dict Parameter (Fragen-Code oder Konstante) -> Sequenz von Werten
+
+    Returns:
+        (dict Parameter -> Werte-Spalte, EconomicResult mit einer Zeile pro Gitterpunkt)
+    """
+    known = {name for name, _ in INPUTS + CONSTANTS}
+    unknown = [name for name in grid if name not in known]
+    if unknown:
+        raise ValueError(f"Unbekannte Parameter: {', '.join(unknown)}")
+
+    base = dict(values)
+    base["annual_work_hours_per_fte"] = annual_work_hours_per_fte
+    base["cost_per_fte_year"] = cost_per_fte_year
+
+    names = list(grid)
+    if np is not None:
+        mesh = np.meshgrid(*(np.asarray(grid[name], dtype=np.float64) for name in names), indexing="ij")
+        axes = {name: m.ravel() for name, m in zip(names, mesh)}
+    else:
+        points = list(itertools.product(*(grid[name] for name in names)))
+        axes = {name: [p[i] for p in points] for i, name in enumerate(names)}
+
+    columns = dict(base)
+    columns.update(axes)
+    return axes, _kernel_from_columns(columns)
+
+
+def _kernel_from_columns(columns):
+    values = {code: columns[code] for code in REQUIRED_CODES}
+    return economic_kernel(values, columns["annual_work_hours_per_fte"], columns["cost_per_fte_year"])
@@ -0,0 +1,257 @@
+"""
+Portfolio-Auswertung der Wirtschaftlichkeit über alle Assessments
+
+- Lädt die Kennzahlen aller bewerteten Assessments mit EINER Query (Pivot über
+  economic_metric per bedingter Aggregation) spaltenweise
+- Summen/Portfolio-ROI vektorisiert (NumPy optional, sonst Python-Summen)
+- Auswahl unter Budget-Obergrenze für die Fixkosten: 0/1-Knapsack (Kosten auf ein
+  Raster gerundet; NumPy oder reines Python mit kleinerer Zellen-Obergrenze) bzw. Greedy
+  nach Nutzen/Kosten - es wird die bessere Auswahl genommen
+
+Zielgröße der Auswahl ist der jährliche Nettonutzen (personeller Nutzen - variable Kosten)
+oder die FTE-Einsparung; das Budget begrenzt die Summe der initialen Fixkosten.
+"""
+import math
+import operator
+from typing import NamedTuple, Optional, Tuple
+
+from sqlalchemy import case, func
+
+from extensions import db
+from models.database import Assessment, Process, EconomicMetric
+
+try:
+    import numpy as np
+except ImportError:  # optional: ohne NumPy wird in Python summiert und gerechnet
+    np = None
+
+# Spalten des Portfolios (economic_metric.key)
+METRIC_KEYS = (
+    "roi", "personeller_nutzen", "fte_einsparung",
+    "initiale_fixkosten", "variable_kosten_jahr", "zeitersparnis_h_jahr",
+)
+
+
+class PortfolioColumns(NamedTuple):
+    """Spaltenweise Kennzahlen (Listen bzw. NumPy-Arrays, eine Position pro Assessment)"""
+    assessment_ids: object
+    process_names: list
+    industries: list
+    metrics: dict  # key -> Spalte
+
+    def __len__(self):
+        return len(self.process_names)
+
+
+class PortfolioTotals(NamedTuple):
+    count: int
+    fte_einsparung: float
+    personeller_nutzen: float
+    initiale_fixkosten: float
+    variable_kosten_jahr: float
+    netto_nutzen_jahr: float
+    roi: Optional[float]  # (Nutzen - Fix - variable Kosten) / (Fix + variable Kosten), wie pro Assessment
+
+
+class PortfolioSelection(NamedTuple):
+    budget: float
+    objective: str
+    method: str  # knapsack | greedy
+    indices: Tuple[int, ...]  # Positionen in PortfolioColumns
+    totals: PortfolioTotals
+
+
+class PortfolioService:
+    """Aggregation und budgetbeschränkte Auswahl über alle Assessments"""
+
+    OBJECTIVES = ("netto_nutzen", "fte_einsparung")
+    DEFAULT_OBJECTIVE = "netto_nutzen"
+    # Obergrenze für Knapsack-Zellen (Positionen x Budget-Raster); reines Python schafft
+    # etwa 3 Mio. Zellen/s, darüber bleibt es ohne NumPy bei Greedy
+    MAX_KNAPSACK_CELLS = 20_000_000
+    MAX_KNAPSACK_CELLS_PYTHON = 2_500_000
+    # Feinstes Kostenraster (€) und maximale Anzahl Rasterstufen des Budgets
+    MIN_RESOLUTION = 1.0
+    MAX_BUDGET_STEPS = 2_000
+
+    # ========================================
+    # Laden
+    # ========================================
+
+    @staticmethod
+    def load(industry=None):
+        """Kennzahlen aller Assessments mit Wirtschaftlichkeitsdaten (eine Query)"""
+        pivot = [
+            func.max(case((EconomicMetric.key == key, EconomicMetric.value))).label(key)
+            for key in METRIC_KEYS
+        ]
+        query = db.session.query(
+            EconomicMetric.assessment_id, Process.name, Process.industry, *pivot
+        ).join(
+            Assessment, Assessment.id == EconomicMetric.assessment_id
+        ).join(
+            Process, Process.id == Assessment.process_id
+        ).filter(
+            EconomicMetric.key.in_(METRIC_KEYS)
+        ).group_by(
+            EconomicMetric.assessment_id, Process.name, Process.industry
+        ).order_by(EconomicMetric.assessment_id)
+        if industry:
+            query = query.filter(Process.industry == industry)
+
+        rows = query.all()
+        columns = list(zip(*rows)) if rows else [()] * (3 + len(METRIC_KEYS))
+        metrics = {
+            key: PortfolioService._column([0.0 if v is None else v for v in column])
+            for key, column in zip(METRIC_KEYS, columns[3:])
+        }
+        return PortfolioColumns(
+            assessment_ids=list(columns[0]),
+            process_names=list(columns[1]),
+            industries=[i or "" for i in columns[2]],
+            metrics=metrics,
+        )
+
+    @staticmethod
+    def _column(values):
+        return np.asarray(values, dtype=np.float64) if np is not None else list(values)
+
+    # ========================================
+    # Aggregation
+    # ========================================
+
+    @staticmethod
+    def objective_values(columns, objective):
+        """Nutzen pro Assessment für die Auswahl"""
+        if objective not in PortfolioService.OBJECTIVES:
+            raise ValueError(f"Unbekannte Zielgröße: {objective}")
+        m = columns.metrics
+        if objective == "fte_einsparung":
+            return m["fte_einsparung"]
+        if np is not None:
+            return m["personeller_nutzen"] - m["variable_kosten_jahr"]
+        return [b - v for b, v in zip(m["personeller_nutzen"], m["variable_kosten_jahr"])]
+
+    @staticmethod
+    def totals(columns, indices=None):
+        """Summen über alle (bzw. die ausgewählten) Assessments"""
+        m = columns.metrics
+        if np is not None:
+            idx = slice(None) if indices is None else np.asarray(indices, dtype=np.intp)
+            sums = {key: float(m[key][idx].sum()) for key in METRIC_KEYS}
+        else:
+            idx = range(len(columns)) if indices is None else indices
+            sums = {key: math.fsum(m[key][i] for i in idx) for key in METRIC_KEYS}
+        count = len(columns) if indices is None else len(indices)
+
+        kosten = sums["initiale_fixkosten"] + sums["variable_kosten_jahr"]
+        return PortfolioTotals(
+            count=count,
+            fte_einsparung=sums["fte_einsparung"],
+            personeller_nutzen=sums["personeller_nutzen"],
+            initiale_fixkosten=sums["initiale_fixkosten"],
+            variable_kosten_jahr=sums["variable_kosten_jahr"],
+            netto_nutzen_jahr=sums["personeller_nutzen"] - sums["variable_kosten_jahr"],
+            roi=(sums["personeller_nutzen"] - kosten) / kosten if kosten > 0 else None,
+        )
+
+    # ========================================
+    # Auswahl unter Budget
+    # ========================================
+
+    @staticmethod
+    def select(columns, budget, objective=None):
+        """
+        Beste Teilmenge, deren initiale Fixkosten das Budget nicht überschreiten.
+
+        Knapsack (exakt bis auf das Kostenraster, Kosten aufgerundet -> Budget hält immer)
+        und Greedy werden verglichen, die bessere Auswahl gewinnt. Bei zu großem Raster
+        (MAX_KNAPSACK_CELLS bzw. ohne NumPy MAX_KNAPSACK_CELLS_PYTHON) nur Greedy.
+        """
+        if budget is None or not math.isfinite(budget) or budget < 0:
+            raise ValueError("Budget muss eine endliche Zahl >= 0 sein")
+        objective = objective or PortfolioService.DEFAULT_OBJECTIVE
+        values = [float(v) for v in PortfolioService.objective_values(columns, objective)]
+        costs = [float(c) for c in columns.metrics["initiale_fixkosten"]]
+
+        # Kandidaten: positiver Nutzen, einzeln finanzierbar; kostenlose immer dabei
+        free = [i for i, (v, c) in enumerate(zip(values, costs)) if v > 0 and c <= 0]
+        candidates = [i for i, (v, c) in enumerate(zip(values, costs)) if v > 0 and 0 < c <= budget]
+
+        chosen, method = PortfolioService._greedy(candidates, values, costs, budget), "greedy"
+        if candidates:
+            resolution = max(PortfolioService.MIN_RESOLUTION, budget / PortfolioService.MAX_BUDGET_STEPS)
+            steps = int(budget // resolution)
+            max_cells = (PortfolioService.MAX_KNAPSACK_CELLS if np is not None
+                         else PortfolioService.MAX_KNAPSACK_CELLS_PYTHON)
+            if len(candidates) * (steps + 1) <= max_cells:
+                knapsack = PortfolioService._knapsack if np is not None else PortfolioService._knapsack_python
+                exact = knapsack(candidates, values, costs, steps, resolution)
+                if sum(values[i] for i in exact) > sum(values[i] for i in chosen):
+                    chosen, method = exact, "knapsack"
+
+        indices = tuple(sorted(free + chosen))
+        return PortfolioSelection(
+            budget=budget,
+            objective=objective,
+            method=method,
+            indices=indices,
+            totals=PortfolioService.totals(columns, indices),
+        )
+
+    @staticmethod
+    def _greedy(candidates, values, costs, budget):
+        """Nach Nutzen/Kosten absteigend auffüllen; mindestens so gut wie der beste Einzelkandidat"""
+        chosen, spent = [], 0.0
+        for i in sorted(candidates, key=lambda i: values[i] / costs[i], reverse=True):
+            if spent + costs[i] <= budget:
+                chosen.append(i)
+                spent += costs[i]
+        if candidates:
+            best = max(candidates, key=lambda i: values[i])
+            if values[best] > sum(values[i] for i in chosen):
+                chosen = [best]
+        return chosen
+
+    @staticmethod
+    def _knapsack(candidates, values, costs, steps, resolution):
+        """0/1-Knapsack über Budget-Rasterstufen (NumPy, eine Zeile pro Kandidat)"""
+        weights = np.ceil(np.asarray([costs[i] for i in candidates]) / resolution).astype(np.intp)
+        best = np.zeros(steps + 1)
+        take = np.zeros((len(candidates), steps + 1), dtype=bool)
+        for row, (i, w) in enumerate(zip(candidates, weights)):
+            if w > steps:
+                continue
+            with_item = best[:steps + 1 - w] + values[i]
+            better = with_item > best[w:]
+            take[row, w:] = better
+            best[w:] = np.where(better, with_item, best[w:])
+
+        # Rückverfolgung ab der vollen Budgetstufe
+        chosen, capacity = [], steps
+        for row in range(len(candidates) - 1, -1, -1):
+            if take[row, capacity]:
+                chosen.append(candidates[row])
+                capacity -= weights[row]
+        return chosen
+
+    @staticmethod
+    def _knapsack_python(candidates, values, costs, steps, resolution):
+        """Wie _knapsack ohne NumPy (Zeilen per map über C-Funktionen, Auswahl als bytearray)"""
+        weights = [math.ceil(costs[i] / resolution) for i in candidates]
+        best = [0.0] * (steps + 1)
+        take = []
+        for i, w in zip(candidates, weights):
+            row = bytearray(steps + 1)
+            if w <= steps:
+                with_item = list(map(values[i].__add__, best[:steps + 1 - w]))
+                row[w:] = bytes(map(operator.gt, with_item, best[w:]))
+                best[w:] = list(map(max, with_item, best[w:]))
+            take.append(row)
+
+        chosen, capacity = [], steps
+        for row in range(len(candidates) - 1, -1, -1):
+            if take[row][capacity]:
+                chosen.append(candidates[row])
+                capacity -= weights[row]
+        return chosen
@@ -0,0 +1,111 @@
+"""
+Vorgerenderte Fragebogen-Seite für die Startseite (/)
+
+- Das HTML-Gerüst (Dimensionen, Fragen, Optionen, Hinweise, Bedingungen) hängt nur von
+  der Fragebogen-Version ab -> wird pro kompiliertem Fragebogen EINMAL ohne Antworten
+  gerendert und im Prozess gecacht
+- Einzige variable Größe pro Request sind die gemeinsamen Antworten (SharedDimensionAnswer).
+  Sie werden als kleiner JSON-Block an der Platzhalter-Stelle eingesetzt und vom Seiten-JS
+  in die Felder übernommen (eine Query, kein Template-Rendering)
+- ETag = Hash(Gerüst + gemeinsame Antworten) -> unveränderte Formulare beantwortet der
+  Browser-Revalidate mit 304
+
+Der Cache-Eintrag merkt sich das kompilierte Objekt: nach invalidate_compiled_questionnaires()
+wird beim nächsten Aufruf automatisch neu gerendert.
+"""
+import hashlib
+import json
+import threading
+from typing import NamedTuple
+
+from models.database import SharedDimensionAnswer
+
+# Platzhalter im Gerüst, an dem der JSON-Block der gemeinsamen Antworten eingesetzt wird
+SHARED_ANSWERS_PLACEHOLDER = "__SHARED_ANSWERS__"
+
+
+class PageSkeleton(NamedTuple):
+    compiled: object
+    head: str
+    tail: str
+    digest: str
+
+
+class RenderedPage(NamedTuple):
+    html: str
+    etag: str
+
+
+_cache = {}
+_lock = threading.Lock()
+
+
+class QuestionnairePageService:
+    """Gecachtes Seitengerüst + Overlay der gemeinsamen Antworten"""
+
+    @staticmethod
+    def get_skeleton(compiled, cache_key, render_skeleton):
+        """
+        Liefert das gecachte Gerüst (wird beim ersten Zugriff gerendert).
+
+        Args:
+            compiled: kompilierter Fragebogen
+            cache_key: zusätzlicher Schlüssel für request-abhängige URLs (z.B. script_root)
+            render_skeleton: Callable(compiled) -> HTML mit genau einem SHARED_ANSWERS_PLACEHOLDER
+        """
+        key = (compiled.id, cache_key)
+        skeleton = _cache.get(key)
+        if skeleton is not None and skeleton.compiled is compiled:
+            return skeleton
+
+        with _lock:
+            skeleton = _cache.get(key)
+            if skeleton is None or skeleton.compiled is not compiled:
+                html = render_skeleton(compiled)
+                head, placeholder, tail = html.partition(SHARED_ANSWERS_PLACEHOLDER)
+                if not placeholder or SHARED_ANSWERS_PLACEHOLDER in tail:
+                    raise ValueError("Seitengerüst muss den Platzhalter für gemeinsame Antworten genau einmal enthalten")
+                skeleton = PageSkeleton(
+                    compiled=compiled,
+                    head=head,
+                    tail=tail,
+                    digest=hashlib.sha1(html.encode('utf-8')).hexdigest(),
+                )
+                _cache[key] = skeleton
+        return skeleton
+
+    @staticmethod
+    def load_shared_answers(compiled):
+        """
+        Gemeinsame Antworten aller geteilten Dimensionen (eine Query).
+
+        Returns:
+            {question_id: {'numeric': "Wert"} | {'options': [option_id, ...]}}
+            (Zahlen als Text wie bisher im Template gerendert)
+        """
+        if not compiled.shared_dimension_ids:
+            return {}
+
+        shared = {}
+        for sa in SharedDimensionAnswer.query.filter(
+            SharedDimensionAnswer.dimension_id.in_(compiled.shared_dimension_ids)
+        ).order_by(SharedDimensionAnswer.id):
+            answer = shared.setdefault(sa.question_id, {})
+            if sa.numeric_value is not None:
+                answer['numeric'] = str(sa.numeric_value)
+            if sa.scale_option_id is not None:
+                answer.setdefault('options', []).append(sa.scale_option_id)
+        return shared
+
+    @staticmethod
+    def render(skeleton, shared_answers):
+        """Setzt die gemeinsamen Antworten ins Gerüst ein und berechnet den ETag"""
+        overlay = json.dumps(shared_answers, sort_keys=True, separators=(',', ':'))
+        etag = hashlib.sha1(f"{skeleton.digest}:{overlay}".encode('utf-8')).hexdigest()
+        return RenderedPage(html=skeleton.head + overlay + skeleton.tail, etag=etag)
+
+
+def invalidate_questionnaire_pages():
+    """Verwirft alle gerenderten Gerüste (z.B. nach Template-Änderungen zur Laufzeit)"""
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,161 @@
+"""
+Service für die Ergebnisseite eines Assessments (/assessment/<id>)
+
+Query-begrenzt und ohne Scoring-Logik:
+- Ergebnisse, Einzelbewertungen (QuestionResult), Antworten und Wirtschaftlichkeitskennzahlen
+  werden mit je EINER Query geladen
+- Fragen und Optionen kommen aus dem kompilierten Fragebogen (keine Query)
+  -> konstante Anzahl Queries pro Seite, unabhängig von der Fragebogengröße
+"""
+from models.database import (
+    Dimension, Answer, DimensionResult, QuestionResult, TotalResult, EconomicMetric
+)
+from extensions import db
+
+
+class ResultViewService:
+    """Baut die Daten für die Ergebnisseite (dimensions_data, Gesamtscores, Kennzahlen)"""
+
+    @staticmethod
+    def load_answers(assessment_id):
+        """Alle Antworten eines Assessments, gruppiert nach Frage (Optionen nach id sortiert)"""
+        answers = Answer.query.filter_by(
+            assessment_id=assessment_id
+        ).order_by(Answer.question_id, Answer.scale_option_id, Answer.id).all()
+
+        answers_by_q = {}
+        for answer in answers:
+            answers_by_q.setdefault(answer.question_id, []).append(answer)
+        return answers, answers_by_q
+
+    @staticmethod
+    def load_question_results(assessment_id):
+        """Gespeicherte Einzelbewertungen: {(question_id, automation_type): QuestionResult}"""
+        return {
+            (qr.question_id, qr.automation_type): qr
+            for qr in QuestionResult.query.filter_by(assessment_id=assessment_id).all()
+        }
+
+    @staticmethod
+    def format_score(question_result):
+        """Anzeige-Text einer Einzelbewertung (Score, AUSSCHLUSS, N/A oder –)"""
+        if question_result is None:
+            return "–"
+        if question_result.is_exclusion:
+            return "AUSSCHLUSS"
+        if not question_result.is_applicable:
+            # Multiple Choice ohne anwendbaren Score zeigt keinen Wert
+            return "–" if question_result.is_best_of else "N/A"
+        if question_result.score is None:
+            return "–"
+        if question_result.is_best_of:
+            return f"{question_result.score:.1f} (max)"
+        return f"{question_result.score:.1f}"
+
+    @staticmethod
+    def build_dimensions_data(assessment_id, compiled, answers_by_q, question_results):
+        """
+        Baut die Dimensionsdaten inkl. Antworten und Einzel-Scores.
+
+        Returns:
+            Liste von Dimension-Dicts (sortiert nach Sort-Order)
+        """
+        # Dimensionsergebnisse
+        dim_results = db.session.query(
+            DimensionResult, Dimension
+        ).join(
+            Dimension, DimensionResult.dimension_id == Dimension.id
+        ).filter(
+            DimensionResult.assessment_id == assessment_id
+        ).order_by(
+            Dimension.sort_order, DimensionResult.automation_type
+        ).all()
+
+        # Gruppiere Ergebnisse nach Dimension (pro Dimension gibt es RPA und IPA)
+        dimensions_by_id = {}
+        for dim_result, dimension in dim_results:
+            if dimension.id not in dimensions_by_id:
+                dimensions_by_id[dimension.id] = {
+                    'code': dimension.code,
+                    'name': dimension.name,
+                    'calc_method': dimension.calc_method,
+                    'is_shared': dimension.code in ['1', '7'],  # FIX: Nur Dimension 1 (Plattformverfügbarkeit und Umsetzungsreife) und 7 (Wirtschaft) sind shared
+                    'rpa_score': None,
+                    'ipa_score': None,
+                    'rpa_excluded': False,
+                    'ipa_excluded': False,
+                    'answers': []  # Wird später gefüllt
+                }
+
+            # Speichere Score basierend auf automation_type
+            if dim_result.automation_type == "RPA":
+                dimensions_by_id[dimension.id]['rpa_score'] = dim_result.mean_score
+                dimensions_by_id[dimension.id]['rpa_excluded'] = dim_result.is_excluded
+            elif dim_result.automation_type == "IPA":
+                dimensions_by_id[dimension.id]['ipa_score'] = dim_result.mean_score
+                dimensions_by_id[dimension.id]['ipa_excluded'] = dim_result.is_excluded
+
+        for dimension_id, dim_data in dimensions_by_id.items():
+            for question in compiled.dimension_by_id[dimension_id].questions:
+                answers = answers_by_q.get(question.id)
+                if not answers:
+                    continue
+                dim_data['answers'].append(
+                    ResultViewService._answer_row(compiled, question, answers, question_results)
+                )
+
+        # Reihenfolge wie die Dimensionsergebnisse (sortiert nach Sort-Order)
+        return list(dimensions_by_id.values())
+
+    @staticmethod
+    def _answer_row(compiled, question, answers, question_results):
+        """Formatiert Antwort(en) und die gespeicherte RPA/IPA-Einzelbewertung einer Frage"""
+        answer_text = "Keine Antwort"
+
+        if question.question_type == "number":
+            # Numerische Frage - nur eine Antwort
+            if answers[0].numeric_value is not None:
+                answer_text = f"{answers[0].numeric_value}"
+                if question.unit:
+                    answer_text += f" {question.unit}"
+
+        elif question.question_type == "multiple_choice":
+            # Multiple Choice - mehrere Antworten möglich
+            selected_options = []
+            for ans in answers:
+                if ans.scale_option_id:
+                    option = compiled.option_by_id.get(ans.scale_option_id)
+                    if option:
+                        selected_options.append(option.label)
+
+            if selected_options:
+                answer_text = ", ".join(selected_options)
+
+        else:
+            # Single Choice - nur eine Antwort
+            if answers[0].scale_option_id:
+                option = compiled.option_by_id.get(answers[0].scale_option_id)
+                if option:
+                    answer_text = option.label
+
+        return {
+            'question_code': question.code,
+            'question_text': question.text,
+            'answer': answer_text,
+            'is_applicable': answers[0].is_applicable,
+            'rpa_score': ResultViewService.format_score(question_results.get((question.id, "RPA"))),
+            'ipa_score': ResultViewService.format_score(question_results.get((question.id, "IPA")))
+        }
+
+    @staticmethod
+    def load_totals(assessment_id):
+        """Gesamtergebnis und Wirtschaftlichkeitskennzahlen"""
+        total_result = TotalResult.query.filter_by(assessment_id=assessment_id).first()
+
+        economic_metrics_data = {}
+        for metric in EconomicMetric.query.filter_by(assessment_id=assessment_id).all():
+            economic_metrics_data[metric.key] = {
+                'value': metric.value,
+                'unit': metric.unit
+            }
+        return total_result, economic_metrics_data
@@ -1,348 +1,772 @@
 """
 Service für die Berechnung von Assessment-Ergebnissen
 Inkl. vollständiger Wirtschaftlichkeitsberechnung basierend auf Excel-Formeln
+
+Set-basiert:
+- Antworten eines Assessments werden mit EINER Query geladen
+- Option-Scores kommen aus dem kompilierten Fragebogen (keine Query)
+- Alle Dimensionen (RPA/IPA), Ausschlüsse, Multiple-Choice Best-of und
+  Wirtschaftlichkeit werden in einem Durchlauf im Speicher berechnet
+- Die Einzelbewertung pro Frage (QuestionResult) wird mitgespeichert,
+  Ergebnisseite/Export lesen sie direkt (keine Scoring-Logik beim Anzeigen)
+- DimensionResult/QuestionResult/EconomicMetric werden per Bulk-Insert geschrieben
+  -> konstante Anzahl Queries pro Assessment, unabhängig von der Fragebogengröße
+- rescore_all() berechnet den Bestand chunkweise neu (optional über einen Prozess-Pool)
+- rescore_dimensions() bewertet nach Einzeländerungen nur die betroffenen Dimensionen neu
 """
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
 from models.database import (
-    Assessment, Answer, DimensionResult, TotalResult, 
-    Question, OptionScore, Dimension, EconomicMetric
+    Assessment, Answer, DimensionResult, QuestionResult, TotalResult, EconomicMetric
 )
 from extensions import db
+from services.compiled_questionnaire import (
+    get_compiled_questionnaire, invalidate_compiled_questionnaires
+)
+from services.assessment_summary import AssessmentSummaryService
+from services.economic_model import economic_kernel, complete_inputs, roi_to_score
 from collections import defaultdict
 
+logger = logging.getLogger(__name__)
+
+# ========================================
+# Ergebnis-Datensätze (reine Werte, ohne ORM)
+# ========================================
+
+class QuestionScore(NamedTuple):
+    question_id: int
+    automation_type: str
+    score: Optional[float]
+    is_exclusion: bool
+    is_applicable: bool
+    source_option_id: Optional[int]
+    is_best_of: bool
+
+
+class DimensionScore(NamedTuple):
+    dimension_id: int
+    automation_type: str
+    mean_score: Optional[float]
+    is_excluded: bool
+    excluded_by_question_id: Optional[int]
+
+
+class EconomicValue(NamedTuple):
+    key: str
+    value: float
+    unit: str
+
+
+class AssessmentScore(NamedTuple):
+    question_scores: Tuple[QuestionScore, ...]
+    dimension_scores: Tuple[DimensionScore, ...]
+    economic_metrics: Tuple[EconomicValue, ...]
+    total_rpa: Optional[float]
+    total_ipa: Optional[float]
+    rpa_excluded: bool
+    ipa_excluded: bool
+    recommendation: str
+
+
+class RescoreDiff(NamedTuple):
+    """Abweichung eines gespeicherten Gesamtergebnisses von der Neuberechnung"""
+    assessment_id: int
+    old: Optional[tuple]  # (total_rpa, total_ipa, rpa_excluded, ipa_excluded, recommendation)
+    new: tuple
+
+
+class RescoreReport(NamedTuple):
+    processed: int
+    changed: int
+    elapsed: float
+    dry_run: bool
+    diffs: Tuple[RescoreDiff, ...]
+
+    @property
+    def per_second(self):
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+
 class ScoringService:
     """Service zur Berechnung von RPA/IPA-Scores"""
-    
+
     # Konstanten für Wirtschaftlichkeitsberechnung
     ANNUAL_WORK_HOURS_PER_FTE = 1700  # K96: Jahresarbeitsstunden pro FTE
     COST_PER_FTE_YEAR = 55000  # Kosten pro FTE/Jahr in Euro
-    
+
+    # Mindestabstand IPA-RPA für eine eindeutige Empfehlung
+    RECOMMENDATION_THRESHOLD = 0.25
+
+    # Neuberechnung des Bestands
+    RESCORE_CHUNK_SIZE = 500
+
     @staticmethod
     def calculate_assessment_results(assessment_id):
         """
         Berechnet alle Ergebnisse für ein Assessment
-        
+
         Returns:
             TotalResult-Objekt
         """
         assessment = Assessment.query.get(assessment_id)
         if not assessment:
             raise ValueError(f"Assessment {assessment_id} nicht gefunden")
-        
-        # 1. Lösche alte Ergebnisse (falls vorhanden)
-        DimensionResult.query.filter_by(assessment_id=assessment_id).delete()
-        TotalResult.query.filter_by(assessment_id=assessment_id).delete()
-        EconomicMetric.query.filter_by(assessment_id=assessment_id).delete()
-        
-        # 2. Berechne Dimension-Ergebnisse
-        dimensions = Dimension.query.filter_by(
-            questionnaire_version_id=assessment.questionnaire_version_id
-        ).order_by(Dimension.sort_order).all()
-        
-        for dimension in dimensions:
-            if dimension.calc_method == "economic_score":
-                # Spezielle Behandlung für wirtschaftliche Dimension
-                ScoringService._calculate_economic_dimension(assessment_id, dimension)
-            else:
-                # Für alle anderen Dimensionen (inkl. organisatorisch) beide Automation-Typen berechnen
-                for automation_type in ["RPA", "IPA"]:
-                    ScoringService._calculate_dimension_result(
-                        assessment_id, dimension, automation_type
-                    )
-        
-        # 3. Berechne Gesamt-Ergebnis
-        total_result = ScoringService._calculate_total_result(assessment_id)
-        
+
+        compiled = get_compiled_questionnaire(assessment.questionnaire_version_id)
+
+        # 1. Alle Antworten mit einer Query laden (Reihenfolge wie gespeichert)
+        answer_rows = db.session.query(
+            Answer.question_id, Answer.scale_option_id, Answer.numeric_value
+        ).filter(
+            Answer.assessment_id == assessment_id
+        ).order_by(Answer.id).all()
+
+        # 2. Berechnen, alte Ergebnisse löschen und neue per Bulk-Insert schreiben
+        total_result = ScoringService.store_results(assessment_id, compiled, answer_rows)
+
         db.session.commit()
-        
+
         return total_result
-    
+
     @staticmethod
-    def _calculate_dimension_result(assessment_id, dimension, automation_type):
-        """Berechnet das Ergebnis für eine Dimension (inkl. multiple_choice Best-of)"""
+    def store_results(assessment_id, compiled, answer_rows):
+        """
+        Berechnet die Ergebnisse aus einem bereits geladenen Antwort-Vektor und
+        schreibt sie in der laufenden Transaktion (ohne Commit).
 
-        questions = Question.query.filter_by(dimension_id=dimension.id).all()
-        question_ids = [q.id for q in questions]
+        Returns:
+            TotalResult-Objekt
+        """
+        scored = ScoringService.score_answers(compiled, answer_rows)
+        return ScoringService._write_results(assessment_id, scored)
 
-        answers = Answer.query.filter(
-            Answer.assessment_id == assessment_id,
-            Answer.question_id.in_(question_ids)
-        ).all()
+    @staticmethod
+    def rescore_dimensions(assessment_id, dimension_ids, changed_question_ids=None,
+                           compiled=None, answer_rows=None):
+        """
+        Inkrementelle Neuberechnung nach Änderungen an einzelnen Antworten (ohne Commit).
 
-        # Antworten nach question_id gruppieren (wichtig für multiple_choice)
-        answers_by_q = defaultdict(list)
-        for a in answers:
-            answers_by_q[a.question_id].append(a)
+        - Nur die angegebenen Dimensionen werden neu bewertet (Antworten nur ihrer Fragen)
+        - DimensionResult-Zeilen werden per Upsert ersetzt, QuestionResult der betroffenen Fragen neu geschrieben
+        - TotalResult wird aus den gespeicherten Dimensions-Mittelwerten abgeleitet
+        - Wirtschaftlichkeit nur, wenn sich eine Frage der Dimension 7 oder Frage 1.6 geändert hat
+          (ohne changed_question_ids: wenn Dimension 7 oder die Dimension von 1.6 betroffen ist)
 
-        scores = []
-        is_excluded = False
-        excluded_by_question_id = None
+        Args:
+            assessment_id: bereits bewertetes Assessment
+            dimension_ids: geänderte Dimensionen
+            changed_question_ids: optional die geänderten Fragen (präzisiert die Wirtschaftlichkeits-Regel)
+            compiled: optional der kompilierte Fragebogen des Assessments
+            answer_rows: optional bereits geladene (question_id, scale_option_id, numeric_value)
 
-        for question in questions:
-            q_answers = answers_by_q.get(question.id, [])
-            if not q_answers:
-                continue
+        Returns:
+            AssessmentScore (question_scores/dimension_scores nur der neu bewerteten Dimensionen)
+        """
+        if compiled is None:
+            assessment = db.session.get(Assessment, assessment_id)
+            if not assessment:
+                raise ValueError(f"Assessment {assessment_id} nicht gefunden")
+            compiled = get_compiled_questionnaire(assessment.questionnaire_version_id)
+
+        dimension_ids = set(dimension_ids)
+        economic_dimension = next((d for d in compiled.dimensions if d.calc_method == "economic_score"), None)
+        q_1_6 = compiled.question_by_code.get("1.6")
+
+        # Wirtschaftlichkeit betroffen? (ihr Score ist das Ergebnis von Dimension 7)
+        if economic_dimension is None:
+            economic_changed = False
+        elif changed_question_ids is not None:
+            economic_questions = {q.id for q in economic_dimension.questions}
+            if q_1_6:
+                economic_questions.add(q_1_6.id)
+            economic_changed = bool(economic_questions & set(changed_question_ids))
+        else:
+            economic_changed = economic_dimension.id in dimension_ids or bool(
+                q_1_6 and q_1_6.dimension_id in dimension_ids
+            )
+        if economic_changed:
+            dimension_ids.add(economic_dimension.id)
+        elif economic_dimension:
+            dimension_ids.discard(economic_dimension.id)
+
+        dimensions = [d for d in compiled.dimensions if d.id in dimension_ids]
+        question_ids = [q.id for d in dimensions for q in d.questions]
+        if economic_changed and q_1_6:
+            question_ids.append(q_1_6.id)
+
+        # Antworten nur der betroffenen Fragen (eine Query, Reihenfolge wie gespeichert)
+        if answer_rows is None:
+            answer_rows = db.session.query(
+                Answer.question_id, Answer.scale_option_id, Answer.numeric_value
+            ).filter(
+                Answer.assessment_id == assessment_id,
+                Answer.question_id.in_(question_ids)
+            ).order_by(Answer.id).all()
+        answers_by_q = defaultdict(list)
+        for question_id, scale_option_id, numeric_value in answer_rows:
+            answers_by_q[question_id].append((scale_option_id, numeric_value))
 
-            # -----------------------------
-            # SINGLE CHOICE
-            # -----------------------------
-            if question.question_type == "single_choice":
-                a = q_answers[0]
-                if not a.scale_option_id:
-                    continue
+        question_scores = {}
+        dimension_scores = []
+        economic_metrics = ()
+        for dimension in dimensions:
+            if dimension.calc_method == "economic_score":
+                economic_score, economic_metrics = ScoringService._score_economic_dimension(
+                    dimension, answers_by_q, compiled
+                )
+                for auto in ["RPA", "IPA"]:
+                    dimension_scores.append(DimensionScore(dimension.id, auto, economic_score, False, None))
+                continue
 
-                option_score = OptionScore.query.filter_by(
-                    question_id=question.id,
-                    scale_option_id=a.scale_option_id,
-                    automation_type=automation_type
-                ).first()
+            for question in dimension.questions:
+                for automation_type in ["RPA", "IPA"]:
+                    qs = ScoringService._score_question(
+                        question, automation_type, answers_by_q.get(question.id), compiled
+                    )
+                    if qs is not None:
+                        question_scores[(question.id, automation_type)] = qs
+            for automation_type in ["RPA", "IPA"]:
+                dimension_scores.append(ScoringService._score_dimension(
+                    dimension, automation_type, question_scores
+                ))
 
-                if not option_score:
-                    continue
+        # Dimensionsergebnisse per Upsert (uq_dim_result), Einzelbewertungen ersetzen
+        if dimension_scores:
+            stmt = sqlite_insert(DimensionResult.__table__)
+            db.session.execute(stmt.on_conflict_do_update(
+                index_elements=['assessment_id', 'dimension_id', 'automation_type'],
+                set_={c: stmt.excluded[c] for c in ('mean_score', 'is_excluded', 'excluded_by_question_id')}
+            ), [dict(ds._asdict(), assessment_id=assessment_id) for ds in dimension_scores])
+
+        # Core-Delete: Autosave-Hot-Path, ohne ORM-Bulk-Delete-Overhead
+        scored_question_ids = [q.id for d in dimensions if d.calc_method != "economic_score" for q in d.questions]
+        if scored_question_ids:
+            db.session.execute(delete(QuestionResult.__table__).where(
+                QuestionResult.assessment_id == assessment_id,
+                QuestionResult.question_id.in_(scored_question_ids)
+            ))
+        if question_scores:
+            db.session.execute(
+                insert(QuestionResult.__table__),
+                [dict(qs._asdict(), assessment_id=assessment_id) for qs in question_scores.values()]
+            )
+
+        if economic_changed:
+            db.session.execute(delete(EconomicMetric.__table__).where(EconomicMetric.assessment_id == assessment_id))
+            if economic_metrics:
+                db.session.execute(
+                    insert(EconomicMetric.__table__),
+                    [dict(m._asdict(), assessment_id=assessment_id, automation_type=None)
+                     for m in economic_metrics]
+                )
+
+        # Gesamtergebnis aus den gespeicherten Dimensions-Mittelwerten (inkl. der gerade geschriebenen)
+        cached = [
+            DimensionScore(*row) for row in db.session.query(
+                DimensionResult.dimension_id, DimensionResult.automation_type, DimensionResult.mean_score,
+                DimensionResult.is_excluded, DimensionResult.excluded_by_question_id
+            ).filter(DimensionResult.assessment_id == assessment_id)
+        ]
+        total = ScoringService._score_total((), cached, (), compiled)
+
+        totals = {
+            'total_rpa': total.total_rpa,
+            'total_ipa': total.total_ipa,
+            'rpa_excluded': total.rpa_excluded,
+            'ipa_excluded': total.ipa_excluded,
+            'recommendation': total.recommendation,
+        }
+        updated = db.session.execute(
+            update(TotalResult.__table__).where(TotalResult.assessment_id == assessment_id).values(**totals)
+        ).rowcount
+        if not updated:
+            db.session.execute(insert(TotalResult.__table__), [dict(totals, assessment_id=assessment_id)])
+
+        # Vergleichstabelle mitpflegen
+        AssessmentSummaryService.refresh([assessment_id])
+
+        return total._replace(
+            question_scores=tuple(question_scores.values()),
+            dimension_scores=tuple(dimension_scores),
+            economic_metrics=tuple(economic_metrics),
+        )
 
-                if option_score.is_exclusion:
-                    is_excluded = True
-                    excluded_by_question_id = question.id
-                    break
+    @staticmethod
+    def score_answers(compiled, answer_rows):
+        """
+        Reine Berechnung ohne Datenbankzugriff
 
-                if option_score.is_applicable and option_score.score is not None:
-                    scores.append(option_score.score)
+        Args:
+            compiled: CompiledQuestionnaire
+            answer_rows: Iterable von (question_id, scale_option_id, numeric_value)
 
-            # -----------------------------
-            # MULTIPLE CHOICE (Best-of)
-            # -----------------------------
-            elif question.question_type == "multiple_choice":
-                option_ids = [a.scale_option_id for a in q_answers if a.scale_option_id]
-                if not option_ids:
-                    continue
+        Returns:
+            AssessmentScore
+        """
+        # Antworten nach question_id gruppieren (wichtig für multiple_choice)
+        answers_by_q = defaultdict(list)
+        for question_id, scale_option_id, numeric_value in answer_rows:
+            answers_by_q[question_id].append((scale_option_id, numeric_value))
+
+        # Einzelbewertung pro Frage (Grundlage für Dimensionen und Ergebnisseite)
+        question_scores = {}
+        for question in compiled.questions:
+            for automation_type in ["RPA", "IPA"]:
+                qs = ScoringService._score_question(
+                    question, automation_type, answers_by_q.get(question.id), compiled
+                )
+                if qs is not None:
+                    question_scores[(question.id, automation_type)] = qs
+
+        dimension_scores = []
+        economic_metrics = ()
+
+        for dimension in compiled.dimensions:
+            if dimension.calc_method == "economic_score":
+                # Spezielle Behandlung für wirtschaftliche Dimension
+                economic_score, economic_metrics = ScoringService._score_economic_dimension(
+                    dimension, answers_by_q, compiled
+                )
+                # DimensionResult für RPA & IPA (gleich)
+                for auto in ["RPA", "IPA"]:
+                    dimension_scores.append(DimensionScore(dimension.id, auto, economic_score, False, None))
+            else:
+                # Für alle anderen Dimensionen (inkl. organisatorisch) beide Automation-Typen berechnen
+                for automation_type in ["RPA", "IPA"]:
+                    dimension_scores.append(ScoringService._score_dimension(
+                        dimension, automation_type, question_scores
+                    ))
 
-                option_scores = OptionScore.query.filter(
-                    OptionScore.question_id == question.id,
-                    OptionScore.automation_type == automation_type,
-                    OptionScore.scale_option_id.in_(option_ids)
-                ).all()
+        return ScoringService._score_total(
+            tuple(question_scores.values()), dimension_scores, economic_metrics, compiled
+        )
 
-                if not option_scores:
-                    continue
+    @staticmethod
+    def _score_question(question, automation_type, q_answers, compiled):
+        """
+        Bewertet eine Frage für einen Automatisierungstyp (inkl. multiple_choice Best-of)
 
-                # Ausschluss schlägt alles
-                if any(os.is_exclusion for os in option_scores):
-                    is_excluded = True
-                    excluded_by_question_id = question.id
-                    break
+        Returns:
+            QuestionScore oder None (unbeantwortet / ohne OptionScore)
+        """
+        if not q_answers:
+            return None
+
+        # -----------------------------
+        # SINGLE CHOICE
+        # -----------------------------
+        if question.question_type == "single_choice":
+            scale_option_id = q_answers[0][0]
+            if not scale_option_id:
+                return None
+
+            option_score = compiled.get_score(question.id, scale_option_id, automation_type)
+
+            if not option_score:
+                return None
+
+            return QuestionScore(
+                question.id, automation_type, option_score.score, bool(option_score.is_exclusion),
+                bool(option_score.is_applicable), scale_option_id, False
+            )
+
+        # -----------------------------
+        # MULTIPLE CHOICE (Best-of)
+        # -----------------------------
+        if question.question_type == "multiple_choice":
+            option_ids = sorted({oid for oid, _ in q_answers if oid})
+
+            option_scores = [
+                (oid, s) for oid, s in ((oid, compiled.get_score(question.id, oid, automation_type)) for oid in option_ids)
+                if s is not None
+            ]
+
+            if not option_scores:
+                return None
+
+            # Ausschluss schlägt alles
+            for oid, os in option_scores:
+                if os.is_exclusion:
+                    return QuestionScore(question.id, automation_type, os.score, True, bool(os.is_applicable), oid, True)
+
+            # nur anwendbare Scores berücksichtigen
+            applicable = [
+                (os.score, oid) for oid, os in option_scores
+                if os.is_applicable and os.score is not None
+            ]
+
+            if not applicable:
+                return QuestionScore(question.id, automation_type, None, False, False, None, True)
+
+            best_score = max(score for score, _ in applicable)
+            best_option_id = min(oid for score, oid in applicable if score == best_score)
+            return QuestionScore(question.id, automation_type, best_score, False, True, best_option_id, True)
+
+        # number hat in deinem Modell keine OptionScores -> ignorieren (wie bisher)
+        return None
 
-                # nur anwendbare Scores berücksichtigen
-                applicable = [
-                    os.score for os in option_scores
-                    if os.is_applicable and os.score is not None
-                ]
+    @staticmethod
+    def _score_dimension(dimension, automation_type, question_scores):
+        """Berechnet das Ergebnis für eine Dimension aus den Einzelbewertungen"""
 
-                if applicable:
-                    scores.append(max(applicable))
+        scores = []
+        is_excluded = False
+        excluded_by_question_id = None
 
-            # number hat in deinem Modell keine OptionScores -> ignorieren (wie bisher)
-            else:
+        for question in dimension.questions_in_id_order:
+            qs = question_scores.get((question.id, automation_type))
+            if qs is None:
                 continue
 
+            if qs.is_exclusion:
+                is_excluded = True
+                excluded_by_question_id = question.id
+                break
+
+            if qs.is_applicable and qs.score is not None:
+                scores.append(qs.score)
+
         mean_score = None
         if not is_excluded and scores:
             mean_score = sum(scores) / len(scores)
 
-        dim_result = DimensionResult(
-            assessment_id=assessment_id,
-            dimension_id=dimension.id,
-            automation_type=automation_type,
-            mean_score=mean_score,
-            is_excluded=is_excluded,
-            excluded_by_question_id=excluded_by_question_id
-        )
-        db.session.add(dim_result)
-    @staticmethod
-    def _calculate_economic_dimension(assessment_id, dimension):
-        """Berechnet Dimension 7 (Wirtschaftlichkeit) + speichert Kennzahlen & Score."""
-
-        assessment = Assessment.query.get(assessment_id)
-        if not assessment:
-            raise ValueError(f"Assessment {assessment_id} nicht gefunden")
-
-        # Antworten aus Dimension 7 laden
-        q7_questions = Question.query.filter_by(dimension_id=dimension.id).all()
-        q7_ids = [q.id for q in q7_questions]
+        return DimensionScore(dimension.id, automation_type, mean_score, is_excluded, excluded_by_question_id)
 
-        answers = Answer.query.filter(
-            Answer.assessment_id == assessment_id,
-            Answer.question_id.in_(q7_ids)
-        ).all()
+    @staticmethod
+    def _score_economic_dimension(dimension, answers_by_q, compiled):
+        """
+        Berechnet Dimension 7 (Wirtschaftlichkeit)
 
+        Returns:
+            (economic_score oder None, Tuple von EconomicValue)
+        """
         values = {}
-        for a in answers:
-            if a.numeric_value is None:
-                continue
-            q = Question.query.get(a.question_id)
-            if q:
-                values[q.code] = a.numeric_value
+        for question in dimension.questions_in_id_order:
+            for _, numeric_value in answers_by_q.get(question.id, ()):
+                if numeric_value is None:
+                    continue
+                values[question.code] = numeric_value
 
         # 1.6 separat holen (liegt nicht in Dimension 7)
-        q_1_6 = Question.query.filter_by(
-            questionnaire_version_id=assessment.questionnaire_version_id,
-            code="1.6"
-        ).first()
+        q_1_6 = compiled.question_by_code.get("1.6")
         if q_1_6:
-            a_1_6 = Answer.query.filter_by(
-                assessment_id=assessment_id,
-                question_id=q_1_6.id
-            ).first()
-            if a_1_6 and a_1_6.numeric_value is not None:
-                values["1.6"] = a_1_6.numeric_value
-
-        required = ["1.6", "7.1", "7.2", "7.3", "7.4", "7.5", "7.6", "7.7"]
-        missing = [c for c in required if c not in values]
-        # Sonderfall: nur 1.6 fehlt -> Default setzen und weiterrechnen
-        if missing == ["1.6"]:
-            values["1.6"] = 1
-            missing = []  # optional, nur zur Klarheit
+            a_1_6 = answers_by_q.get(q_1_6.id)
+            if a_1_6 and a_1_6[0][1] is not None:
+                values["1.6"] = a_1_6[0][1]
+
+        values, missing = complete_inputs(values)
         if missing:
-            print(f"⚠️ Wirtschaftlichkeit: Werte fehlen: {missing} - Keine Berechnung möglich")
-            # Erstelle leere DimensionResults ohne Score
-            for auto in ["RPA", "IPA"]:
-                db.session.add(DimensionResult(
-                    assessment_id=assessment_id,
-                    dimension_id=dimension.id,
-                    automation_type=auto,
-                    mean_score=None,
-                    is_excluded=False,
-                    excluded_by_question_id=None
-                ))
-            return  # Beende die Funktion hier - keine Economic Metrics erstellen
-
-        # Inputs
-        anzahl_prozesse = max(float(values["1.6"]), 1.0)  # Schutz vor Division durch 0
-        einmalige_kosten = float(values["7.1"])
-        impl_stunden = float(values["7.2"])
-        laufende_kosten_jahr = float(values["7.3"])
-        wartung_stunden_monat = float(values["7.4"])
-        haeufigkeit_monat = float(values["7.5"])
-        bearbeitungszeit_min = float(values["7.6"])
-        verbleibende_zeit_min = float(values["7.7"])
-
-        jahresarbeitsstunden = float(ScoringService.ANNUAL_WORK_HOURS_PER_FTE)
-        kosten_pro_fte = float(ScoringService.COST_PER_FTE_YEAR)
-
-        # Baselines
-        haeufigkeit_jahr = haeufigkeit_monat * 12.0
-        stundensatz = kosten_pro_fte / jahresarbeitsstunden  # €/h
-
-        # Zeit / FTE
-        bearb_h = bearbeitungszeit_min / 60.0
-        verbleib_h = verbleibende_zeit_min / 60.0
-
-        gesamt_aktuell_h = bearb_h * haeufigkeit_jahr
-        gesamt_neu_h = verbleib_h * haeufigkeit_jahr
-        zeitersparnis_h = max(gesamt_aktuell_h - gesamt_neu_h, 0.0)
-
-        fte_einsparung = zeitersparnis_h / jahresarbeitsstunden
-        personeller_nutzen = fte_einsparung * kosten_pro_fte
-
-        # Kosten
-        initiale_fixkosten = (einmalige_kosten / anzahl_prozesse) + (impl_stunden * stundensatz)
-        wartung_stunden_jahr = wartung_stunden_monat * 12.0
-        variable_kosten_jahr = laufende_kosten_jahr + (wartung_stunden_jahr * stundensatz)
-
-        gesamtkosten = initiale_fixkosten + variable_kosten_jahr
-        roi = (personeller_nutzen - gesamtkosten) / gesamtkosten if gesamtkosten > 0 else 0.0
-
-        # Kennzahlen speichern
-        metrics = [
-            ("roi", roi, "%"),
-            ("personeller_nutzen", personeller_nutzen, "€"),
-            ("fte_einsparung", fte_einsparung, "FTE"),
-            ("initiale_fixkosten", initiale_fixkosten, "€"),
-            ("variable_kosten_jahr", variable_kosten_jahr, "€"),
-            ("haeufigkeit_jahr", haeufigkeit_jahr, "Anzahl"),
-            ("zeitersparnis_h_jahr", zeitersparnis_h, "Stunden"),
-        ]
-        for key, val, unit in metrics:
-            db.session.add(EconomicMetric(
-                assessment_id=assessment_id,
-                automation_type=None,
-                key=key,
-                value=val,
-                unit=unit
-            ))
+            logger.debug("Wirtschaftlichkeit: Werte fehlen, keine Berechnung", extra={'missing': missing})
+            # Leere DimensionResults ohne Score, keine Economic Metrics
+            return None, ()
+
+        metrics = ScoringService._economic_metrics(values)
+        roi = metrics[0].value
 
         # ROI -> Score (kein Ausschluss mehr bei negativem ROI)
-        if roi < 0:
-            economic_score, is_excluded = 1.0, False  # Schlechter Score statt Ausschluss
-        elif roi < 0.05:
-            economic_score, is_excluded = 1.0, False
-        elif roi < 0.20:
-            economic_score, is_excluded = 2.0, False
-        elif roi < 0.50:
-            economic_score, is_excluded = 3.0, False
-        elif roi < 1.0:
-            economic_score, is_excluded = 4.0, False
-        else:
-            economic_score, is_excluded = 5.0, False
+        economic_score = ScoringService._roi_to_score(roi)
 
-        # DimensionResult für RPA & IPA (gleich)
-        for auto in ["RPA", "IPA"]:
-            db.session.add(DimensionResult(
-                assessment_id=assessment_id,
-                dimension_id=dimension.id,
-                automation_type=auto,
-                mean_score=economic_score,
-                is_excluded=is_excluded,
-                excluded_by_question_id=None
-            ))
+        logger.debug("Wirtschaftlichkeit berechnet", extra={'roi': round(roi, 4), 'score': economic_score})
+        return economic_score, metrics
 
-        print(f"✅ Wirtschaftlichkeit: ROI={roi:.2%}, Score={economic_score}, Excluded={is_excluded}")
     @staticmethod
-    def _calculate_total_result(assessment_id):
+    def _economic_metrics(values):
+        """Kennzahlen aus den Eingaben 1.6 und 7.1-7.7 (dict question_code -> Wert)"""
+        result = economic_kernel(
+            values, ScoringService.ANNUAL_WORK_HOURS_PER_FTE, ScoringService.COST_PER_FTE_YEAR
+        )
+
+        # Kennzahlen (Reihenfolge = Speicherreihenfolge)
+        return (
+            EconomicValue("roi", result.roi, "%"),
+            EconomicValue("personeller_nutzen", result.personeller_nutzen, "€"),
+            EconomicValue("fte_einsparung", result.fte_einsparung, "FTE"),
+            EconomicValue("initiale_fixkosten", result.initiale_fixkosten, "€"),
+            EconomicValue("variable_kosten_jahr", result.variable_kosten_jahr, "€"),
+            EconomicValue("haeufigkeit_jahr", result.haeufigkeit_jahr, "Anzahl"),
+            EconomicValue("zeitersparnis_h_jahr", result.zeitersparnis_h_jahr, "Stunden"),
+        )
+
+    @staticmethod
+    def _roi_to_score(roi):
+        """ROI -> Score (kein Ausschluss mehr bei negativem ROI, sondern schlechter Score)"""
+        return roi_to_score(roi)
+
+    @staticmethod
+    def _score_total(question_scores, dimension_scores, economic_metrics, compiled):
         """Berechnet das Gesamt-Ergebnis (nur Dimensionen 2-6 werden gemittelt)"""
-        # Hole alle Dimension-Ergebnisse
-        dim_results_rpa = DimensionResult.query.filter_by(
-            assessment_id=assessment_id,
-            automation_type="RPA"
-        ).all()
-        dim_results_ipa = DimensionResult.query.filter_by(
-            assessment_id=assessment_id,
-            automation_type="IPA"
-        ).all()
 
         # Nur Dimensionen 2-6 berücksichtigen
-        dim_ids_2_6 = [d.id for d in Dimension.query.filter(Dimension.code.in_(["2","3","4","5","6"])).all()]
+        dim_ids_2_6 = {d.id for d in compiled.dimensions if d.code in ["2","3","4","5","6"]}
 
-        rpa_excluded = any(dr.is_excluded and dr.excluded_by_question_id is not None and dr.dimension_id in dim_ids_2_6 for dr in dim_results_rpa)
-        rpa_scores = [dr.mean_score for dr in dim_results_rpa 
-                      if not dr.is_excluded and dr.mean_score is not None and dr.dimension_id in dim_ids_2_6]
-        total_rpa = sum(rpa_scores) / len(rpa_scores) if rpa_scores else None
+        totals = {}
+        for auto in ["RPA", "IPA"]:
+            dim_results = [dr for dr in dimension_scores
+                           if dr.automation_type == auto and dr.dimension_id in dim_ids_2_6]
+            excluded = any(dr.is_excluded and dr.excluded_by_question_id is not None for dr in dim_results)
+            scores = [dr.mean_score for dr in dim_results
+                      if not dr.is_excluded and dr.mean_score is not None]
+            totals[auto] = (sum(scores) / len(scores) if scores else None, excluded)
 
-        ipa_excluded = any(dr.is_excluded and dr.excluded_by_question_id is not None and dr.dimension_id in dim_ids_2_6 for dr in dim_results_ipa)
-        ipa_scores = [dr.mean_score for dr in dim_results_ipa 
-                      if not dr.is_excluded and dr.mean_score is not None and dr.dimension_id in dim_ids_2_6]
-        total_ipa = sum(ipa_scores) / len(ipa_scores) if ipa_scores else None
+        total_rpa, rpa_excluded = totals["RPA"]
+        total_ipa, ipa_excluded = totals["IPA"]
 
         # Empfehlung bestimmen
         recommendation = ScoringService._determine_recommendation(
             total_rpa, total_ipa, rpa_excluded, ipa_excluded
         )
 
-        # Speichere Gesamt-Ergebnis
-        total_result = TotalResult(
-            assessment_id=assessment_id,
+        return AssessmentScore(
+            question_scores=tuple(question_scores),
+            dimension_scores=tuple(dimension_scores),
+            economic_metrics=tuple(economic_metrics),
             total_rpa=total_rpa,
             total_ipa=total_ipa,
             rpa_excluded=rpa_excluded,
             ipa_excluded=ipa_excluded,
-            recommendation=recommendation
+            recommendation=recommendation,
+        )
+
+    @staticmethod
+    def _write_results(assessment_id, scored):
+        """Ersetzt die Ergebnisse eines Assessments per Bulk-Insert (ohne Commit)"""
+
+        # Lösche alte Ergebnisse (falls vorhanden)
+        DimensionResult.query.filter_by(assessment_id=assessment_id).delete()
+        QuestionResult.query.filter_by(assessment_id=assessment_id).delete()
+        TotalResult.query.filter_by(assessment_id=assessment_id).delete()
+        EconomicMetric.query.filter_by(assessment_id=assessment_id).delete()
+
+        db.session.execute(
+            insert(DimensionResult.__table__),
+            [dict(ds._asdict(), assessment_id=assessment_id) for ds in scored.dimension_scores]
+        )
+        if scored.question_scores:
+            db.session.execute(
+                insert(QuestionResult.__table__),
+                [dict(qs._asdict(), assessment_id=assessment_id) for qs in scored.question_scores]
+            )
+        if scored.economic_metrics:
+            db.session.execute(
+                insert(EconomicMetric.__table__),
+                [dict(m._asdict(), assessment_id=assessment_id, automation_type=None)
+                 for m in scored.economic_metrics]
+            )
+
+        # Speichere Gesamt-Ergebnis
+        total_result = TotalResult(
+            assessment_id=assessment_id,
+            total_rpa=scored.total_rpa,
+            total_ipa=scored.total_ipa,
+            rpa_excluded=scored.rpa_excluded,
+            ipa_excluded=scored.ipa_excluded,
+            recommendation=scored.recommendation
         )
         db.session.add(total_result)
+
+        # Vergleichstabelle mitpflegen
+        AssessmentSummaryService.refresh([assessment_id])
         return total_result
-    
+
+    # ========================================
+    # Neuberechnung des Bestands (flask rescore)
+    # ========================================
+
+    @staticmethod
+    def rescore_all(since=None, questionnaire_version_id=None, dry_run=False,
+                    chunk_size=None, workers=None, progress=None, missing_only=False):
+        """
+        Berechnet alle (gefilterten) Assessments neu, z.B. nach Änderungen an
+        OptionScores oder an den Konstanten dieses Services.
+
+        - Assessments werden per Keyset (id > letzte id) in Chunks gestreamt
+        - Antworten eines Chunks werden mit EINER Query geladen
+        - Scoring läuft rein im Speicher, bei workers > 1 über einen Prozess-Pool
+        - Ergebnisse eines Chunks werden per Bulk-Insert geschrieben (ein Commit pro Chunk)
+
+        Args:
+            since: nur Assessments mit created_at >= since
+            questionnaire_version_id: nur Assessments dieser Fragebogen-Version
+            dry_run: nichts schreiben, nur Abweichungen der Gesamtergebnisse melden
+            chunk_size: Assessments pro Chunk (Standard: RESCORE_CHUNK_SIZE)
+            workers: Anzahl Prozesse (None/1 = im aktuellen Prozess)
+            progress: optionaler Callback(processed) nach jedem Chunk
+            missing_only: nur bewertete Assessments ohne Einzelbewertungen (Backfill)
+
+        Returns:
+            RescoreReport
+        """
+        chunk_size = chunk_size or ScoringService.RESCORE_CHUNK_SIZE
+        started = time.perf_counter()
+
+        base = db.session.query(Assessment.id, Assessment.questionnaire_version_id)
+        if since is not None:
+            base = base.filter(Assessment.created_at >= since)
+        if questionnaire_version_id is not None:
+            base = base.filter(Assessment.questionnaire_version_id == questionnaire_version_id)
+        if missing_only:
+            base = base.filter(
+                Assessment.id.in_(db.session.query(TotalResult.assessment_id)),
+                ~Assessment.id.in_(db.session.query(QuestionResult.assessment_id))
+            )
+
+        # Masterdaten frisch kompilieren, BEVOR der Pool startet (Worker erben den Cache per fork)
+        invalidate_compiled_questionnaires()
+        version_ids = [v for (v,) in base.with_entities(Assessment.questionnaire_version_id).distinct()]
+        for version_id in version_ids:
+            get_compiled_questionnaire(version_id)
+
+        pool = ScoringService.open_pool(workers)
+
+        processed = 0
+        diffs = []
+        last_id = 0
+        try:
+            while True:
+                chunk = base.filter(Assessment.id > last_id).order_by(Assessment.id).limit(chunk_size).all()
+                if not chunk:
+                    break
+                last_id = chunk[-1][0]
+
+                batch = ScoringService._load_rescore_batch(chunk)
+                scored = ScoringService.score_batch(batch, pool, workers)
+
+                diffs.extend(ScoringService._diff_totals(scored))
+                if not dry_run:
+                    ScoringService.write_results_bulk(scored)
+                    db.session.commit()
+
+                processed += len(chunk)
+                if progress:
+                    progress(processed)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        return RescoreReport(
+            processed=processed,
+            changed=len(diffs),
+            elapsed=time.perf_counter() - started,
+            dry_run=dry_run,
+            diffs=tuple(diffs),
+        )
+
+    @staticmethod
+    def open_pool(workers):
+        """
+        Prozess-Pool für score_batch (None bei workers <= 1 oder ohne fork).
+        Vorher die benötigten Fragebogen-Versionen kompilieren - Worker erben den Cache.
+        """
+        if workers and workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+            return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"))
+        return None
+
+    @staticmethod
+    def score_batch(batch, pool=None, workers=None):
+        """
+        Reines Scoring vieler Assessments, optional verteilt auf den Pool.
+
+        Args:
+            batch: [(version_id, assessment_id, [(question_id, option_id, numeric_value), ...])]
+
+        Returns:
+            {assessment_id: AssessmentScore}
+        """
+        if pool is None:
+            return _score_batch(batch)
+
+        # Chunk gleichmäßig auf die Worker verteilen
+        step = max(1, -(-len(batch) // workers))
+        parts = [batch[i:i + step] for i in range(0, len(batch), step)]
+        scored = {}
+        for part in pool.map(_score_batch, parts):
+            scored.update(part)
+        return scored
+
+    @staticmethod
+    def _load_rescore_batch(chunk):
+        """Lädt die Antworten eines Chunks: [(version_id, assessment_id, [(qid, oid, num), ...])]"""
+        assessment_ids = [assessment_id for assessment_id, _ in chunk]
+
+        rows_by_assessment = {assessment_id: [] for assessment_id in assessment_ids}
+        for assessment_id, question_id, scale_option_id, numeric_value in db.session.query(
+            Answer.assessment_id, Answer.question_id, Answer.scale_option_id, Answer.numeric_value
+        ).filter(
+            Answer.assessment_id.in_(assessment_ids)
+        ).order_by(Answer.assessment_id, Answer.id):
+            rows_by_assessment[assessment_id].append((question_id, scale_option_id, numeric_value))
+
+        return [
+            (version_id, assessment_id, rows_by_assessment[assessment_id])
+            for assessment_id, version_id in chunk
+        ]
+
+    @staticmethod
+    def _total_key(total):
+        return (total.total_rpa, total.total_ipa, bool(total.rpa_excluded),
+                bool(total.ipa_excluded), total.recommendation)
+
+    @staticmethod
+    def _diff_totals(scored):
+        """Vergleicht neu berechnete mit gespeicherten Gesamtergebnissen (eine Query)"""
+        stored = {
+            tr.assessment_id: ScoringService._total_key(tr)
+            for tr in TotalResult.query.filter(TotalResult.assessment_id.in_(list(scored)))
+        }
+
+        diffs = []
+        for assessment_id, result in scored.items():
+            new = ScoringService._total_key(result)
+            old = stored.get(assessment_id)
+            if old != new:
+                diffs.append(RescoreDiff(assessment_id, old, new))
+        return diffs
+
+    @staticmethod
+    def write_results_bulk(scored):
+        """Ersetzt die Ergebnisse vieler Assessments (je Tabelle ein DELETE und ein executemany, ohne Commit)"""
+        assessment_ids = list(scored)
+
+        for model in (DimensionResult, QuestionResult, TotalResult, EconomicMetric):
+            model.query.filter(model.assessment_id.in_(assessment_ids)).delete(synchronize_session=False)
+
+        dimension_rows, question_rows, metric_rows, total_rows = [], [], [], []
+        for assessment_id, result in scored.items():
+            dimension_rows.extend(dict(ds._asdict(), assessment_id=assessment_id) for ds in result.dimension_scores)
+            question_rows.extend(dict(qs._asdict(), assessment_id=assessment_id) for qs in result.question_scores)
+            metric_rows.extend(
+                dict(m._asdict(), assessment_id=assessment_id, automation_type=None)
+                for m in result.economic_metrics
+            )
+            total_rows.append({
+                'assessment_id': assessment_id,
+                'total_rpa': result.total_rpa,
+                'total_ipa': result.total_ipa,
+                'rpa_excluded': result.rpa_excluded,
+                'ipa_excluded': result.ipa_excluded,
+                'recommendation': result.recommendation,
+            })
+
+        for model, rows in ((DimensionResult, dimension_rows), (QuestionResult, question_rows),
+                            (EconomicMetric, metric_rows), (TotalResult, total_rows)):
+            if rows:
+                db.session.execute(insert(model.__table__), rows)
+
+        # Vergleichstabelle mitpflegen
+        AssessmentSummaryService.refresh(assessment_ids)
+
     @staticmethod
     def _determine_recommendation(total_rpa, total_ipa, rpa_excluded, ipa_excluded):
         """Bestimmt die Empfehlung basierend auf den Scores"""
         
-        threshold = 0.25
+        threshold = ScoringService.RECOMMENDATION_THRESHOLD
         
         # Fall 1: Beide ausgeschlossen
         if rpa_excluded and ipa_excluded:
@@ -387,4 +811,18 @@ class ScoringService:
                 'unit': metric.unit
             }
         
-        return result
\ No newline at end of file
+        return result
+
+
+def _score_batch(batch):
+    """
+    Worker-Funktion für rescore_all (auch im Prozess-Pool): reines Scoring ohne Datenbank.
+    Der kompilierte Fragebogen stammt aus dem per fork geerbten Prozess-Cache.
+
+    Returns:
+        {assessment_id: AssessmentScore}
+    """
+    return {
+        assessment_id: ScoringService.score_answers(get_compiled_questionnaire(version_id), rows)
+        for version_id, assessment_id, rows in batch
+    }
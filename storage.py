@@ -0,0 +1,112 @@
+"""
+SQLite-Speicherprofile (PRAGMAs pro Verbindung)
+
+- Profil per Konfiguration wählbar: app.config['SQLITE_PROFILE'] bzw. Umgebungsvariable
+  SQLITE_PROFILE (Standard: production), einzelne Werte über app.config['SQLITE_PRAGMAS']
+- Die PRAGMAs werden beim Öffnen jeder Pool-Verbindung gesetzt (Engine-Event "connect")
+- production: WAL-Journal -> Leser blockieren Schreiber nicht und umgekehrt; ein
+  Commit wartet nicht auf laufende Lesezugriffe anderer Worker. Zusammen mit
+  busy_timeout verschwinden die "database is locked"-Fehler bei mehreren Workern.
+  synchronous=NORMAL ist im WAL-Modus konsistent (nur die letzten Commits vor einem
+  Stromausfall können fehlen).
+- default: SQLite-Standardwerte (Rollback-Journal), z. B. für Netzlaufwerke, auf denen
+  WAL nicht funktioniert. journal_mode ist in der Datei gespeichert, daher wird er auch
+  hier explizit gesetzt (Wechsel zurück aus WAL).
+"""
+import os
+import sqlite3
+import warnings
+
+from sqlalchemy import event, text
+
+DEFAULT_PROFILE = "production"
+
+# Reihenfolge = Reihenfolge der Ausführung (busy_timeout zuerst, damit auch der
+# Wechsel des Journal-Modus auf andere Verbindungen wartet)
+PROFILES = {
+    "default": {
+        "busy_timeout": 5000,  # ms (entspricht dem Timeout von sqlite3.connect)
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "temp_store": "DEFAULT",
+        "cache_size": -2000,  # KiB
+        "mmap_size": 0,
+    },
+    "production": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "temp_store": "MEMORY",
+        "cache_size": -65536,  # 64 MiB Page-Cache pro Verbindung
+        "mmap_size": 268435456,  # 256 MiB
+    },
+}
+
+
+def resolve_profile(name=None, overrides=None):
+    """
+    Profilname (+ einzelne Überschreibungen) -> dict PRAGMA -> Wert
+
+    Raises:
+        ValueError: unbekanntes Profil bzw. PRAGMA
+    """
+    name = name or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unbekanntes Speicherprofil: {name} (erlaubt: {', '.join(PROFILES)})")
+    pragmas = dict(PROFILES[name])
+    for key, value in (overrides or {}).items():
+        if key not in pragmas:
+            raise ValueError(f"PRAGMA nicht unterstützt: {key} (erlaubt: {', '.join(pragmas)})")
+        pragmas[key] = value
+    return pragmas
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    """
+    Setzt die PRAGMAs auf einer DB-API-Verbindung (sqlite3).
+
+    journal_mode steht in der Datenbankdatei und wird nur bei Abweichung umgestellt. Ein
+    Wechsel aus WAL heraus scheitert, solange andere Verbindungen offen sind - dann
+    bleibt der bisherige Modus (Warnung), die übrigen PRAGMAs gelten trotzdem.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for key, value in pragmas.items():
+            if key == "journal_mode":
+                current = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+                if current.lower() in (str(value).lower(), "memory"):
+                    continue
+                try:
+                    cursor.execute(f"PRAGMA journal_mode={value}")
+                except sqlite3.OperationalError as e:
+                    warnings.warn(f"journal_mode bleibt {current} ({e})", RuntimeWarning)
+                continue
+            cursor.execute(f"PRAGMA {key}={value}")
+    finally:
+        cursor.close()
+
+
+def init_app(app, db):
+    """
+    Registriert das konfigurierte Profil auf allen SQLite-Engines der App.
+
+    Muss nach db.init_app(app) aufgerufen werden.
+    """
+    app.config.setdefault("SQLITE_PROFILE", os.environ.get("SQLITE_PROFILE", DEFAULT_PROFILE))
+    app.config.setdefault("SQLITE_PRAGMAS", {})
+    pragmas = resolve_profile(app.config["SQLITE_PROFILE"], app.config["SQLITE_PRAGMAS"])
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name != "sqlite":
+                continue
+
+            @event.listens_for(engine, "connect")
+            def _on_connect(dbapi_connection, connection_record):
+                apply_pragmas(dbapi_connection, pragmas)
+
+
+def current_pragmas(connection, names=None):
+    """Tatsächlich wirksame Werte (z. B. für flask storage)"""
+    names = names or PROFILES[DEFAULT_PROFILE].keys()
+    return {name: connection.execute(text(f"PRAGMA {name}")).scalar() for name in names}
@@ -0,0 +1,92 @@
+"""
+Gemeinsame Fixtures: App auf einer temporären SQLite-Datenbank (Migrationen + Seed)
+mit einigen über /evaluate angelegten Assessments
+"""
+import os
+import re
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+
+# Muss vor dem Import von main gesetzt sein (Datenbank-URI wird beim Import gelesen)
+_DB_DIR = tempfile.mkdtemp(prefix="automationfit-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+ASSESSMENTS = 3
+
+
+@pytest.fixture(scope="session")
+def app():
+    import main
+    main.init_database()
+    main.app.config["TESTING"] = True
+    return main.app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture(scope="session")
+def assessment_ids(app, client):
+    """Legt ASSESSMENTS vollständig beantwortete Assessments an (gemeinsame Antworten inkl.)"""
+    from services.compiled_questionnaire import get_active_questionnaire
+
+    with app.app_context():
+        compiled = get_active_questionnaire()
+        ids = []
+        for index in range(ASSESSMENTS):
+            response = client.post("/evaluate", data=answer_form(compiled, index))
+            assert response.status_code == 302, response.get_data(as_text=True)[:500]
+            ids.append(int(re.search(r"/assessment/(\d+)", response.headers["Location"]).group(1)))
+    return ids
+
+
+def answer_form(compiled, index):
+    """Formular wie vom Fragebogen gesendet (q_<id> bzw. q_<id>[]), deterministisch je index"""
+    form = {
+        "uc_name": f"Testprozess {index + 1}",
+        "uc_desc": "",
+        "industry": "Handel",
+        "use_shared_dimensions": "on",
+    }
+    for question in compiled.questions:
+        if question.question_type == "number":
+            form[f"q_{question.id}"] = str(10 + index)
+            continue
+        options = [o for o in question.options if not o.is_na] or list(question.options)
+        if not options:
+            continue
+        option = options[index % len(options)]
+        if question.question_type == "multiple_choice":
+            form[f"q_{question.id}[]"] = [str(option.id)]
+        else:
+            form[f"q_{question.id}"] = str(option.id)
+    return form
+
+
+@contextmanager
+def recorded_statements(app):
+    """Sammelt (SQL, Parameter) aller Statements, solange der Block läuft"""
+    from sqlalchemy import event
+    from extensions import db
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
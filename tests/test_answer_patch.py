@@ -0,0 +1,90 @@
+"""
+Autosave (PATCH /assessment/<id>/answers) muss denselben Stand ergeben wie eine
+vollständige Neubewertung über /evaluate mit den zusammengeführten Antworten
+
+Geändert werden eine Filterfrage (4.1 steuert 4.4-4.6) und Zahlenwerte der
+Dimension 7 (Wirtschaftlichkeit); verglichen werden Anwendbarkeit der Antworten,
+Dimensions-/Gesamtergebnisse und Kennzahlen.
+"""
+import re
+
+from conftest import answer_form
+
+FILTER_QUESTION = "4.1"
+FILTER_OPTION = "3"
+FILTERED_QUESTIONS = ("4.4", "4.5", "4.6")
+NUMBER_QUESTIONS = ("7.1", "7.4", "7.6")
+
+
+def evaluate(client, form):
+    response = client.post("/evaluate", data=form)
+    assert response.status_code == 302, response.get_data(as_text=True)[:500]
+    return int(re.search(r"/assessment/(\d+)", response.headers["Location"]).group(1))
+
+
+def snapshot(assessment_id):
+    """Vergleichbarer Stand eines Assessments (ohne ids und Zeitstempel)"""
+    from models.database import Answer, DimensionResult, TotalResult, EconomicMetric
+
+    answers = {
+        (a.question_id, a.scale_option_id, a.numeric_value, a.is_applicable)
+        for a in Answer.query.filter_by(assessment_id=assessment_id)
+    }
+    dimensions = {
+        (r.dimension_id, r.automation_type, r.mean_score, r.is_excluded, r.excluded_by_question_id)
+        for r in DimensionResult.query.filter_by(assessment_id=assessment_id)
+    }
+    total = TotalResult.query.filter_by(assessment_id=assessment_id).one()
+    metrics = {
+        (m.automation_type, m.key, m.value, m.unit)
+        for m in EconomicMetric.query.filter_by(assessment_id=assessment_id)
+    }
+    return {
+        "answers": answers,
+        "dimension_result": dimensions,
+        "total_result": (total.total_rpa, total.total_ipa, total.rpa_excluded,
+                         total.ipa_excluded, total.recommendation),
+        "economic_metric": metrics,
+    }
+
+
+def option_id(question, code):
+    return next(o.id for o in question.options if o.code == code)
+
+
+def test_patch_matches_fresh_evaluate(app, client):
+    from services.compiled_questionnaire import get_active_questionnaire
+
+    with app.app_context():
+        compiled = get_active_questionnaire()
+        trigger = compiled.question_by_code[FILTER_QUESTION]
+
+        # Ausgangsstand: Filterbedingung erfüllt, 4.4-4.6 beantwortet und anwendbar
+        form = answer_form(compiled, 0)
+        form[f"q_{trigger.id}"] = str(option_id(trigger, FILTER_OPTION))
+        assessment_id = evaluate(client, form)
+        assert all(
+            is_applicable for question_id, _, _, is_applicable in snapshot(assessment_id)["answers"]
+            if compiled.question_by_id[question_id].code in FILTERED_QUESTIONS
+        )
+
+        other_option = next(o for o in trigger.options if not o.is_na and o.code != FILTER_OPTION)
+        changes = {FILTER_QUESTION: other_option.id}
+        changes.update({code: 100.0 + i for i, code in enumerate(NUMBER_QUESTIONS)})
+
+        response = client.patch(f"/assessment/{assessment_id}/answers", json={"answers": changes})
+        assert response.status_code == 200, response.get_json()
+        assert set(FILTERED_QUESTIONS) <= set(response.get_json()["changed"])
+
+        merged = dict(form)
+        for code, value in changes.items():
+            merged[f"q_{compiled.question_by_code[code].id}"] = str(value)
+        fresh_id = evaluate(client, merged)
+
+        patched, fresh = snapshot(assessment_id), snapshot(fresh_id)
+        assert not any(
+            is_applicable for question_id, _, _, is_applicable in patched["answers"]
+            if compiled.question_by_id[question_id].code in FILTERED_QUESTIONS
+        )
+        for key in ("answers", "dimension_result", "total_result", "economic_metric"):
+            assert patched[key] == fresh[key], key
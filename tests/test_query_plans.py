@@ -0,0 +1,58 @@
+"""
+EXPLAIN QUERY PLAN für alle SELECTs der häufigsten Routen: keine Tabelle darf ohne
+Index vollständig gelesen werden (SCAN <tabelle> ohne USING INDEX)
+
+Die Caches (kompilierter Fragebogen, Startseite) werden vorher geleert, damit auch die
+Queries eines frisch gestarteten Workers geprüft werden.
+"""
+import re
+
+from conftest import answer_form, recorded_statements
+
+# Einzeilige Tabelle: Suche der aktiven Fragebogen-Version (einmal pro Prozess)
+ALLOWED_SCANS = {"questionnaire_version"}
+
+FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+
+
+def full_scans(connection, statements):
+    """{(Tabelle, SQL)} aller Statements, deren Plan eine Tabelle ohne Index liest"""
+    scans = set()
+    for sql, parameters in statements:
+        if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+            continue
+        for row in connection.execute(f"EXPLAIN QUERY PLAN {sql}", parameters):
+            match = FULL_SCAN.match(row[3])
+            if match and match.group(1) not in ALLOWED_SCANS:
+                scans.add((match.group(1), " ".join(sql.split())))
+    return scans
+
+
+def test_hot_routes_use_indexes(app, client, assessment_ids):
+    from extensions import db
+    from services.compiled_questionnaire import get_active_questionnaire, invalidate_compiled_questionnaires
+    from services.questionnaire_page import invalidate_questionnaire_pages
+
+    assessment_id = assessment_ids[0]
+    with app.app_context():
+        invalidate_compiled_questionnaires()
+        invalidate_questionnaire_pages()
+        with recorded_statements(app) as statements:
+            compiled = get_active_questionnaire()
+            responses = [
+                client.post("/evaluate", data=answer_form(compiled, 1)),
+                client.get("/"),
+                client.get(f"/assessment/{assessment_id}"),
+                client.get(f"/assessment/{assessment_id}/edit"),
+                client.get("/comparison"),
+                client.get("/comparison?industry=Handel&sort=process_name"),
+            ]
+        assert [r.status_code for r in responses] == [302, 200, 200, 200, 200, 200]
+
+        connection = db.engine.raw_connection()
+        try:
+            scans = full_scans(connection, statements)
+        finally:
+            connection.close()
+
+    assert not scans, "\n".join(f"SCAN {table}: {sql}" for table, sql in sorted(scans))
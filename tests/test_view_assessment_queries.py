@@ -0,0 +1,31 @@
+"""
+Obergrenze für SQL-Statements der Ergebnisseite (/assessment/<id>)
+
+Die Seite lädt Antworten, Einzel-/Dimensions-/Gesamtergebnisse und Kennzahlen mit einer
+festen Zahl von Queries (ResultViewService + kompilierter Fragebogen); pro Frage oder
+Option darf keine weitere Query hinzukommen.
+"""
+from conftest import recorded_statements
+
+MAX_QUERIES = 7
+
+
+def test_view_assessment_query_bound(app, client, assessment_ids):
+    # Erster Aufruf füllt den Cache des kompilierten Fragebogens
+    assert client.get(f"/assessment/{assessment_ids[0]}").status_code == 200
+
+    for assessment_id in assessment_ids:
+        with recorded_statements(app) as statements:
+            response = client.get(f"/assessment/{assessment_id}")
+        assert response.status_code == 200
+        assert len(statements) <= MAX_QUERIES, "\n".join(sql for sql, _ in statements)
+
+
+def test_view_assessment_query_count_independent_of_answers(app, client, assessment_ids):
+    counts = set()
+    for assessment_id in assessment_ids:
+        client.get(f"/assessment/{assessment_id}")
+        with recorded_statements(app) as statements:
+            client.get(f"/assessment/{assessment_id}")
+        counts.add(len(statements))
+    assert len(counts) == 1, counts